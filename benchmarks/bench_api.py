@@ -0,0 +1,166 @@
+"""Prueba de carga local de ``hotel_core.api``: latencia p50/p99 y peticiones por segundo.
+
+Uso: python benchmarks/bench_api.py [--reviews 100000] [--requests 3000] [--concurrency 8]
+
+Levanta la API en un proceso aparte sobre los CSV sintéticos de
+``generate_data.py`` (modo offline) y la golpea desde ``--concurrency`` hilos,
+cada uno con su conexión HTTP/1.1 persistente, con una mezcla de ``/reviews``
+(tópico, hotel y página al azar), ``/hotels/averages`` y ``/hotels/bbox``
+sacada de un conjunto de ``--distinct`` URLs. Escenarios:
+
+- ``sin caché``: servidor con ``HOTEL_API_CACHE_SIZE=0``;
+- ``con caché``: caché LRU por defecto (después de una vuelta de calentamiento);
+- ``con ETag``: igual, pero el cliente manda ``If-None-Match`` con el ETag que
+  ya recibió y el servidor responde 304 sin cuerpo.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlencode
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from generate_data import generate  # noqa: E402
+
+
+def start_server(env):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "hotel_core.api", "--port", "0"],
+        env=env, cwd=ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    line = process.stdout.readline()
+    if not line.startswith("API en http://"):
+        process.kill()
+        raise RuntimeError(f"La API no arrancó: {line!r}")
+    host, port = line.strip().rsplit("/", 1)[-1].split(":")
+    return process, host, int(port)
+
+
+def get_json(host, port, path):
+    connection = http.client.HTTPConnection(host, port, timeout=60)
+    connection.request("GET", path)
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    connection.close()
+    return payload
+
+
+def build_urls(host, port, n_urls, seed=0):
+    rng = random.Random(seed)
+    topics = get_json(host, port, "/topics")["topics"]
+    hotels = [item["name"] for item in get_json(host, port, "/hotels/averages?per_page=1000")["hotels"]]
+    urls = []
+    for _ in range(n_urls):
+        kind = rng.random()
+        if kind < 0.6:
+            params = {"topic": rng.choice(topics), "page": rng.randint(1, 3), "per_page": 20}
+            if rng.random() < 0.7:
+                params["hotel"] = rng.choice(hotels)
+            urls.append("/reviews?" + urlencode(params))
+        elif kind < 0.8:
+            params = {"topic": rng.choice(topics)} if rng.random() < 0.5 else {}
+            params["page"] = rng.randint(1, 3)
+            urls.append("/hotels/averages?" + urlencode(params))
+        else:
+            lat, lon = rng.uniform(33, 39), rng.uniform(-122, -116)
+            size = rng.uniform(0.2, 2)
+            params = {"south": lat, "west": lon, "north": lat + size, "east": lon + size}
+            urls.append("/hotels/bbox?" + urlencode(params))
+    return urls
+
+
+def load(host, port, urls, n_requests, concurrency, use_etag):
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+
+    def worker(seed):
+        rng = random.Random(seed)
+        etags = {}
+        connection = http.client.HTTPConnection(host, port, timeout=60)
+        local_latencies, local_statuses = [], Counter()
+        for _ in iter(lambda: next(counter, None), None):
+            url = rng.choice(urls)
+            headers = {"If-None-Match": etags[url]} if use_etag and url in etags else {}
+            start = time.perf_counter()
+            connection.request("GET", url, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            local_latencies.append(time.perf_counter() - start)
+            local_statuses[response.status] += 1
+            if response.status == 200:
+                etags[url] = response.getheader("ETag")
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            statuses.update(local_statuses)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return np.array(latencies), elapsed, statuses
+
+
+def report(label, latencies, elapsed, statuses):
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    responses = ", ".join(f"{n}×{status}" for status, n in sorted(statuses.items()))
+    print(f"{label:>10} {len(latencies) / elapsed:>9.0f} {p50:>9.2f} {p99:>9.2f}   {responses}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reviews", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--distinct", type=int, default=300, help="URLs distintas en la mezcla")
+    parser.add_argument("--workdir", default=str(Path(tempfile.gettempdir()) / "hotel_bench"))
+    args = parser.parse_args()
+
+    data_dir = Path(args.workdir) / str(args.reviews)
+    if not (data_dir / "reviews.csv").exists():
+        generate(data_dir, args.reviews)
+    env = {
+        **os.environ,
+        "HOTEL_DATA_DIR": str(data_dir),
+        "HOTEL_DATA_OFFLINE": "1",
+        "HOTEL_ARTIFACTS_DIR": str(data_dir / "no-artifacts"),
+    }
+    env.pop("HOTEL_REVIEW_STORE", None)
+
+    print(f"{'escenario':>10} {'pet./s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9}   respuestas")
+    for label, cache_size, use_etag in (("sin caché", "0", False), ("con caché", None, False), ("con ETag", None, True)):
+        server_env = dict(env)
+        if cache_size is not None:
+            server_env["HOTEL_API_CACHE_SIZE"] = cache_size
+        process, host, port = start_server(server_env)
+        try:
+            urls = build_urls(host, port, args.distinct)
+            if cache_size is None:
+                # Vuelta de calentamiento: llena la caché con todas las URLs de la mezcla
+                for url in urls:
+                    get_json(host, port, url)
+            report(label, *load(host, port, urls, args.requests, args.concurrency, use_etag))
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Compara el render de tarjetas por widgets contra el bloque único de HTML.
+
+Uso: python benchmarks/bench_cards.py [--cards 20 200]
+
+Corre cada variante como una app de Streamlit sin navegador (``AppTest``) y
+reporta cuántos elementos manda al frontend (cada uno es un delta por el
+websocket) y cuánto tarda el script.
+"""
+import argparse
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+def widget_cards(root, n_cards):
+    """El loop original: título, tres columnas y un bar_chart por review."""
+    import sys
+
+    sys.path.insert(0, root)
+    import pandas as pd
+    import streamlit as st
+
+    from hotel_core.aggregates import load_aggregates
+    from hotel_core.loader import load_dataset, load_derived
+    from hotel_core.render import EMOJI_MAP, generate_stars
+    from hotel_core.reviews import review_ratings
+
+    df = load_dataset("reviews")
+    average_ratings_per_hotel = load_derived("reviews", "rating_aggregates", load_aggregates).means()
+    filtered_df = pd.concat([df] * (n_cards // len(df) + 1)).head(n_cards).reset_index(drop=True)
+    filtered_ratings = review_ratings(filtered_df)
+
+    for idx, row in filtered_df.iterrows():
+        st.markdown(f"<div class='content-box hotel-title'>🏨 {row['name']}</div>", unsafe_allow_html=True)
+        col1, col2, col3 = st.columns([1.8, 1.3, 2])
+        with col1:
+            st.markdown(f"""<div class="content-box"><p class="review-text">{row['text']}</p></div>""", unsafe_allow_html=True)
+        with col2:
+            ratings_dict = filtered_ratings.loc[idx].dropna().to_dict()
+            ratings_html = '<div class="content-box"><p class="ratings-title">Ratings:</p>'
+            for key, value in sorted(ratings_dict.items()):
+                ratings_html += f'<div class="rating-line"><span>{EMOJI_MAP.get(key, "🔹")} {key.capitalize()}</span> <span>{generate_stars(value)}</span></div>'
+            st.markdown(ratings_html + "</div>", unsafe_allow_html=True)
+        with col3:
+            hotel_name = row["name"]
+            if ratings_dict and hotel_name in average_ratings_per_hotel.index:
+                hotel_scores = {key: float(value) for key, value in ratings_dict.items() if str(value).replace('.', '', 1).isdigit()}
+                comparison_df = pd.DataFrame({'Review': pd.Series(hotel_scores, dtype=float), 'Promedio': average_ratings_per_hotel.loc[hotel_name]}).dropna()
+                stacked_df = pd.DataFrame(index=comparison_df.index)
+                stacked_df['Promedio del Hotel'] = comparison_df['Promedio']
+                stacked_df['Calificación de Reseña'] = (comparison_df['Review'] - comparison_df['Promedio']).clip(lower=0)
+                st.bar_chart(stacked_df, height=300)
+
+
+def html_cards(root, n_cards):
+    """Todas las tarjetas en un solo st.markdown."""
+    import sys
+
+    sys.path.insert(0, root)
+    import pandas as pd
+    import streamlit as st
+
+    from hotel_core.aggregates import load_aggregates
+    from hotel_core.loader import load_dataset, load_derived
+    from hotel_core.render import review_cards_html
+    from hotel_core.reviews import review_ratings
+
+    df = load_dataset("reviews")
+    average_ratings_per_hotel = load_derived("reviews", "rating_aggregates", load_aggregates).means()
+    filtered_df = pd.concat([df] * (n_cards // len(df) + 1)).head(n_cards)
+
+    filtered_ratings = review_ratings(filtered_df)
+    st.markdown(review_cards_html(filtered_df, filtered_ratings, average_ratings_per_hotel), unsafe_allow_html=True)
+
+
+def count_elements(node):
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return 1 + sum(count_elements(child) for child in children.values())
+
+
+def measure(script, n_cards, repeat=3):
+    best = None
+    for _ in range(repeat):
+        app = AppTest.from_function(script, args=(ROOT, n_cards), default_timeout=300)
+        start = time.perf_counter()
+        app.run()
+        elapsed = time.perf_counter() - start
+        if app.exception:
+            raise RuntimeError(app.exception[0].value)
+        best = elapsed if best is None else min(best, elapsed)
+    # El nodo raíz y el contenedor principal no son deltas de la app
+    return count_elements(app.main) - 1, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, nargs="+", default=[20, 200])
+    args = parser.parse_args()
+
+    print(f"{'tarjetas':>8} {'modo':>8} {'deltas':>7} {'tiempo (s)':>11}")
+    for n_cards in args.cards:
+        for mode, script in (("widgets", widget_cards), ("html", html_cards)):
+            deltas, seconds = measure(script, n_cards)
+            print(f"{n_cards:>8} {mode:>8} {deltas:>7} {seconds:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Gráficas de comparación review vs. promedio: una por tarjeta contra una sola con paneles.
+
+Uso: python benchmarks/bench_comparison.py [--reviews 5 20 100 500]
+
+Sobre las reviews de ``generate_data.py`` (o las que carga el loader con
+``--real``), para cada número de reviews mostradas arma:
+
+- ``por tarjeta``: como lo hacía el Explorador de Reviews, un DataFrame y un
+  ``px.bar`` por review;
+- ``una figura``: ``hotel_core.charts.rating_deltas`` sobre todas las filas y
+  ``comparison_figure``.
+
+Reporta el tiempo de armar y serializar las figuras (lo que hace
+``st.plotly_chart`` en el servidor) y el tamaño del JSON que se manda al
+navegador.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import plotly.express as px
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_data import generate  # noqa: E402
+from hotel_core.aggregates import RatingAggregates  # noqa: E402
+from hotel_core.charts import comparison_figure, rating_deltas  # noqa: E402
+from hotel_core.loader import load_dataset  # noqa: E402
+from hotel_core.reviews import compact_reviews, review_ratings  # noqa: E402
+
+
+def per_card(reviews, ratings, averages):
+    payloads = []
+    for idx in reviews.index:
+        ratings_dict = ratings.loc[idx].dropna().to_dict()
+        if not ratings_dict:
+            continue
+        df_ratings = pd.DataFrame(list(ratings_dict.items()), columns=["Atributo", "Puntaje"])
+        fig = px.bar(df_ratings, x="Puntaje", y="Atributo", orientation="h", text="Puntaje", range_x=[0, 5])
+        fig.update_layout(showlegend=False, margin=dict(l=10, r=10, t=10, b=10), height=250)
+        payloads.append(fig.to_json())
+    return payloads
+
+
+def single(reviews, ratings, averages):
+    deltas = rating_deltas(reviews, ratings, averages)
+    return [comparison_figure(deltas).to_json()] if not deltas.empty else []
+
+
+VARIANTS = {"por tarjeta": per_card, "una figura": single}
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reviews", type=int, nargs="+", default=[5, 20, 100, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--real", action="store_true", help="usar el dataset de reviews del loader")
+    parser.add_argument("--workdir", default=str(Path(tempfile.gettempdir()) / "hotel_bench"))
+    args = parser.parse_args()
+
+    if args.real:
+        df = load_dataset("reviews")
+    else:
+        directory = Path(args.workdir) / "10000"
+        if not (directory / "reviews.csv").exists():
+            generate(directory, 10_000)
+        df = compact_reviews(pd.read_csv(directory / "reviews.csv"))
+    averages = RatingAggregates.from_frame(df).means()
+
+    print(f"{'reviews':>8} {'variante':>12} {'figuras':>8} {'JSON (KB)':>10} {'tiempo (ms)':>12}")
+    for n_reviews in args.reviews:
+        reviews = df.sample(n_reviews, random_state=0)
+        ratings = review_ratings(reviews)
+        for variant, build in VARIANTS.items():
+            seconds, payloads = best_time(lambda: build(reviews, ratings, averages), args.repeat)
+            size = sum(len(payload.encode()) for payload in payloads) / 1024
+            print(f"{n_reviews:>8} {variant:>12} {len(payloads):>8} {size:>10.1f} {seconds * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Descarga concurrente y revalidación condicional de los datasets contra un servidor local.
+
+Uso: python benchmarks/bench_fetch.py [--reviews 200000] [--latency 0.2] [--bandwidth 20]
+
+Levanta un ``http.server`` en un hilo que sirve los CSV de ``generate_data.py``
+con ``ETag`` y ``Last-Modified``, responde 304 a las peticiones condicionales y
+simula la red con una latencia por petición y un ancho de banda (MB/s). Apunta
+``hotel_core.loader`` a ese servidor y a una carpeta de snapshots temporal y
+corre, en orden:
+
+- ``secuencial``: sin caché ni snapshots, un ``load_dataset`` tras otro (como
+  arrancaba la app);
+- ``concurrente``: lo mismo con ``load_datasets``;
+- ``revalidación``: TTL vencido sin cambios en el servidor; deben ser tres 304
+  y los mismos frames en memoria (sin parsear);
+- ``proceso nuevo``: caché en memoria vacía con snapshots en disco; tres 304 y
+  los frames salen del Parquet;
+- ``un cambio``: se modifica ``coordenadas.csv``; solo ese se descarga (200).
+
+Imprime el tiempo y las respuestas de cada escenario y termina con código 1 si
+alguno no respondió lo esperado.
+"""
+import argparse
+import hashlib
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_data import generate  # noqa: E402
+from hotel_core import loader  # noqa: E402
+
+NAMES = ["reviews", "coordenadas", "profesor"]
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Sirve archivos de ``directory`` con validadores, latencia y ancho de banda limitados."""
+
+    directory = None
+    latency = 0.0
+    bandwidth = None
+    statuses = Counter()
+    lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=str(self.directory), **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _record(self, status):
+        with self.lock:
+            self.statuses[(Path(self.path).name, status)] += 1
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        path = Path(self.translate_path(self.path))
+        if not path.is_file():
+            self._record(404)
+            self.send_error(404)
+            return
+        body = path.read_bytes()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        modified = path.stat().st_mtime
+        if_none_match = self.headers.get("If-None-Match")
+        if_modified_since = self.headers.get("If-Modified-Since")
+        not_modified = if_none_match == etag if if_none_match else (
+            if_modified_since is not None and int(modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        )
+        if not_modified:
+            self._record(304)
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self._record(200)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(modified, usegmt=True))
+        self.end_headers()
+        step = 1 << 16
+        for start in range(0, len(body), step):
+            self.wfile.write(body[start:start + step])
+            if self.bandwidth:
+                time.sleep(step / (self.bandwidth * 1e6))
+
+
+def scenario(label, run, expected):
+    FixtureHandler.statuses.clear()
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    statuses = Counter(status for (_, status), n in FixtureHandler.statuses.items() for _ in range(n))
+    ok = statuses == Counter(expected)
+    responses = ", ".join(f"{n}×{status}" for status, n in sorted(statuses.items()))
+    print(f"{label:>14} {seconds:>8.2f} s   {responses:<12} {'ok' if ok else 'FALLA (esperado ' + str(expected) + ')'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reviews", type=int, default=200_000)
+    parser.add_argument("--latency", type=float, default=0.2, help="segundos por petición")
+    parser.add_argument("--bandwidth", type=float, default=20.0, help="MB/s por conexión (0 = sin límite)")
+    parser.add_argument("--workdir", default=str(Path(tempfile.gettempdir()) / "hotel_bench"))
+    args = parser.parse_args()
+
+    fixtures = Path(args.workdir) / f"fetch-{args.reviews}"
+    if not (fixtures / "reviews.csv").exists():
+        generate(fixtures, args.reviews)
+    FixtureHandler.directory = fixtures
+    FixtureHandler.latency = args.latency
+    FixtureHandler.bandwidth = args.bandwidth or None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    snapshots = Path(tempfile.mkdtemp(prefix="hotel_fetch_"))
+    loader.DATA_DIR = snapshots
+    for name in NAMES:
+        loader.DATASETS[name] = f"http://127.0.0.1:{server.server_address[1]}/{name}.csv"
+
+    def cold():
+        loader.clear_cache()
+        for path in snapshots.iterdir():
+            path.unlink()
+
+    def sequential():
+        cold()
+        for name in NAMES:
+            loader.load_dataset(name, offline=False)
+
+    def concurrent():
+        cold()
+        loader.load_datasets(NAMES, offline=False)
+
+    frames = {}
+
+    def revalidate():
+        frames.update({name: loader._memory[name]["frame"] for name in NAMES})
+        loader.load_datasets(NAMES, ttl=0, offline=False)
+
+    def new_process():
+        loader.clear_cache()
+        loader.load_datasets(NAMES, offline=False)
+
+    coordenadas = fixtures / "coordenadas.csv"
+    original = coordenadas.read_bytes()
+
+    def one_change():
+        coordenadas.write_bytes(original + original.splitlines(keepends=True)[-1])
+        loader.load_datasets(NAMES, ttl=0, offline=False)
+
+    sizes = ", ".join(f"{name} {(fixtures / f'{name}.csv').stat().st_size / 1e6:.1f} MB" for name in NAMES)
+    print(f"{sizes}; latencia {args.latency} s, {args.bandwidth} MB/s por conexión")
+    print(f"{'escenario':>14} {'tiempo':>10}   respuestas")
+    results = [
+        scenario("secuencial", sequential, {200: 3}),
+        scenario("concurrente", concurrent, {200: 3}),
+        scenario("revalidación", revalidate, {304: 3}),
+        all(loader._memory[name]["frame"] is frames[name] for name in NAMES),
+        scenario("proceso nuevo", new_process, {304: 3}),
+        scenario("un cambio", one_change, {200: 1, 304: 2}),
+    ]
+    try:
+        rows = len(loader.load_dataset("coordenadas", offline=False))
+        results.append(rows == original.count(b"\n"))
+    finally:
+        coordenadas.write_bytes(original)
+        server.shutdown()
+        shutil.rmtree(snapshots, ignore_errors=True)
+    if not all(results):
+        print("Alguna verificación falló")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Latencia de ``RatingCube.leaderboard`` (top-k con puntaje bayesiano) según el número de hoteles.
+
+Uso: python benchmarks/bench_leaderboard.py [--sizes 10000 100000 300000] [--k 20]
+
+Arma un cubo sintético (``--reviews-per-hotel`` reviews por hotel en promedio,
+con pocos hoteles muy populares y muchos con 1-2 reviews, como en los datos
+reales), ya con los totales sobre todos los tópicos en caché como en el
+servidor, y mide lo que cuesta cambiar de atributo o de top en la página de
+ranking: el leaderboard con ``np.argpartition`` contra ordenar todos los
+hoteles. Comprueba que los dos dan los mismos ``k`` hoteles.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hotel_core.cube import RatingCube  # noqa: E402
+from hotel_core.ratings import RATING_COLUMNS  # noqa: E402
+
+N_TOPICS = 10
+
+
+def synthetic_cube(n_hotels, reviews_per_hotel, seed=0):
+    rng = np.random.default_rng(seed)
+    n_reviews = n_hotels * reviews_per_hotel
+    # Popularidad tipo Zipf: unos pocos hoteles concentran la mayoría de las reviews
+    weights = 1 / np.arange(1, n_hotels + 1) ** 0.8
+    hotel_codes = rng.choice(n_hotels, size=n_reviews, p=weights / weights.sum())
+    topic_codes = rng.integers(N_TOPICS, size=n_reviews)
+    quality = rng.normal(3.5, 0.6, size=n_hotels)
+    ratings = {}
+    for attribute in RATING_COLUMNS:
+        values = np.clip(np.round((quality[hotel_codes] + rng.normal(0, 0.8, size=n_reviews)) * 2) / 2, 1, 5)
+        values[rng.random(n_reviews) < 0.3] = np.nan
+        ratings[attribute] = values
+    cube = RatingCube()
+    cube.add(
+        topic_codes, hotel_codes, pd.DataFrame(ratings),
+        [f"topic {code}" for code in range(N_TOPICS)], [f"hotel {code}" for code in range(n_hotels)],
+    )
+    return cube
+
+
+def full_sort(cube, names, attribute, topic, k):
+    col = cube.attributes.index(attribute)
+    sums, counts = cube.sums(topic)[:, col], cube.counts(topic)[:, col]
+    rated = np.flatnonzero(counts > 0)
+    sums, counts = sums[rated], counts[rated]
+    weight = np.median(counts)
+    scores = (weight * sums.sum() / counts.sum() + sums) / (weight + counts)
+    names = names[rated]
+    return names[np.lexsort((names, -scores))[:k]]
+
+
+def median_ms(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    parser.add_argument("--reviews-per-hotel", type=int, default=10)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'hoteles':>8} {'tópico':>8} {'leaderboard (ms)':>16} {'orden completo (ms)':>19}")
+    for n in args.sizes:
+        cube = synthetic_cube(n, args.reviews_per_hotel)
+        names = np.array(cube.hotels, dtype=object)
+        for topic in (None, "topic 0"):
+            # Totales ya calculados, como después de la primera vista
+            cube.leaderboard(RATING_COLUMNS[0], topic, args.k)
+            for attribute in cube.attributes:
+                board = cube.leaderboard(attribute, topic, args.k)
+                if list(board["name"]) != list(full_sort(cube, names, attribute, topic, args.k)):
+                    raise SystemExit(f"El top {args.k} de {attribute} no coincide con el orden completo")
+            attributes = iter(np.resize(cube.attributes, args.repeat))
+            board_ms = median_ms(lambda: cube.leaderboard(next(attributes), topic, args.k), args.repeat)
+            attributes = iter(np.resize(cube.attributes, args.repeat))
+            sort_ms = median_ms(lambda: full_sort(cube, names, next(attributes), topic, args.k), args.repeat)
+            print(f"{n:>8,} {topic or 'todos':>8} {board_ms:>16.2f} {sort_ms:>19.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Mide tiempo de construcción y tamaño del HTML del mapa en ambos modos.
+
+Uso: python benchmarks/bench_map.py [--sizes 100 1000 10000]
+
+Genera hoteles con coordenadas aleatorias dentro de California, construye el
+mapa con ``mode="markers"`` y ``mode="cluster"`` y renderiza el HTML completo,
+que es lo que termina viajando al navegador.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hotel_core.maps import build_map  # noqa: E402
+
+
+def synthetic_hotels(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "name": [f"Hotel {i}" for i in range(n)],
+        "latitude": rng.uniform(32.5, 42.0, n),
+        "longitude": rng.uniform(-124.4, -114.1, n),
+        "address": [f"{i} Main St" for i in range(n)],
+    })
+
+
+def measure(df_final, mode):
+    start = time.perf_counter()
+    mapa = build_map(df_final, mode=mode)
+    html = mapa.get_root().render()
+    return time.perf_counter() - start, len(html.encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args()
+
+    print(f"{'hoteles':>8} {'modo':>8} {'tiempo (s)':>11} {'HTML (KB)':>10}")
+    for n in args.sizes:
+        df_final = synthetic_hotels(n)
+        for mode in ("markers", "cluster"):
+            seconds, size = measure(df_final, mode)
+            print(f"{n:>8,} {mode:>8} {seconds:>11.3f} {size / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Memoria de la tabla de reviews: representación original contra la compacta.
+
+Uso: python benchmarks/bench_memory.py [--reviews 100000 1000000]
+
+Genera (o reutiliza) ``reviews.csv`` sintético con ``generate_data.py`` y, en un
+proceso nuevo por variante para que el RSS de una no contamine a la otra, carga:
+
+- ``original``: como lo hacían las páginas, ``text`` con ``astype(str)`` y una
+  columna ``ratings_parsed`` con un dict por fila junto a ``ratings``.
+- ``compacta``: ``hotel_core.reviews.compact_reviews``.
+
+Reporta ``memory_usage(deep=True)`` de la tabla y el RSS del proceso antes de
+leer el CSV y después de preparar la tabla.
+"""
+import argparse
+import gc
+import multiprocessing
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_data import generate  # noqa: E402
+from hotel_core.ratings import parse_ratings  # noqa: E402
+from hotel_core.reviews import compact_reviews  # noqa: E402
+from hotel_core.timing import rss_bytes  # noqa: E402
+
+
+def original_reviews(df):
+    df["text"] = df["text"].astype(str)
+    df["ratings_parsed"] = df["ratings"].apply(parse_ratings)
+    return df
+
+
+VARIANTS = {"original": original_reviews, "compacta": compact_reviews}
+
+
+def measure(variant, path, queue):
+    gc.collect()
+    before = rss_bytes()
+    df = VARIANTS[variant](pd.read_csv(path))
+    gc.collect()
+    queue.put((df.memory_usage(deep=True).sum(), before, rss_bytes()))
+
+
+def mb(n_bytes):
+    return n_bytes / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reviews", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--workdir", default=str(Path(tempfile.gettempdir()) / "hotel_bench"))
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'reviews':>9} {'variante':>9} {'tabla (MB)':>11} {'RSS antes':>10} {'RSS después':>12}")
+    for n_reviews in args.reviews:
+        directory = Path(args.workdir) / str(n_reviews)
+        path = directory / "reviews.csv"
+        if not path.exists():
+            generate(directory, n_reviews)
+        for variant in VARIANTS:
+            queue = context.Queue()
+            process = context.Process(target=measure, args=(variant, path, queue))
+            process.start()
+            table, before, after = queue.get()
+            process.join()
+            print(f"{n_reviews:>9,} {variant:>9} {mb(table):>11.1f} {mb(before):>10.1f} {mb(after):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
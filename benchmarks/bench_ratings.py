@@ -0,0 +1,66 @@
+"""Compara el parseo de ratings fila por fila contra parse_ratings_column.
+
+Uso: python benchmarks/bench_ratings.py [--repeat N]
+
+Toma la columna ``ratings`` de ``final_database.csv`` (el ``reviews.csv`` de
+``HOTEL_DATA_DIR`` si existe; si no, la URL original) y la replica ``N`` veces
+para simular más volumen. El snapshot del loader no sirve porque ya no guarda
+la columna ``ratings`` original.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hotel_core.loader import DATA_DIR, DATASETS  # noqa: E402
+from hotel_core.ratings import average_ratings, parse_ratings, parse_ratings_column  # noqa: E402
+
+
+def legacy_averages(df):
+    parsed = df["ratings"].apply(parse_ratings)
+    ratings_df = pd.json_normalize(parsed)
+    full_ratings_df = pd.concat([df["name"].reset_index(drop=True), ratings_df], axis=1)
+    rating_columns = ratings_df.columns
+    for col in rating_columns:
+        full_ratings_df[col] = pd.to_numeric(full_ratings_df[col], errors="coerce")
+    return full_ratings_df.groupby("name")[rating_columns].mean().round(1)
+
+
+def vectorized_averages(df):
+    ratings_df, _ = parse_ratings_column(df["ratings"])
+    return average_ratings(df["name"], ratings_df)
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="veces que se replica el dataset")
+    args = parser.parse_args()
+
+    source = DATA_DIR / "reviews.csv"
+    base = pd.read_csv(source if source.exists() else DATASETS["reviews"], usecols=["name", "ratings"])
+    df = pd.concat([base] * args.repeat, ignore_index=True)
+
+    legacy, legacy_s = timed(legacy_averages, df)
+    vectorized, vectorized_s = timed(vectorized_averages, df)
+    pd.testing.assert_frame_equal(
+        legacy.sort_index(axis=1), vectorized.sort_index(axis=1), check_names=False
+    )
+
+    print(f"filas: {len(df):,}")
+    print(f"parse_ratings + json_normalize: {legacy_s:8.3f} s")
+    print(f"parse_ratings_column:           {vectorized_s:8.3f} s")
+    print(f"aceleración:                    {legacy_s / vectorized_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Latencia de consultas del índice de búsqueda según el tamaño del corpus.
+
+Uso: python benchmarks/bench_search.py [--sizes 10000 100000 1000000]
+
+Genera reviews sintéticas con un vocabulario de frecuencias tipo Zipf (más
+algunas frases como "parking fee" y "bed bugs"), construye el ``SearchIndex`` y
+compara la latencia de consultas top-k contra un ``str.contains`` sobre todo el
+texto, que es lo que costaría filtrar sin índice.
+
+La app y la API siempre buscan dentro del filtro de tópico y hotel
+(``allowed=review_index.rows(...)``), así que también se mide ese camino: las
+reviews se reparten al azar en ``--topics`` tópicos y ``--reviews-per-hotel``
+reviews por hotel, y cada consulta se restringe a un tópico ("tópico") o a un
+tópico y un hotel ("+hotel").
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hotel_core.index import ReviewIndex  # noqa: E402
+from hotel_core.search import SearchIndex  # noqa: E402
+
+QUERIES = ["parking fee", "bed bugs", "breakfast", "w17 w230", "noisy room"]
+PHRASES = ["parking fee", "bed bugs", "breakfast", "noisy room", "friendly staff"]
+
+
+def synthetic_texts(n, words_per_review=40, vocabulary_size=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"w{i}" for i in range(vocabulary_size)])
+    word_ids = np.minimum(rng.zipf(1.3, size=(n, words_per_review)) - 1, vocabulary_size - 1)
+    words = vocabulary[word_ids]
+    texts = pd.Series([" ".join(row) for row in words])
+    with_phrase = rng.random(n) < 0.05
+    texts[with_phrase] = texts[with_phrase] + " " + rng.choice(PHRASES, with_phrase.sum())
+    return texts
+
+
+def synthetic_index(n, n_topics, reviews_per_hotel, seed=0):
+    rng = np.random.default_rng(seed)
+    topics = np.array([f"topic {code}" for code in range(n_topics)], dtype=object)[rng.integers(n_topics, size=n)]
+    names = np.array([f"hotel {code}" for code in range(max(n // reviews_per_hotel, 1))], dtype=object)
+    return ReviewIndex(topics, names[rng.integers(len(names), size=n)])
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000)
+
+
+def timed_queries(index, rounds, k, filters=(None,)):
+    samples = []
+    for round_ in range(rounds):
+        allowed = filters[round_ % len(filters)]
+        for query in QUERIES:
+            start = time.perf_counter()
+            positions, _ = index.search(query, k=k, allowed=allowed)
+            samples.append(time.perf_counter() - start)
+            if allowed is not None and not np.isin(positions, allowed).all():
+                raise SystemExit(f"'{query}' devolvió reviews fuera del filtro")
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 500000])
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=20, help="repeticiones de cada consulta")
+    parser.add_argument("--topics", type=int, default=8)
+    parser.add_argument("--reviews-per-hotel", type=int, default=50)
+    args = parser.parse_args()
+
+    print(
+        f"{'reviews':>9} {'índice (s)':>10} {'p50 (ms)':>9} {'p99 (ms)':>9} {'tópico p50':>10} {'tópico p99':>10} "
+        f"{'+hotel p50':>10} {'+hotel p99':>10} {'contains (ms)':>14}"
+    )
+    for n in args.sizes:
+        texts = synthetic_texts(n)
+        start = time.perf_counter()
+        index = SearchIndex.from_texts(texts)
+        build_s = time.perf_counter() - start
+
+        review_index = synthetic_index(n, args.topics, args.reviews_per_hotel)
+        rng = np.random.default_rng(1)
+        topic_filters = [review_index.rows(topic) for topic in review_index.topics]
+        hotel_filters = [
+            review_index.rows(topic, review_index.hotels[rng.integers(len(review_index.hotels))])
+            for topic in review_index.topics
+        ]
+        samples = timed_queries(index, args.rounds, args.k)
+        topic_samples = timed_queries(index, args.rounds, args.k, topic_filters)
+        hotel_samples = timed_queries(index, args.rounds, args.k, hotel_filters)
+
+        start = time.perf_counter()
+        lowered = texts.str.lower()
+        for query in QUERIES:
+            mask = np.ones(n, dtype=bool)
+            for term in query.split():
+                mask &= lowered.str.contains(term, regex=False).to_numpy()
+        contains_ms = (time.perf_counter() - start) / len(QUERIES) * 1000
+
+        print(
+            f"{n:>9,} {build_s:>10.2f} {percentile_ms(samples, 50):>9.3f} "
+            f"{percentile_ms(samples, 99):>9.3f} {percentile_ms(topic_samples, 50):>10.3f} "
+            f"{percentile_ms(topic_samples, 99):>10.3f} {percentile_ms(hotel_samples, 50):>10.3f} "
+            f"{percentile_ms(hotel_samples, 99):>10.3f} {contains_ms:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
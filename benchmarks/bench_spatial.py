@@ -0,0 +1,83 @@
+"""Latencia de las consultas por radio y k-NN del ``GridIndex`` según el número de hoteles.
+
+Uso: python benchmarks/bench_spatial.py [--sizes 1000 10000 100000]
+
+Reparte hoteles sintéticos sobre California (la mitad agrupados alrededor de
+algunas ciudades, como en los datos reales), lanza consultas en puntos al azar y
+compara contra calcular la haversine a todos los hoteles, que es lo que costaría
+sin índice.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hotel_core.geo import GridIndex, haversine_km  # noqa: E402
+
+BOUNDS = ((32.5, -124.4), (42.0, -114.1))
+CITIES = [(34.05, -118.24), (37.77, -122.42), (32.72, -117.16), (38.58, -121.49), (36.74, -119.79)]
+
+
+def synthetic_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    n_city = n // 2
+    centers = np.array(CITIES)[rng.integers(len(CITIES), size=n_city)]
+    city = centers + rng.normal(scale=0.15, size=(n_city, 2))
+    spread = rng.uniform(BOUNDS[0], BOUNDS[1], size=(n - n_city, 2))
+    points = np.vstack([city, spread])
+    return points[:, 0], points[:, 1]
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000)
+
+
+def timed(queries, query):
+    samples = []
+    for lat, lon in queries:
+        start = time.perf_counter()
+        query(lat, lon)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--radius", type=float, default=10.0, help="radio de búsqueda en km")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(
+        f"{'hoteles':>8} {'índice (ms)':>11} {'radio p50':>9} {'radio p99':>9} "
+        f"{'k-NN p50':>9} {'k-NN p99':>9} {'sin índice':>10}   (ms)"
+    )
+    for n in args.sizes:
+        lat, lon = synthetic_points(n)
+        start = time.perf_counter()
+        index = GridIndex(lat, lon)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        rng = np.random.default_rng(1)
+        # La mitad de las consultas en las ciudades, donde hay más hoteles por celda
+        queries = np.vstack([
+            np.array(CITIES)[rng.integers(len(CITIES), size=args.queries // 2)],
+            rng.uniform(BOUNDS[0], BOUNDS[1], size=(args.queries - args.queries // 2, 2)),
+        ])
+        radius = timed(queries, lambda a, b: index.within(a, b, args.radius))
+        nearest = timed(queries, lambda a, b: index.nearest(a, b, args.k))
+        brute = timed(queries[:50], lambda a, b: np.argsort(haversine_km(a, b, lat, lon))[:args.k])
+
+        print(
+            f"{n:>8,} {build_ms:>11.1f} {percentile_ms(radius, 50):>9.3f} {percentile_ms(radius, 99):>9.3f} "
+            f"{percentile_ms(nearest, 50):>9.3f} {percentile_ms(nearest, 99):>9.3f} {percentile_ms(brute, 50):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
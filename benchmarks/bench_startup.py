@@ -0,0 +1,115 @@
+"""Tiempo de import y del primer render de ``app.py`` en frío, con un presupuesto.
+
+Uso: python benchmarks/bench_startup.py [--reviews 100000] [--import-budget 2.0] [--paint-budget 4.0]
+
+Cada medición corre en un proceso nuevo, como un worker recién levantado, con
+los CSV sintéticos de ``generate_data.py`` en modo offline (un proceso previo
+deja los snapshots Parquet, como pasa después del primer arranque):
+
+- ``import``: importar lo que importa ``app.py`` (streamlit, ``hotel_core.data``
+  y ``hotel_core.ui``);
+- ``primer render``: ``AppTest`` de ``app.py`` hasta terminar la primera
+  ejecución del script (la pestaña de reviews), que es lo que tarda el
+  servidor en mandar la primera pantalla;
+- ``pestaña mapa``: la ejecución siguiente con la pestaña del mapa abierta.
+
+Después de cada paso lista cuáles de ``HEAVY_MODULES`` quedaron cargados. Termina
+con código 1 si el import o el primer render pasan su presupuesto, o si alguno
+de esos módulos se cargó antes de abrir el mapa.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from generate_data import generate  # noqa: E402
+
+# streamlit ya importa plotly.graph_objects por su cuenta si plotly está
+# instalado; lo que depende de la app es plotly.express
+HEAVY_MODULES = ["plotly.express", "folium", "branca", "streamlit_folium"]
+
+_CHILD = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+heavy = {heavy!r}
+loaded = lambda: [name for name in heavy if name in sys.modules]
+result = {{}}
+start = time.perf_counter()
+import streamlit
+import hotel_core.data, hotel_core.ui
+result["import"] = (time.perf_counter() - start, loaded())
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({app!r}, default_timeout=300)
+start = time.perf_counter()
+app.run()
+result["primer render"] = (time.perf_counter() - start, loaded())
+if app.exception:
+    raise SystemExit(app.exception[0].value)
+app.session_state["main_tab"] = "🗺️ Mapa"
+start = time.perf_counter()
+app.run()
+result["pestaña mapa"] = (time.perf_counter() - start, loaded())
+print(json.dumps(result))
+"""
+
+
+def run_child(env):
+    code = _CHILD.format(root=str(ROOT), heavy=HEAVY_MODULES, app=str(ROOT / "app.py"))
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reviews", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3, help="procesos por medición (se reporta el mejor)")
+    parser.add_argument("--import-budget", type=float, default=2.0, help="segundos")
+    parser.add_argument("--paint-budget", type=float, default=4.0, help="segundos")
+    parser.add_argument("--workdir", default=str(Path(tempfile.gettempdir()) / "hotel_bench"))
+    args = parser.parse_args()
+
+    data_dir = Path(args.workdir) / str(args.reviews)
+    if not (data_dir / "reviews.csv").exists():
+        generate(data_dir, args.reviews)
+    env = {
+        **os.environ,
+        "HOTEL_DATA_DIR": str(data_dir),
+        "HOTEL_DATA_OFFLINE": "1",
+        # Sin artefactos del build: se mide el arranque desde los snapshots
+        "HOTEL_ARTIFACTS_DIR": str(data_dir / "no-artifacts"),
+    }
+    env.pop("HOTEL_REVIEW_STORE", None)
+    run_child(env)
+
+    best = {}
+    for _ in range(args.repeat):
+        for step, (seconds, loaded) in run_child(env).items():
+            if step not in best or seconds < best[step][0]:
+                best[step] = (seconds, loaded)
+
+    budgets = {"import": args.import_budget, "primer render": args.paint_budget}
+    failures = []
+    print(f"{'paso':>14} {'segundos':>9} {'presupuesto':>12}   módulos pesados cargados")
+    for step, (seconds, loaded) in best.items():
+        budget = budgets.get(step)
+        print(f"{step:>14} {seconds:>9.2f} {budget if budget else '-':>12}   {', '.join(loaded) or '-'}")
+        if budget and seconds > budget:
+            failures.append(f"{step}: {seconds:.2f} s > {budget} s")
+        if step != "pestaña mapa" and loaded:
+            failures.append(f"{step}: se cargó {', '.join(loaded)}")
+    for failure in failures:
+        print(f"FUERA DE PRESUPUESTO {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
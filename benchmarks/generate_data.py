@@ -0,0 +1,165 @@
+"""Genera datasets sintéticos con los mismos esquemas que los CSV reales.
+
+Uso: python benchmarks/generate_data.py DIRECTORIO --reviews 1000000
+
+Escribe en DIRECTORIO los mismos nombres que espera el loader en modo offline:
+
+- ``reviews.csv``: ``name``, ``text``, ``ratings`` (dict como texto) y
+  ``topic_label``, con una fracción de ratings vacíos o mal formados.
+- ``coordenadas.csv`` y ``profesor.csv``: ``name``, ``latitude``,
+  ``longitude``, ``address`` e ``is_open``. ``profesor.csv`` repite parte de los
+  hoteles, algunos idénticos y otros con el nombre o la dirección escritos
+  distinto, como pasa entre las dos fuentes reales.
+
+Se escribe por bloques, así que 5M de reviews no necesitan tenerse en memoria.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RATING_KEYS = ["service", "cleanliness", "overall", "value", "location", "sleep quality", "rooms"]
+TOPICS = ["Limpieza", "Ubicación", "Servicio", "Precio", "Habitaciones", "Desayuno", "Ruido", "Estacionamiento"]
+TOPIC_WEIGHTS = np.array([18, 16, 20, 12, 14, 8, 6, 6], dtype=float)
+CITIES = ["Los Angeles", "San Francisco", "San Diego", "Sacramento", "San Jose", "Fresno", "Oakland", "Anaheim", "Palm Springs", "Monterey"]
+NAME_WORDS = ["Grand", "Pacific", "Golden", "Bay", "Sunset", "Royal", "Ocean", "Park", "Garden", "Harbor", "Valley", "Desert"]
+NAME_KINDS = ["Hotel", "Inn", "Suites", "Resort", "Lodge", "Motel"]
+STREETS = ["Main", "Ocean", "Market", "Sunset", "Broadway", "Mission", "Pine", "Oak", "Harbor", "Mountain"]
+SENTENCES = [
+    "The room was clean and spacious",
+    "Staff were friendly and helpful",
+    "We had to pay a parking fee every night",
+    "Found bed bugs on the second night",
+    "Great location close to the beach",
+    "Breakfast was included and very good",
+    "The hotel was noisy because of the street",
+    "Check in took a long time",
+    "Beds were comfortable and we slept well",
+    "Overpriced for what you get",
+    "The pool area was nice for kids",
+    "Would definitely stay here again",
+    "Bathroom needed some maintenance",
+    "Wifi was slow in the room",
+    "Excellent value for the money",
+    "The view from the balcony was amazing",
+]
+# Centro aproximado (lat, lon) de cada ciudad
+CITY_CENTERS = np.array([
+    [34.05, -118.24], [37.77, -122.42], [32.72, -117.16], [38.58, -121.49], [37.34, -121.89],
+    [36.74, -119.79], [37.80, -122.27], [33.84, -117.91], [33.83, -116.55], [36.60, -121.89],
+])
+
+
+def hotel_table(n_hotels, rng):
+    """Hoteles únicos con nombre, coordenadas, dirección e ``is_open``."""
+    city = rng.integers(0, len(CITIES), n_hotels)
+    words = np.array(NAME_WORDS, dtype=object)
+    kinds = np.array(NAME_KINDS, dtype=object)
+    cities = np.array(CITIES, dtype=object)
+    streets = np.array(STREETS, dtype=object)
+    ids = np.arange(n_hotels).astype(str).astype(object)
+    names = words[rng.integers(0, len(words), n_hotels)] + " " + kinds[rng.integers(0, len(kinds), n_hotels)] + " " + cities[city] + " " + ids
+    numbers = rng.integers(1, 9999, n_hotels).astype(str).astype(object)
+    addresses = numbers + " " + streets[rng.integers(0, len(streets), n_hotels)] + " Street"
+    coords = CITY_CENTERS[city] + rng.normal(0, 0.08, (n_hotels, 2))
+    return pd.DataFrame({
+        "name": names,
+        "latitude": coords[:, 0].round(6),
+        "longitude": coords[:, 1].round(6),
+        "address": addresses,
+        "is_open": (rng.random(n_hotels) < 0.9).astype(int),
+    })
+
+
+def _misspell(hotels, rng):
+    """Variantes con otra capitalización, abreviaturas y coordenadas levemente movidas."""
+    variant = hotels.copy()
+    kind = rng.integers(0, 3, len(variant))
+    variant.loc[kind == 0, "name"] = variant.loc[kind == 0, "name"].str.upper()
+    variant.loc[kind == 1, "name"] = variant.loc[kind == 1, "name"].str.replace(" Hotel ", " Htl. ", regex=False) + " "
+    variant.loc[kind == 2, "address"] = variant.loc[kind == 2, "address"].str.replace(" Street", " St.", regex=False)
+    variant["latitude"] = (variant["latitude"] + rng.normal(0, 0.0002, len(variant))).round(6)
+    variant["longitude"] = (variant["longitude"] + rng.normal(0, 0.0002, len(variant))).round(6)
+    return variant
+
+
+def coordinate_tables(hotels, rng, overlap=0.3, variant_share=0.5):
+    """Divide ``hotels`` entre las dos fuentes, con una parte repetida en ambas."""
+    order = rng.permutation(len(hotels))
+    n_first = int(len(hotels) * 0.6)
+    coordenadas = hotels.iloc[order[:n_first]]
+    shared = coordenadas.sample(frac=overlap, random_state=int(rng.integers(1 << 31)))
+    n_variants = int(len(shared) * variant_share)
+    profesor = pd.concat([
+        hotels.iloc[order[n_first:]],
+        shared.iloc[n_variants:],
+        _misspell(shared.iloc[:n_variants], rng),
+    ])
+    return coordenadas.reset_index(drop=True), profesor.sample(frac=1, random_state=1).reset_index(drop=True)
+
+
+def review_chunk(n, hotel_names, rng, malformed_rate=0.001, missing_rate=0.002):
+    """``n`` reviews con el esquema de ``final_database.csv``."""
+    # Popularidad tipo Zipf: pocos hoteles concentran muchas reviews
+    hotel = np.minimum(rng.zipf(1.2, n) - 1, len(hotel_names) - 1)
+    hotel = rng.permutation(len(hotel_names))[hotel]
+
+    sentences = np.array(SENTENCES, dtype=object)
+    text = sentences[rng.integers(0, len(sentences), n)]
+    for _ in range(2):
+        text = text + ". " + sentences[rng.integers(0, len(sentences), n)]
+
+    ratings = np.full(n, "", dtype=object)
+    for key in RATING_KEYS:
+        present = rng.random(n) < (0.98 if key == "overall" else 0.8)
+        values = rng.integers(2, 11, n) / 2
+        fragment = np.where(present, f"'{key}': " + values.astype(str).astype(object) + ", ", "")
+        ratings = ratings + fragment
+    ratings = "{" + pd.Series(ratings).str.removesuffix(", ") + "}"
+    draw = rng.random(n)
+    ratings[draw < malformed_rate] = "{'overall': 4.0, 'service'"
+    ratings[(draw >= malformed_rate) & (draw < malformed_rate + missing_rate)] = np.nan
+
+    topic = rng.choice(len(TOPICS), n, p=TOPIC_WEIGHTS / TOPIC_WEIGHTS.sum())
+    return pd.DataFrame({
+        "name": hotel_names[hotel],
+        "text": text,
+        "ratings": ratings,
+        "topic_label": np.array(TOPICS, dtype=object)[topic],
+    })
+
+
+def generate(directory, n_reviews, n_hotels=None, chunk_size=250_000, seed=0):
+    """Escribe los tres CSV en ``directory`` y devuelve sus rutas."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    n_hotels = n_hotels or max(50, n_reviews // 100)
+
+    hotels = hotel_table(n_hotels, rng)
+    coordenadas, profesor = coordinate_tables(hotels, rng)
+    coordenadas.to_csv(directory / "coordenadas.csv", index=False)
+    profesor.to_csv(directory / "profesor.csv", index=False)
+
+    reviews_path = directory / "reviews.csv"
+    hotel_names = hotels["name"].to_numpy()
+    for start in range(0, n_reviews, chunk_size):
+        chunk = review_chunk(min(chunk_size, n_reviews - start), hotel_names, rng)
+        chunk.to_csv(reviews_path, index=False, mode="w" if start == 0 else "a", header=start == 0)
+    return reviews_path, directory / "coordenadas.csv", directory / "profesor.csv"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument("--reviews", type=int, default=10_000)
+    parser.add_argument("--hotels", type=int, default=None, help="por defecto, una por cada 100 reviews")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for path in generate(args.directory, args.reviews, args.hotels, seed=args.seed):
+        print(f"{path} ({path.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
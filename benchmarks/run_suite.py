@@ -0,0 +1,122 @@
+"""Tiempos por etapa del pipeline de los dashboards sobre datos sintéticos.
+
+Uso::
+
+    python benchmarks/run_suite.py --sizes 10000 100000 1000000 --report hoy.json
+    python benchmarks/run_suite.py --report hoy.json --baseline ayer.json
+
+Para cada tamaño genera (o reutiliza) los CSV con ``generate_data.py`` en
+``--workdir`` y mide por separado: lectura del CSV, paso a la tabla compacta
+del loader (incluye el parseo de ratings), promedios por hotel, índice y
+filtro de tópico/hotel, render de 20 tarjetas,
+deduplicación de hoteles y construcción del mapa. Todo corre sin red. Con
+``--baseline`` compara contra un reporte anterior y termina con código 1 si
+alguna etapa es más lenta que la tolerancia.
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_data import generate  # noqa: E402
+from hotel_core.aggregates import RatingAggregates  # noqa: E402
+from hotel_core.dedup import resolve_hotels  # noqa: E402
+from hotel_core.index import ALL_HOTELS, ReviewIndex  # noqa: E402
+from hotel_core.maps import build_map, hotel_locations  # noqa: E402
+from hotel_core.render import reviews_html  # noqa: E402
+from hotel_core.reviews import compact_reviews  # noqa: E402
+
+STAGES = ["csv_read", "parse_ratings", "hotel_averages", "filter_index", "filter_query", "render_cards", "hotel_dedup", "map_build"]
+
+
+class Timer:
+    def __init__(self):
+        self.stages = {}
+
+    def __call__(self, stage, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.stages[stage] = time.perf_counter() - start
+        return result
+
+
+def run_size(directory, n_reviews):
+    reviews_path = directory / "reviews.csv"
+    if not reviews_path.exists():
+        generate(directory, n_reviews)
+
+    timer = Timer()
+    df = timer("csv_read", pd.read_csv, reviews_path)
+    # La misma tabla que entrega el loader a las páginas
+    df = timer("parse_ratings", compact_reviews, df)
+    aggregates = timer("hotel_averages", RatingAggregates.from_frame, df)
+    averages = aggregates.means()
+    review_index = timer("filter_index", ReviewIndex.from_frame, df)
+
+    def query_all():
+        for topic in review_index.topics:
+            review_index.select(topic, ALL_HOTELS, 20)
+            review_index.select(topic, review_index.hotels[0], 20)
+
+    timer("filter_query", query_all)
+    positions = review_index.select(review_index.topics[0], ALL_HOTELS, 20)
+    timer("render_cards", reviews_html, df, positions, averages)
+
+    locations = hotel_locations(pd.read_csv(directory / "coordenadas.csv"), pd.read_csv(directory / "profesor.csv"))
+    locations, _ = timer("hotel_dedup", resolve_hotels, locations)
+    timer("map_build", lambda: build_map(locations).get_root().render())
+    return {"rows": len(df), "hotels": len(locations), "stages": timer.stages}
+
+
+def compare(report, baseline, tolerance):
+    """Lista de etapas más lentas que ``baseline`` por encima de ``tolerance``."""
+    regressions = []
+    for size, result in report["results"].items():
+        previous = baseline.get("results", {}).get(size)
+        if not previous:
+            continue
+        for stage, seconds in result["stages"].items():
+            before = previous["stages"].get(stage)
+            # Las etapas de menos de 5 ms son puro ruido
+            if before and seconds > 0.005 and seconds > before * (1 + tolerance):
+                regressions.append((size, stage, before, seconds))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--workdir", default=None, help="carpeta para los CSV sintéticos (se reutilizan)")
+    parser.add_argument("--report", default=None, help="archivo JSON donde guardar el resultado")
+    parser.add_argument("--baseline", default=None, help="reporte anterior para comparar")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="fracción de lentitud aceptada")
+    args = parser.parse_args()
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.gettempdir()) / "hotel_bench"
+    report = {"python": platform.python_version(), "pandas": pd.__version__, "results": {}}
+
+    print(f"{'filas':>10} " + " ".join(f"{stage:>14}" for stage in STAGES))
+    for n_reviews in args.sizes:
+        result = run_size(workdir / str(n_reviews), n_reviews)
+        report["results"][str(n_reviews)] = result
+        print(f"{n_reviews:>10,} " + " ".join(f"{result['stages'][stage]:>13.3f}s" for stage in STAGES))
+
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2))
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for size, stage, before, after in regressions:
+            print(f"REGRESIÓN {size} filas, {stage}: {before:.3f}s -> {after:.3f}s")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Código compartido por los dashboards de hoteles de California."""
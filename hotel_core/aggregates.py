@@ -0,0 +1,198 @@
+"""Promedios por hotel mantenidos como sumas y conteos incrementales.
+
+``RatingAggregates`` guarda, por hotel y atributo, la suma de las
+calificaciones y cuántas hay. El promedio se calcula al leer, así que agregar
+un lote de reviews nuevas solo toca los hoteles de ese lote. Las calificaciones
+son múltiplos de 0.5, por lo que las sumas son exactas en float64 y
+``means()`` coincide con ``groupby('name').mean().round(1)``.
+
+Uso desde la terminal para sumar reviews nuevas al archivo persistido::
+
+    python -m hotel_core.aggregates nuevas_reviews.csv
+"""
+import argparse
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from hotel_core.loader import DATA_DIR, dataset_hash, load_dataset
+from hotel_core.ratings import parse_ratings_column
+from hotel_core.reviews import review_ratings
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES_PATH = DATA_DIR / "rating_aggregates.parquet"
+
+_SUM = "sum:"
+_COUNT = "count:"
+
+
+class RatingAggregates:
+    """Sumas y conteos de calificaciones por hotel y atributo."""
+
+    def __init__(self, columns=()):
+        self.columns = list(columns)
+        self._rows = {}
+        self._names = []
+        self._sums = np.zeros((16, len(self.columns)))
+        self._counts = np.zeros((16, len(self.columns)), dtype=np.int64)
+        self._means = None
+
+    @classmethod
+    def from_reviews(cls, names, ratings_frame):
+        aggregates = cls(ratings_frame.columns)
+        aggregates.append(names, ratings_frame)
+        return aggregates
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls.from_reviews(df["name"], review_ratings(df))
+
+    def __len__(self):
+        return len(self._names)
+
+    @property
+    def hotels(self):
+        return list(self._names)
+
+    def _grow(self, n_rows, n_columns):
+        rows, columns = self._sums.shape
+        if n_rows <= rows and n_columns <= columns:
+            return
+        new_rows = max(rows, 16)
+        while new_rows < n_rows:
+            new_rows *= 2
+        new_columns = max(columns, n_columns)
+        sums = np.zeros((new_rows, new_columns))
+        counts = np.zeros((new_rows, new_columns), dtype=np.int64)
+        sums[:rows, :columns] = self._sums
+        counts[:rows, :columns] = self._counts
+        self._sums, self._counts = sums, counts
+
+    def append(self, names, ratings_frame):
+        """Suma un lote de reviews; el costo depende del lote, no del histórico.
+
+        ``names`` y ``ratings_frame`` deben estar alineados fila a fila, como
+        ``df['name']`` y el resultado de ``parse_ratings_column``.
+        """
+        names = np.asarray(names, dtype=object)
+        keep = pd.notna(names)
+        names = names[keep]
+        ratings_frame = ratings_frame[keep]
+
+        for column in ratings_frame.columns:
+            if column not in self.columns:
+                self.columns.append(column)
+        for name in pd.unique(names):
+            if name not in self._rows:
+                self._rows[name] = len(self._names)
+                self._names.append(name)
+        self._grow(len(self._names), len(self.columns))
+
+        rows = np.fromiter((self._rows[name] for name in names), dtype=np.intp, count=len(names))
+        for column in ratings_frame.columns:
+            values = ratings_frame[column].to_numpy(dtype=np.float64)
+            present = ~np.isnan(values)
+            col = self.columns.index(column)
+            np.add.at(self._sums[:, col], rows[present], values[present])
+            np.add.at(self._counts[:, col], rows[present], 1)
+        self._means = None
+        return self
+
+    def means(self):
+        """Promedio por hotel y atributo, redondeado a un decimal y ordenado por nombre."""
+        if self._means is None:
+            n_rows, n_columns = len(self._names), len(self.columns)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                values = self._sums[:n_rows, :n_columns] / self._counts[:n_rows, :n_columns]
+            index = pd.Index(self._names, name="name")
+            self._means = pd.DataFrame(values, index=index, columns=self.columns).sort_index().round(1)
+        return self._means
+
+    def counts(self):
+        """Número de calificaciones por hotel y atributo."""
+        n_rows, n_columns = len(self._names), len(self.columns)
+        index = pd.Index(self._names, name="name")
+        return pd.DataFrame(self._counts[:n_rows, :n_columns], index=index, columns=self.columns).sort_index()
+
+    def save(self, path=AGGREGATES_PATH, source_hash=None):
+        """Guarda sumas y conteos en Parquet, con el hash del dataset de origen."""
+        n_rows, n_columns = len(self._names), len(self.columns)
+        frame = pd.DataFrame({"name": self._names})
+        for col, column in enumerate(self.columns):
+            frame[_SUM + column] = self._sums[:n_rows, col]
+            frame[_COUNT + column] = self._counts[:n_rows, col]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        path.with_suffix(".json").write_text(json.dumps({"source_sha256": source_hash, "hotels": n_rows}))
+
+    @classmethod
+    def load(cls, path=AGGREGATES_PATH):
+        """Lee un archivo escrito por ``save``; devuelve ``(aggregates, source_hash)``."""
+        frame = pd.read_parquet(path)
+        columns = [name[len(_SUM):] for name in frame.columns if name.startswith(_SUM)]
+        aggregates = cls(columns)
+        aggregates._names = frame["name"].tolist()
+        aggregates._rows = {name: row for row, name in enumerate(aggregates._names)}
+        aggregates._grow(len(aggregates._names), len(columns))
+        for col, column in enumerate(columns):
+            aggregates._sums[: len(frame), col] = frame[_SUM + column].to_numpy(dtype=np.float64)
+            aggregates._counts[: len(frame), col] = frame[_COUNT + column].to_numpy(dtype=np.int64)
+        try:
+            meta = json.loads(path.with_suffix(".json").read_text())
+        except (OSError, ValueError):
+            meta = {}
+        return aggregates, meta.get("source_sha256")
+
+
+def load_aggregates(df, path=AGGREGATES_PATH):
+    """Agregados para el dataset ``reviews`` ya cargado en ``df``.
+
+    Si en disco hay agregados del mismo contenido (más lotes agregados después)
+    se usan sin recorrer las reviews; si no, se recalculan y se guardan.
+    """
+    source_hash = dataset_hash("reviews")
+    if path.exists():
+        try:
+            aggregates, saved_hash = RatingAggregates.load(path)
+            if saved_hash is not None and saved_hash == source_hash:
+                return aggregates
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("No se pudieron leer los agregados de %s: %s", path, exc)
+    aggregates = RatingAggregates.from_frame(df)
+    try:
+        aggregates.save(path, source_hash)
+    except (OSError, ValueError, ImportError) as exc:
+        logger.warning("No se pudieron guardar los agregados en %s: %s", path, exc)
+    return aggregates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agrega lotes de reviews nuevas a los promedios persistidos.")
+    parser.add_argument("batches", nargs="+", help="CSV con columnas name y ratings")
+    parser.add_argument("--path", default=str(AGGREGATES_PATH), help="archivo de agregados")
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    if path.exists():
+        aggregates, source_hash = RatingAggregates.load(path)
+    else:
+        aggregates = load_aggregates(load_dataset("reviews"), path)
+        source_hash = dataset_hash("reviews")
+    for batch_path in args.batches:
+        batch = pd.read_csv(batch_path, usecols=["name", "ratings"])
+        ratings_frame, n_malformed = parse_ratings_column(batch["ratings"])
+        aggregates.append(batch["name"], ratings_frame)
+        print(f"{batch_path}: {len(batch):,} reviews ({n_malformed} con ratings mal formados)")
+    aggregates.save(path, source_hash)
+    print(f"{len(aggregates):,} hoteles guardados en {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""API HTTP de solo lectura (JSON) sobre los mismos datos que las páginas.
+
+Uso::
+
+    python -m hotel_core.api --host 0.0.0.0 --port 8502
+
+Usa ``get_data()``, así que carga y deriva los datos igual que el dashboard
+(artefactos del build, almacén en disco o CSV). Endpoints (todos ``GET``):
+
+- ``/topics``: los tópicos del índice.
+- ``/reviews?topic=T[&hotel=H][&q=texto][&page=1&per_page=20]``: las reviews
+  que muestran las páginas para ese filtro (con ``hotel`` omitido, la
+  representativa de cada hotel) y, con ``q``, las que contienen todas las
+  palabras, por relevancia.
+- ``/hotels/averages[?topic=T][&hotel=H][&page=1&per_page=100]``: promedio y
+  número de calificaciones por atributo de cada hotel; con ``topic``, solo de
+  las reviews de ese tópico (del ``RatingCube``).
+- ``/hotels/bbox?south=S&west=W&north=N&east=E[&topic=T][&page=1&per_page=500]``:
+  los hoteles del mapa dentro del rectángulo, con ``avg_overall`` y
+  ``n_reviews``.
+
+Las respuestas se guardan en una caché LRU de ``API_CACHE_SIZE`` entradas
+(``HOTEL_API_CACHE_SIZE``, 0 la desactiva) por ruta y parámetros, que se vacía
+cuando ``get_data()`` entrega datos nuevos. Cada respuesta lleva un ``ETag``
+(hash del cuerpo); una petición con ``If-None-Match`` igual recibe 304 sin
+cuerpo.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from hotel_core.data import get_data
+from hotel_core.index import ALL_HOTELS
+from hotel_core.reviews import review_ratings
+
+logger = logging.getLogger(__name__)
+
+API_CACHE_SIZE = int(os.environ.get("HOTEL_API_CACHE_SIZE", 1024))
+
+# (ruta, parámetros) -> (etag, cuerpo); solo para el HotelData de _cache_owner
+_cache = OrderedDict()
+_cache_owner = [None]
+_cache_lock = threading.Lock()
+
+
+class ApiError(Exception):
+    """Error con el código HTTP que debe devolver la petición."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _records(frame):
+    """Filas de ``frame`` como dicts con tipos de Python y None en vez de NaN."""
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def _present(values):
+    # Atributos con valor (los NaN no se mandan)
+    return {key: value for key, value in values.items() if value is not None and not (isinstance(value, float) and math.isnan(value))}
+
+
+def _int(params, name, default, low=1, high=None):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise ApiError(400, f"El parámetro {name} debe ser un entero") from None
+    if value < low:
+        raise ApiError(400, f"El parámetro {name} debe ser al menos {low}")
+    if high is not None and value > high:
+        raise ApiError(400, f"El parámetro {name} debe ser a lo más {high}")
+    return value
+
+
+def _float(params, name):
+    if name not in params:
+        raise ApiError(400, f"Falta el parámetro {name}")
+    try:
+        value = float(params[name])
+    except ValueError:
+        raise ApiError(400, f"El parámetro {name} debe ser un número") from None
+    if not math.isfinite(value):
+        raise ApiError(400, f"El parámetro {name} debe ser un número finito")
+    return value
+
+
+def _page(params, total, per_page, max_per_page):
+    page = _int(params, "page", 1)
+    per_page = _int(params, "per_page", per_page, high=max_per_page)
+    start = (page - 1) * per_page
+    return {"total": int(total), "page": page, "per_page": per_page}, slice(start, start + per_page)
+
+
+def _topic(data, params, required=False):
+    topic = params.get("topic")
+    if topic is None:
+        if required:
+            raise ApiError(400, "Falta el parámetro topic")
+        return None
+    if topic not in data.review_index.topics:
+        raise ApiError(404, f"Tópico desconocido: {topic}")
+    return topic
+
+
+def topics(data, params):
+    return {"topics": data.review_index.topics}
+
+
+def reviews(data, params):
+    topic = _topic(data, params, required=True)
+    hotel = params.get("hotel", ALL_HOTELS)
+    query = params.get("q", "").strip()
+    if query:
+        if data.search_index is None:
+            raise ApiError(400, "La búsqueda por texto no está disponible con el almacén en disco")
+        allowed = data.review_index.rows(topic, hotel)
+        positions, _ = data.search_index.search(query, k=None, allowed=allowed)
+    else:
+        positions = data.review_index.select(topic, hotel)
+    paging, window = _page(params, len(positions), 20, 100)
+
+    page = data.reviews.iloc[np.asarray(positions[window], dtype=np.intp)]
+    ratings = review_ratings(page)
+    rows = pd.DataFrame({
+        "position": page.index.to_numpy(),
+        "name": page["name"].to_numpy(dtype=object),
+        "topic": page["topic_label"].to_numpy(dtype=object),
+        "text": page["text"].to_numpy(dtype=object),
+    })
+    items = _records(rows)
+    for item, values in zip(items, _records(ratings.reset_index(drop=True))):
+        item["ratings"] = _present(values)
+    return {"topic": topic, "hotel": hotel, "q": query, **paging, "reviews": items}
+
+
+def averages(data, params):
+    topic = _topic(data, params)
+    if topic is None:
+        means, counts = data.averages, data.rating_aggregates.counts()
+    else:
+        cube = data.rating_cube
+        means = cube.means(topic).round(1)
+        counts = pd.DataFrame(cube.counts(topic), index=means.index, columns=cube.attributes)
+        rated = counts.to_numpy().sum(axis=1) > 0
+        means, counts = means[rated].sort_index(), counts[rated].sort_index()
+    hotel = params.get("hotel")
+    if hotel is not None:
+        if hotel not in means.index:
+            raise ApiError(404, f"Hotel sin calificaciones: {hotel}")
+        means, counts = means.loc[[hotel]], counts.loc[[hotel]]
+    paging, window = _page(params, len(means), 100, 1000)
+
+    means, counts = means.iloc[window], counts.iloc[window]
+    items = [
+        {"name": name, "averages": _present(mean), "counts": {key: value for key, value in count.items() if value}}
+        for name, mean, count in zip(means.index, _records(means), _records(counts))
+    ]
+    return {"topic": topic, **paging, "hotels": items}
+
+
+def bbox(data, params):
+    south, west, north, east = (_float(params, name) for name in ("south", "west", "north", "east"))
+    if south > north or west > east:
+        raise ApiError(400, "El rectángulo debe cumplir south <= north y west <= east")
+    hotels = data.hotels_in_box(south, west, north, east, _topic(data, params))
+    paging, window = _page(params, len(hotels), 500, 5000)
+    return {**paging, "hotels": _records(hotels.iloc[window])}
+
+
+ROUTES = {
+    "/topics": topics,
+    "/reviews": reviews,
+    "/hotels/averages": averages,
+    "/hotels/bbox": bbox,
+}
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"No se puede serializar {type(value).__name__}")
+
+
+def _encode(payload):
+    body = json.dumps(payload, ensure_ascii=False, allow_nan=False, default=_json_default).encode("utf-8")
+    return '"' + hashlib.sha256(body).hexdigest()[:20] + '"', body
+
+
+def respond(path, params):
+    """``(status, etag, cuerpo)`` de una petición ya separada en ruta y parámetros."""
+    handler = ROUTES.get(path)
+    if handler is None:
+        return (404, *_encode({"error": f"Ruta desconocida: {path}"}))
+    data = get_data()
+    key = (path, tuple(sorted(params.items())))
+    with _cache_lock:
+        if _cache_owner[0] is not data:
+            # Datos nuevos: las respuestas anteriores ya no valen
+            _cache.clear()
+            _cache_owner[0] = data
+        if key in _cache:
+            _cache.move_to_end(key)
+            return (200, *_cache[key])
+    try:
+        etag, body = _encode(handler(data, params))
+    except ApiError as exc:
+        return (exc.status, *_encode({"error": str(exc)}))
+    if API_CACHE_SIZE > 0:
+        with _cache_lock:
+            if _cache_owner[0] is data:
+                _cache[key] = (etag, body)
+                while len(_cache) > API_CACHE_SIZE:
+                    _cache.popitem(last=False)
+    return 200, etag, body
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 para que los clientes reutilicen la conexión
+    protocol_version = "HTTP/1.1"
+    # Encabezados y cuerpo salen en dos escrituras; con Nagle la segunda espera
+    # el ACK retrasado del cliente (~40 ms) en cada respuesta
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            status, etag, body = respond(url.path.rstrip("/") or "/", dict(parse_qsl(url.query)))
+        except Exception:
+            logger.exception("Error en %s", self.path)
+            status, etag, body = (500, *_encode({"error": "Error interno"}))
+        if status == 200 and etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 200:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s %s", self.address_string(), format % args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API JSON de reviews, promedios y hoteles del dashboard.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502, help="0 elige un puerto libre")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s")
+    # Carga los datos antes de aceptar peticiones
+    get_data()
+    server = ThreadingHTTPServer((args.host, args.port), ApiHandler)
+    server.daemon_threads = True
+    host, port = server.server_address[:2]
+    print(f"API en http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Precálculo fuera de línea de todo lo que las apps derivan de los CSV.
+
+Uso::
+
+    python -m hotel_core.build --workers 4
+
+Lee los tres datasets y escribe en ``HOTEL_ARTIFACTS_DIR/<versión>/``
+(por defecto ``data/artifacts``):
+
+- ``reviews/``: el almacén de ``hotel_core.store`` (ratings ya parseados,
+  índice de filtros, agregados por hotel, cubo por tópico y texto);
+- ``search/``: el índice de búsqueda como ``.npy`` sueltos;
+- ``hotels.parquet`` y ``hotel_members.parquet``: los hoteles deduplicados;
+- ``review_links.parquet``: el ``hotel_id`` de cada ``name`` de las reviews;
+- ``manifest.json``: hashes de los datasets y segundos por etapa.
+
+La deduplicación de hoteles corre en el pool de procesos al mismo tiempo que
+los bloques de reviews se parsean en ese mismo pool; el índice de búsqueda se
+construye en otro proceso mientras se unen los nombres. Al terminar, el archivo
+``CURRENT`` pasa a apuntar a la versión nueva y se borran las anteriores salvo
+las ``KEEP_VERSIONS`` más recientes.
+
+Si existe ``CURRENT``, ``get_data()`` abre esos archivos (con ``np.memmap``) en
+vez de cargar y derivar los CSV, así que las apps no revalidan contra la
+fuente: para ver datos nuevos hay que volver a correr el build.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from hotel_core.dedup import link_review_names, resolve_hotels
+from hotel_core.loader import DATA_DIR, DATASETS, dataset_hash, load_datasets
+from hotel_core.maps import hotel_locations
+from hotel_core.search import SearchIndex
+from hotel_core.store import CHUNK_SIZE, ReviewStore, ingest
+
+logger = logging.getLogger(__name__)
+
+ARTIFACTS_DIR = Path(os.environ.get("HOTEL_ARTIFACTS_DIR", DATA_DIR / "artifacts"))
+# Cambiarlo si cambia el formato de algún archivo, para no abrir versiones viejas
+FORMAT_VERSION = 3
+KEEP_VERSIONS = 2
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _build_search(store_dir, target):
+    store = ReviewStore(store_dir)
+    index = SearchIndex.from_texts(store.text_array().to_numpy(zero_copy_only=False))
+    index.save_arrays(target, store.sha256)
+
+
+def _prune(keep):
+    versions = sorted(path for path in ARTIFACTS_DIR.iterdir() if path.is_dir() and not path.name.startswith("tmp-"))
+    for path in versions[:-KEEP_VERSIONS]:
+        if path.name != keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def build(workers=None, chunk_size=CHUNK_SIZE, reviews_source=None):
+    """Escribe una versión nueva de los artefactos y la marca como vigente; devuelve su carpeta."""
+    workers = workers or os.cpu_count() or 1
+    if reviews_source is None:
+        local = DATA_DIR / "reviews.csv"
+        reviews_source = local if local.exists() else DATASETS["reviews"]
+    timings = {}
+    start = time.perf_counter()
+    frames = load_datasets(["coordenadas", "profesor"])
+    locations = hotel_locations(frames["coordenadas"], frames["profesor"])
+    timings["datasets"] = time.perf_counter() - start
+
+    ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+    work = ARTIFACTS_DIR / f"tmp-{os.getpid()}"
+    shutil.rmtree(work, ignore_errors=True)
+    work.mkdir()
+    with ProcessPoolExecutor(workers) as pool:
+        hotels_future = pool.submit(_timed, resolve_hotels, locations)
+        _, timings["reviews"] = _timed(ingest, reviews_source, work / "reviews", chunk_size, pool, 2 * workers)
+        search_future = pool.submit(_timed, _build_search, work / "reviews", work / "search")
+
+        store = ReviewStore(work / "reviews")
+        (hotels, members), timings["hotels"] = hotels_future.result()
+        links, timings["review_links"] = _timed(link_review_names, store.review_index.hotels, members)
+        _, timings["search"] = search_future.result()
+
+    hotels.to_parquet(work / "hotels.parquet", index=False)
+    members.to_parquet(work / "hotel_members.parquet", index=False)
+    links.to_parquet(work / "review_links.parquet", index=False)
+    datasets = {"reviews": store.sha256, "coordenadas": dataset_hash("coordenadas"), "profesor": dataset_hash("profesor")}
+    digest = hashlib.sha256(json.dumps([FORMAT_VERSION, datasets]).encode()).hexdigest()[:12]
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{digest}"
+    (work / "manifest.json").write_text(json.dumps({
+        "version": version,
+        "format": FORMAT_VERSION,
+        "datasets": datasets,
+        "reviews_source": str(reviews_source),
+        "workers": workers,
+        "seconds": {stage: round(seconds, 3) for stage, seconds in timings.items()},
+        "created_at": time.time(),
+    }, indent=2))
+
+    target = ARTIFACTS_DIR / version
+    os.replace(work, target)
+    current = ARTIFACTS_DIR / "CURRENT.tmp"
+    current.write_text(version)
+    os.replace(current, ARTIFACTS_DIR / "CURRENT")
+    _prune(version)
+    return target
+
+
+def current_artifacts():
+    """Carpeta de la versión vigente de los artefactos, o None si no hay una compatible."""
+    try:
+        version = (ARTIFACTS_DIR / "CURRENT").read_text().strip()
+        manifest = json.loads((ARTIFACTS_DIR / version / "manifest.json").read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != FORMAT_VERSION:
+        return None
+    return ARTIFACTS_DIR / version
+
+
+def load_artifacts(directory):
+    """Argumentos de ``HotelData`` leídos de una versión de los artefactos."""
+    store = ReviewStore(directory / "reviews")
+    search_index, _ = SearchIndex.load_arrays(directory / "search")
+    return {
+        "reviews": store,
+        "review_index": store.review_index,
+        "search_index": search_index,
+        "rating_aggregates": store.rating_aggregates,
+        "rating_cube": store.rating_cube,
+        "locations": pd.read_parquet(directory / "hotels.parquet"),
+        "location_members": pd.read_parquet(directory / "hotel_members.parquet"),
+        "review_links": pd.read_parquet(directory / "review_links.parquet"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precalcula los artefactos que abren las apps al arrancar.")
+    parser.add_argument("--workers", type=int, default=None, help="procesos del pool (por defecto, uno por CPU)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="filas por bloque de reviews")
+    parser.add_argument("--reviews-source", default=None, help="CSV de reviews (ruta o URL)")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s")
+    start = time.perf_counter()
+    target = build(args.workers, args.chunk_size, args.reviews_source)
+    manifest = json.loads((target / "manifest.json").read_text())
+    for stage, seconds in manifest["seconds"].items():
+        print(f"{stage:>14}: {seconds:8.2f} s")
+    print(f"Artefactos en {target} ({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
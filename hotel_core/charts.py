@@ -0,0 +1,70 @@
+"""Gráfica de comparación review vs. promedio del hotel para varias reviews a la vez.
+
+``rating_deltas`` calcula en una sola operación sobre todas las filas mostradas
+la diferencia entre cada calificación de la review y el promedio de su hotel
+(``averages`` alineado por ``name``), y ``comparison_figure`` la dibuja como una
+sola figura de plotly con las barras agrupadas por review, en lugar de un
+DataFrame y una gráfica por tarjeta.
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from hotel_core.render import attribute_order
+
+POSITIVE_COLOR = "#27ae60"
+NEGATIVE_COLOR = "#c0392b"
+
+
+def rating_deltas(reviews, ratings, averages):
+    """Una fila por (review, atributo) con ``review``, ``average`` y ``delta``.
+
+    ``reviews`` trae ``name``; ``ratings`` es el frame numérico de
+    ``review_ratings`` para esas mismas filas y ``averages`` el promedio por
+    hotel (índice ``name``). Solo quedan los atributos calificados en la review
+    y con promedio en el hotel. ``card`` es la posición de la review (1, 2, ...)
+    en ``reviews``.
+    """
+    columns = [column for column in attribute_order(ratings.columns) if column in averages.columns]
+    review = ratings[columns].to_numpy(dtype=np.float64)
+    average = averages[columns].reindex(reviews["name"].to_numpy()).to_numpy(dtype=np.float64)
+    rows, cols = np.nonzero(~np.isnan(review) & ~np.isnan(average))
+    return pd.DataFrame({
+        "card": rows + 1,
+        "name": reviews["name"].to_numpy()[rows],
+        "attribute": np.array(columns, dtype=object)[cols],
+        "review": review[rows, cols],
+        "average": average[rows, cols].round(2),
+        "delta": (review[rows, cols] - average[rows, cols]).round(2),
+    })
+
+
+def comparison_figure(deltas):
+    """Barras de ``delta`` por atributo, agrupadas por review (``card``), en una sola figura.
+
+    Es una sola traza sobre un eje de categorías de dos niveles (review y
+    atributo): el JSON crece con el número de barras, no con el de paneles.
+    Cada barra lleva escrita la calificación de la review.
+    """
+    panels = "#" + deltas["card"].astype(str) + " · " + deltas["name"].astype(str).str.slice(0, 24)
+    colors = np.where(deltas["delta"] >= 0, POSITIVE_COLOR, NEGATIVE_COLOR)
+    fig = go.Figure(go.Bar(
+        x=deltas["delta"],
+        y=[panels, deltas["attribute"]],
+        orientation="h",
+        marker_color=colors,
+        # El número en cada barra es la calificación de la review; el largo, la diferencia con el promedio
+        text=deltas["review"],
+        texttemplate="%{text:.1f}",
+        textposition="outside",
+        customdata=deltas[["average"]],
+        hovertemplate="Review: %{text:.1f}<br>Promedio del hotel: %{customdata[0]:.2f}<br>Diferencia: %{x:+.2f}<extra></extra>",
+    ))
+    fig.update_layout(
+        height=60 + 22 * len(deltas),
+        margin=dict(l=10, r=10, t=10, b=10),
+        xaxis=dict(range=[-4.5, 4.5], zeroline=True, zerolinecolor="#888", title="Review − promedio del hotel"),
+        yaxis=dict(autorange="reversed"),
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
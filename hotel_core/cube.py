@@ -0,0 +1,268 @@
+"""Cubo de calificaciones por (tópico, hotel, atributo) para las vistas de BI.
+
+``RatingCube`` guarda tres arreglos densos:
+
+- ``sums[t, h, a]``: suma de las calificaciones del atributo ``a`` en las
+  reviews del tópico ``t`` y el hotel ``h`` (float64, exacta porque las
+  calificaciones son múltiplos de 0.5);
+- ``counts[t, h, a]``: cuántas de esas reviews calificaron el atributo;
+- ``reviews[t, h]``: cuántas reviews hay en la celda, calificadas o no.
+
+Se construye una sola vez con ``np.bincount`` sobre los códigos de tópico y
+hotel (un groupby vectorizado por atributo), y después cada consulta es una
+rebanada: el promedio de una celda es O(atributos), un ranking o una columna
+del cubo es O(hoteles) y los totales sobre todos los tópicos (o todos los
+hoteles) se calculan la primera vez y quedan en caché. Con 10 tópicos, 7
+atributos y 10.000 hoteles el cubo ocupa ~9 MB; ``save``/``load`` lo guardan
+como ``.npy`` que se abren con ``mmap_mode="r"``.
+
+Las reviews sin tópico o sin hotel no entran al cubo (sí a ``RatingAggregates``).
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from hotel_core.reviews import review_ratings
+
+_ARRAYS = ("sums", "counts", "reviews")
+
+
+def _capacity(current, needed):
+    capacity = max(current, 1)
+    while capacity < needed:
+        capacity *= 2
+    return capacity
+
+
+class RatingCube:
+    """Sumas y conteos de calificaciones por (tópico, hotel, atributo)."""
+
+    def __init__(self, attributes=()):
+        self.topics = []
+        self.hotels = []
+        self.attributes = list(attributes)
+        self._sums = np.zeros((0, 0, len(self.attributes)))
+        self._counts = np.zeros((0, 0, len(self.attributes)), dtype=np.int32)
+        self._reviews = np.zeros((0, 0), dtype=np.int32)
+        self._reset()
+
+    def _reset(self):
+        self._topic_codes = {topic: code for code, topic in enumerate(self.topics)}
+        self._hotel_codes = {hotel: code for code, hotel in enumerate(self.hotels)}
+        # Totales sobre un eje completo, calculados al pedirlos
+        self._rollups = {}
+        self._names = None
+
+    def _hotel_names(self):
+        # Nombres como arreglo, para indexarlos con las posiciones de un ranking
+        if self._names is None:
+            self._names = np.array(self.hotels, dtype=object)
+        return self._names
+
+    @classmethod
+    def from_frame(cls, df):
+        topics = pd.Categorical(df["topic_label"])
+        hotels = pd.Categorical(df["name"])
+        cube = cls()
+        cube.add(topics.codes, hotels.codes, review_ratings(df), topics.categories, hotels.categories)
+        return cube
+
+    def _grow(self, n_topics, n_hotels, n_attributes):
+        topics, hotels, attributes = self._sums.shape
+        if n_topics <= topics and n_hotels <= hotels and n_attributes <= attributes:
+            return
+        shape = (_capacity(topics, n_topics), _capacity(hotels, n_hotels), max(attributes, n_attributes))
+        sums = np.zeros(shape)
+        counts = np.zeros(shape, dtype=np.int32)
+        reviews = np.zeros(shape[:2], dtype=np.int32)
+        sums[:topics, :hotels, :attributes] = self._sums
+        counts[:topics, :hotels, :attributes] = self._counts
+        reviews[:topics, :hotels] = self._reviews
+        self._sums, self._counts, self._reviews = sums, counts, reviews
+
+    def add(self, topic_codes, hotel_codes, ratings_frame, topics, hotels):
+        """Suma un lote de reviews dadas como códigos.
+
+        ``topic_codes`` y ``hotel_codes`` indexan ``topics`` y ``hotels`` (las
+        etiquetas de todos los códigos vistos hasta ahora, en orden; -1 para
+        los valores faltantes) y están alineados fila a fila con
+        ``ratings_frame``. Los códigos de lotes anteriores deben seguir
+        significando lo mismo, como los del almacén de ``hotel_core.store``.
+        """
+        self.topics = list(topics)
+        self.hotels = list(hotels)
+        for column in ratings_frame.columns:
+            if column not in self.attributes:
+                self.attributes.append(column)
+        self._grow(len(self.topics), len(self.hotels), len(self.attributes))
+
+        topic_codes = np.asarray(topic_codes, dtype=np.int64)
+        hotel_codes = np.asarray(hotel_codes, dtype=np.int64)
+        keep = (topic_codes >= 0) & (hotel_codes >= 0)
+        n_topics, n_hotels = self._reviews.shape
+        cells = topic_codes[keep] * n_hotels + hotel_codes[keep]
+        n_cells = n_topics * n_hotels
+        self._reviews += np.bincount(cells, minlength=n_cells).reshape(n_topics, n_hotels).astype(np.int32)
+        for column in ratings_frame.columns:
+            values = ratings_frame[column].to_numpy(dtype=np.float64)[keep]
+            present = ~np.isnan(values)
+            col = self.attributes.index(column)
+            self._sums[:, :, col] += np.bincount(cells[present], values[present], minlength=n_cells).reshape(n_topics, n_hotels)
+            self._counts[:, :, col] += np.bincount(cells[present], minlength=n_cells).reshape(n_topics, n_hotels).astype(np.int32)
+        self._reset()
+        return self
+
+    def _view(self, name):
+        array = getattr(self, "_" + name)
+        return array[: len(self.topics), : len(self.hotels), : len(self.attributes)]
+
+    def _slice(self, name, topic):
+        """``name`` de un tópico (hoteles × atributos) o, con ``topic=None``, sumado sobre los tópicos."""
+        if topic is not None:
+            return self._view(name)[self._topic_codes[topic]]
+        if name not in self._rollups:
+            self._rollups[name] = self._view(name).sum(axis=0, dtype=self._view(name).dtype)
+        return self._rollups[name]
+
+    def _topic_rollup(self, name):
+        key = ("topics", name)
+        if key not in self._rollups:
+            self._rollups[key] = self._view(name).sum(axis=1, dtype=self._view(name).dtype)
+        return self._rollups[key]
+
+    def sums(self, topic=None):
+        """Sumas hoteles × atributos de ``topic`` (o de todos los tópicos)."""
+        return self._slice("sums", topic)
+
+    def counts(self, topic=None):
+        """Número de calificaciones hoteles × atributos de ``topic`` (o de todos los tópicos)."""
+        return self._slice("counts", topic)
+
+    def review_counts(self, topic=None):
+        """Reviews por hotel de ``topic`` (o de todos los tópicos)."""
+        if topic is not None:
+            return self._reviews[self._topic_codes[topic], : len(self.hotels)]
+        if "reviews" not in self._rollups:
+            self._rollups["reviews"] = self._reviews[: len(self.topics), : len(self.hotels)].sum(axis=0)
+        return self._rollups["reviews"]
+
+    def means(self, topic=None):
+        """Promedio por hotel y atributo de ``topic`` (o de todos los tópicos); NaN sin datos."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = self.sums(topic) / self.counts(topic)
+        return pd.DataFrame(values, index=pd.Index(self.hotels, name="name"), columns=self.attributes)
+
+    def topic_means(self, hotel=None):
+        """Promedio por tópico y atributo de ``hotel`` (o de todos los hoteles); NaN sin datos."""
+        if hotel is None:
+            sums, counts = self._topic_rollup("sums"), self._topic_rollup("counts")
+        else:
+            code = self._hotel_codes[hotel]
+            sums, counts = self._view("sums")[:, code], self._view("counts")[:, code]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = sums / counts
+        return pd.DataFrame(values, index=pd.Index(self.topics, name="topic"), columns=self.attributes)
+
+    def hotel_totals(self, attribute, topic=None):
+        """Suma y número de calificaciones de ``attribute`` y número de reviews, por hotel.
+
+        Un tópico o atributo que no está en el cubo da ceros.
+        """
+        index = pd.Index(self.hotels, name="name")
+        if topic is not None and topic not in self._topic_codes:
+            zeros = np.zeros(len(self.hotels), dtype=np.int64)
+            return pd.DataFrame({"sum": zeros.astype(np.float64), "count": zeros, "reviews": zeros}, index=index)
+        if attribute in self.attributes:
+            col = self.attributes.index(attribute)
+            sums, counts = self.sums(topic)[:, col], self.counts(topic)[:, col]
+        else:
+            sums, counts = np.zeros(len(self.hotels)), np.zeros(len(self.hotels), dtype=np.int64)
+        return pd.DataFrame({"sum": sums, "count": counts, "reviews": self.review_counts(topic)}, index=index)
+
+    def _top(self, candidates, scores, k):
+        """Posiciones (en ``candidates``) de los ``k`` mejores ``scores``, de mayor a menor y empates por nombre.
+
+        Solo se ordenan los ``k`` elegidos con ``np.argpartition``, no todos
+        los candidatos.
+        """
+        chosen = np.arange(len(candidates))
+        if 0 < k < len(candidates):
+            top = np.argpartition(-scores, k - 1)[:k]
+            # Los que empatan con el k-ésimo también entran al desempate por nombre
+            chosen = np.flatnonzero(scores >= scores[top].min())
+        names = self._hotel_names()[candidates[chosen]]
+        return chosen[np.lexsort((names, -scores[chosen]))[:k]]
+
+    def ranking(self, attribute, topic=None, k=10, min_count=1):
+        """Los ``k`` hoteles con mejor promedio de ``attribute`` entre los que tienen ``min_count`` calificaciones o más.
+
+        Devuelve ``name``, ``mean`` y ``count`` de mayor a menor promedio
+        (empates por nombre).
+        """
+        col = self.attributes.index(attribute)
+        sums, counts = self.sums(topic)[:, col], self.counts(topic)[:, col]
+        candidates = np.flatnonzero(counts >= max(min_count, 1))
+        means = sums[candidates] / counts[candidates]
+        order = self._top(candidates, means, k)
+        return pd.DataFrame({
+            "name": self._hotel_names()[candidates[order]],
+            "mean": means[order],
+            "count": counts[candidates[order]].astype(np.int64),
+        })
+
+    def leaderboard(self, attribute, topic=None, k=10, prior_weight=None, min_count=1):
+        """Los ``k`` hoteles con mejor puntaje bayesiano de ``attribute``.
+
+        El puntaje de un hotel con suma ``s`` y ``n`` calificaciones es
+        ``(C * m + s) / (C + n)``: su promedio encogido hacia el promedio
+        global ``m`` del atributo (en ``topic``, o en todos los tópicos) como si
+        tuviera ``C = prior_weight`` calificaciones más con ese valor. Así una
+        sola review de 5 estrellas no le gana a cientos de 4.8. Sin
+        ``prior_weight``, ``C`` es la mediana de calificaciones por hotel.
+
+        Devuelve ``name``, ``score``, ``mean`` y ``count`` de mayor a menor
+        puntaje (empates por nombre) y, en ``attrs``, ``prior_mean`` y
+        ``prior_weight``.
+        """
+        col = self.attributes.index(attribute)
+        sums, counts = self.sums(topic)[:, col], self.counts(topic)[:, col]
+        candidates = np.flatnonzero(counts >= max(min_count, 1))
+        sums, counts = sums[candidates], counts[candidates].astype(np.int64)
+        prior_mean = float(sums.sum() / counts.sum()) if len(candidates) else float("nan")
+        if prior_weight is None:
+            prior_weight = float(np.median(counts)) if len(candidates) else 0.0
+        scores = (prior_weight * prior_mean + sums) / (prior_weight + counts)
+        order = self._top(candidates, scores, k)
+        board = pd.DataFrame({
+            "name": self._hotel_names()[candidates[order]],
+            "score": scores[order],
+            "mean": sums[order] / counts[order],
+            "count": counts[order],
+        })
+        board.attrs.update(prior_mean=prior_mean, prior_weight=prior_weight)
+        return board
+
+    def save(self, directory):
+        """Guarda los arreglos como ``.npy`` y las etiquetas en ``labels.json``."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            array = self._reviews[: len(self.topics), : len(self.hotels)] if name == "reviews" else self._view(name)
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(array))
+        (directory / "labels.json").write_text(json.dumps(
+            {"topics": self.topics, "hotels": self.hotels, "attributes": self.attributes}, ensure_ascii=False
+        ))
+
+    @classmethod
+    def load(cls, directory):
+        """Abre un cubo escrito por ``save`` (de solo lectura: no admite ``add``)."""
+        directory = Path(directory)
+        labels = json.loads((directory / "labels.json").read_text())
+        cube = cls(labels["attributes"])
+        cube.topics, cube.hotels = labels["topics"], labels["hotels"]
+        for name in _ARRAYS:
+            setattr(cube, "_" + name, np.load(directory / f"{name}.npy", mmap_mode="r"))
+        cube._reset()
+        return cube
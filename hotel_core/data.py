@@ -0,0 +1,172 @@
+"""Datos compartidos por todas las páginas del dashboard.
+
+``get_data()`` devuelve un ``HotelData`` con las reviews, los índices, los
+promedios y la tabla de ubicaciones. Todo se calcula una vez por proceso del
+servidor y por versión de los datasets (ver ``loader.load_derived``), y el mismo
+objeto se comparte entre sesiones y páginas, así que la memoria no crece con el
+número de usuarios. Los frames son de solo lectura: las páginas no deben
+modificarlos.
+"""
+import threading
+
+import pandas as pd
+
+from hotel_core.aggregates import load_aggregates
+from hotel_core.build import current_artifacts, load_artifacts
+from hotel_core.cube import RatingCube
+from hotel_core.dedup import load_canonical_hotels, load_review_links
+from hotel_core.geo import GridIndex
+from hotel_core.index import ReviewIndex
+from hotel_core.loader import dataset_hash, load_dataset, load_datasets, load_derived
+from hotel_core.maps import hotel_locations
+from hotel_core.search import load_search_index
+from hotel_core.store import REVIEW_STORE, open_store
+from hotel_core.timing import stage
+
+_current = {}
+_lock = threading.Lock()
+
+
+class HotelData:
+    """Reviews, estructuras derivadas y ubicaciones de una versión de los datasets."""
+
+    def __init__(
+        self, version, reviews, review_index, search_index, rating_aggregates, locations, location_members,
+        review_links, rating_cube,
+    ):
+        # Hash de las reviews; sirve como parte de las llaves de caché por sesión
+        self.version = version
+        # Tabla compacta o ``ReviewStore``; las dos entregan filas con ``.iloc``
+        self.reviews = reviews
+        self.review_index = review_index
+        # None con el almacén en disco (sin búsqueda por texto)
+        self.search_index = search_index
+        self.rating_aggregates = rating_aggregates
+        self.averages = rating_aggregates.means()
+        # Un registro por hotel ya deduplicado, con su hotel_id
+        self.locations = locations
+        # Cada fila de las dos fuentes con el hotel_id que le tocó
+        self.location_members = location_members
+        self.spatial_index = GridIndex(locations["latitude"], locations["longitude"])
+        # name de las reviews -> hotel_id (ver dedup.link_review_names)
+        self.review_links = review_links
+        # Sumas y conteos por (tópico, name, atributo), ver hotel_core.cube
+        self.rating_cube = rating_cube
+        self._map_hotels = {}
+        self._hotel_averages = None
+
+    def map_hotels(self, topic=None):
+        """``locations`` con ``avg_overall`` y ``n_reviews`` de las reviews unidas a cada hotel.
+
+        Con ``topic`` solo cuentan las reviews de ese tópico. Los hoteles sin
+        reviews quedan con ``avg_overall`` NaN y ``n_reviews`` 0.
+        """
+        if topic not in self._map_hotels:
+            stats = self.rating_cube.hotel_totals("overall", topic)
+            by_hotel = stats.join(self._links(), how="inner").groupby("hotel_id").sum()
+            hotels = self.locations.join(by_hotel, on="hotel_id")
+            hotels["avg_overall"] = (hotels["sum"] / hotels["count"].where(hotels["count"] > 0)).round(2)
+            hotels["n_reviews"] = hotels["reviews"].fillna(0).astype(int)
+            self._map_hotels[topic] = hotels.drop(columns=["sum", "count", "reviews"])
+        return self._map_hotels[topic]
+
+    def _links(self):
+        # name de las reviews -> hotel_id, sin los nombres que no se enlazaron
+        return self.review_links.dropna(subset=["hotel_id"]).set_index("name")["hotel_id"]
+
+    def hotel_averages(self):
+        """Promedio por ``hotel_id`` y atributo de las reviews unidas a cada hotel, redondeado a un decimal."""
+        if self._hotel_averages is None:
+            cube = self.rating_cube
+            index = pd.Index(cube.hotels, name="name")
+            sums = pd.DataFrame(cube.sums(), index=index, columns=cube.attributes)
+            counts = pd.DataFrame(cube.counts(), index=index, columns=cube.attributes)
+            links = self._links()
+            sums = sums.join(links, how="inner").groupby("hotel_id").sum()
+            counts = counts.join(links, how="inner").groupby("hotel_id").sum()
+            self._hotel_averages = (sums / counts.where(counts > 0)).round(1)
+        return self._hotel_averages
+
+    def hotels_in_box(self, south, west, north, east, topic=None):
+        """Filas de ``map_hotels(topic)`` dentro del rectángulo, en el orden de ``locations``."""
+        return self.map_hotels(topic).iloc[self.spatial_index.in_box(south, west, north, east)]
+
+    def nearby(self, lat, lon, radius_km=None, k=None):
+        """Hoteles a ``radius_km`` o menos del punto, o los ``k`` más cercanos.
+
+        Devuelve las columnas de ``locations`` más ``distance_km`` y los
+        promedios por atributo del hotel (``hotel_averages``; NaN si no tiene
+        reviews unidas), de cerca a lejos.
+        """
+        if (radius_km is None) == (k is None):
+            raise ValueError("Indica radius_km o k, no ambos")
+        if k is None:
+            positions, distances = self.spatial_index.within(lat, lon, radius_km)
+        else:
+            positions, distances = self.spatial_index.nearest(lat, lon, k)
+        hotels = self.locations.iloc[positions].reset_index(drop=True)
+        hotels.insert(len(hotels.columns), "distance_km", distances.round(2))
+        averages = self.hotel_averages().reindex(hotels["hotel_id"]).reset_index(drop=True)
+        return pd.concat([hotels, averages], axis=1)
+
+
+def _review_structures():
+    """Reviews y sus estructuras derivadas: de la tabla en memoria o del almacén en disco."""
+    if REVIEW_STORE:
+        store = open_store()
+        return store.sha256, {
+            "reviews": store,
+            "review_index": store.review_index,
+            "search_index": None,
+            "rating_aggregates": store.rating_aggregates,
+            "rating_cube": store.rating_cube,
+        }
+    reviews = load_dataset("reviews")
+    return dataset_hash("reviews"), {
+        "reviews": reviews,
+        "review_index": lambda: load_derived("reviews", "review_index", ReviewIndex.from_frame),
+        "search_index": lambda: load_derived("reviews", "search_index", load_search_index),
+        "rating_aggregates": lambda: load_derived("reviews", "rating_aggregates", load_aggregates),
+        "rating_cube": lambda: load_derived("reviews", "rating_cube", RatingCube.from_frame),
+    }
+
+
+def get_data():
+    """``HotelData`` de la versión actual de los datasets (compartido por proceso).
+
+    Si hay artefactos de ``hotel_core.build`` se abren esos; si no, con
+    ``HOTEL_REVIEW_STORE`` las reviews salen del almacén de ``hotel_core.store``
+    y lo demás se deriva de los CSV; si no, todo se deriva de los CSV.
+    """
+    artifacts = current_artifacts()
+    if artifacts is not None:
+        key = ("artifacts", artifacts.name)
+    else:
+        # Los CSV se descargan (o revalidan) a la vez; después ya están en caché
+        frames = load_datasets(["coordenadas", "profesor"] + ([] if REVIEW_STORE else ["reviews"]))
+        reviews_version, structures = _review_structures()
+        df_coordenadas, df_profesor = frames["coordenadas"], frames["profesor"]
+        key = (reviews_version, dataset_hash("coordenadas"), dataset_hash("profesor"))
+
+    with _lock:
+        if _current.get("key") == key:
+            return _current["data"]
+
+    with stage("hotel_data", cache="miss"):
+        if artifacts is not None:
+            data = HotelData(version=artifacts.name, **load_artifacts(artifacts))
+        else:
+            structures = {name: value() if callable(value) else value for name, value in structures.items()}
+            locations, location_members = load_canonical_hotels(hotel_locations(df_coordenadas, df_profesor))
+            data = HotelData(
+                version=key[0],
+                locations=locations,
+                location_members=location_members,
+                review_links=load_review_links(structures["review_index"].hotels, location_members),
+                **structures,
+            )
+    with _lock:
+        # Solo se guarda la versión más reciente; las anteriores se liberan
+        if _current.get("key") != key:
+            _current.update(key=key, data=data)
+        return _current["data"]
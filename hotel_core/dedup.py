@@ -0,0 +1,350 @@
+"""Resolución de entidades entre ``hotels_ca.csv`` y ``Prof_BBDD_BI.csv``.
+
+El mismo hotel aparece en las dos fuentes con el nombre o la dirección escritos
+distinto ("GRAND HOTEL", "Grand Htl.", "Main St." vs "Main Street"), así que el
+``drop_duplicates(subset=["name", "address"])`` exacto lo deja dos veces.
+Comparar todos contra todos es O(n²); en vez de eso se arman bloques por celda
+de una grilla de latitud/longitud (más las celdas vecinas) y por cada token del
+nombre normalizado, y solo se comparan pares que comparten algún bloque.
+
+Además, los registros con el mismo nombre y la misma dirección normalizados
+(y dirección no vacía) se comparan aunque estén lejos: es el mismo hotel
+geocodificado distinto en cada fuente.
+
+El resultado es una tabla con un ``hotel_id`` estable y único por hotel
+(derivado del registro canónico, el primero en el orden de las fuentes) y se
+guarda en ``HOTEL_DATA_DIR`` junto con el hash de las fuentes.
+
+``link_review_names`` usa la misma normalización para unir cada ``name`` de las
+reviews con su ``hotel_id``; esa tabla también se guarda en disco.
+"""
+import difflib
+import hashlib
+import json
+import logging
+import os
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from hotel_core.geo import haversine_km
+from hotel_core.loader import DATA_DIR, frame_hash
+
+logger = logging.getLogger(__name__)
+
+CANONICAL_PATH = DATA_DIR / "hotel_ids.parquet"
+LINKS_PATH = DATA_DIR / "review_hotel_links.parquet"
+
+# ~1 km en latitud; se comparan la celda propia y sus 8 vecinas
+GRID_DEGREES = 0.01
+NAME_THRESHOLD = 0.85
+ADDRESS_THRESHOLD = 0.85
+MAX_DISTANCE_KM = 0.25
+MAX_BLOCK_SIZE = 10
+
+_ABBREVIATIONS = {
+    "htl": "hotel", "st": "street", "ave": "avenue", "av": "avenue", "blvd": "boulevard",
+    "rd": "road", "dr": "drive", "hwy": "highway", "ln": "lane", "ct": "court", "n": "north",
+    "s": "south", "e": "east", "w": "west", "&": "and",
+}
+# Palabras demasiado comunes para servir de bloque
+_BLOCK_STOPWORDS = {"hotel", "inn", "suites", "suite", "resort", "lodge", "motel", "the", "and", "by", "at"}
+
+
+def normalize(text):
+    """Minúsculas, sin acentos ni puntuación y con abreviaturas expandidas."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii").lower()
+    text = "".join(char if char.isalnum() else " " for char in text)
+    return " ".join(_ABBREVIATIONS.get(token, token) for token in text.split())
+
+
+def _normalize_column(values):
+    values = pd.Series(values, dtype=object).fillna("")
+    # La mayoría de los valores se repiten poco, pero así se normaliza cada uno una sola vez
+    uniques = pd.unique(values)
+    mapping = {value: normalize(value) for value in uniques}
+    return values.map(mapping).to_numpy(dtype=object)
+
+
+def _block_tokens(names):
+    tokens = pd.Series(names).str.split().explode().dropna()
+    useful = tokens[~tokens.isin(_BLOCK_STOPWORDS)]
+    # Nombres hechos solo de palabras comunes: se bloquea por el nombre completo
+    missing = np.setdiff1d(np.arange(len(names)), useful.index.to_numpy())
+    fallback = pd.Series(np.asarray(names, dtype=object)[missing], index=missing)
+    return pd.concat([useful, fallback])
+
+
+def candidate_pairs(records):
+    """Pares ``(i, j)`` con ``i < j`` que comparten celda (o vecina) y algún token.
+
+    ``records`` trae ``norm_name``, ``latitude`` y ``longitude``. Los registros sin
+    coordenadas solo se emparejan entre sí por nombre normalizado idéntico. Si
+    trae ``norm_address``, también se emparejan los de nombre y dirección
+    idénticos, estén donde estén.
+    """
+    tokens = _block_tokens(records["norm_name"].to_numpy())
+    lat = records["latitude"].to_numpy(dtype=np.float64)
+    lon = records["longitude"].to_numpy(dtype=np.float64)
+    has_coords = ~(np.isnan(lat) | np.isnan(lon))
+
+    ids = tokens.index.to_numpy()
+    located = has_coords[ids]
+    cell_lat = np.floor(lat[ids[located]] / GRID_DEGREES).astype(np.int64)
+    cell_lon = np.floor(lon[ids[located]] / GRID_DEGREES).astype(np.int64)
+    home = pd.DataFrame({"id": ids[located], "token": tokens.to_numpy()[located], "lat": cell_lat, "lon": cell_lon})
+
+    # Un token que comparten muchos hoteles de la misma celda (el nombre de la
+    # ciudad, una cadena) no distingue nada; se ignora si el registro tiene otros
+    block_size = home.groupby(["token", "lat", "lon"])["id"].transform("size")
+    small = block_size <= MAX_BLOCK_SIZE
+    has_small = small.groupby(home["id"]).transform("any")
+    home = home[small | ~has_small]
+
+    probes = []
+    for d_lat in (-1, 0, 1):
+        for d_lon in (-1, 0, 1):
+            probes.append(home.assign(lat=home["lat"] + d_lat, lon=home["lon"] + d_lon))
+    probe = pd.concat(probes, ignore_index=True)
+    pairs = home.merge(probe, on=["token", "lat", "lon"], suffixes=("_a", "_b"))[["id_a", "id_b"]]
+
+    unlocated = records.index.to_numpy()[~has_coords]
+    if len(unlocated):
+        names = pd.DataFrame({"id": unlocated, "norm_name": records["norm_name"].to_numpy()[unlocated]})
+        same = names.merge(names, on="norm_name", suffixes=("_a", "_b"))[["id_a", "id_b"]]
+        pairs = pd.concat([pairs, same], ignore_index=True)
+
+    if "norm_address" in records.columns:
+        # Mismo nombre y dirección a cualquier distancia (coordenadas distintas en cada fuente)
+        keys = pd.DataFrame({
+            "id": records.index.to_numpy(),
+            "norm_name": records["norm_name"].to_numpy(),
+            "norm_address": records["norm_address"].to_numpy(),
+        })
+        keys = keys[keys["norm_address"] != ""]
+        keys = keys[keys.duplicated(["norm_name", "norm_address"], keep=False)]
+        same = keys.merge(keys, on=["norm_name", "norm_address"], suffixes=("_a", "_b"))[["id_a", "id_b"]]
+        pairs = pd.concat([pairs, same], ignore_index=True)
+
+    pairs = pairs[pairs["id_a"] < pairs["id_b"]].drop_duplicates()
+    return pairs["id_a"].to_numpy(), pairs["id_b"].to_numpy()
+
+
+def _similar(left, right, threshold):
+    """Pares de textos cuyo ``SequenceMatcher.ratio()`` llega a ``threshold``.
+
+    Antes de calcular ``ratio()`` se descartan los pares cuyas cotas rápidas
+    (``real_quick_ratio`` y ``quick_ratio``) ya quedan por debajo.
+    """
+    result = np.zeros(len(left), dtype=bool)
+    for k, (a, b) in enumerate(zip(left, right)):
+        if a == b:
+            result[k] = True
+            continue
+        matcher = difflib.SequenceMatcher(None, a, b)
+        result[k] = (
+            matcher.real_quick_ratio() >= threshold
+            and matcher.quick_ratio() >= threshold
+            and matcher.ratio() >= threshold
+        )
+    return result
+
+
+def _numbers(names):
+    return [frozenset(token for token in name.split() if token.isdigit()) for name in names]
+
+
+def match_pairs(records, a, b):
+    """Filtra los candidatos a los que son el mismo hotel.
+
+    Las pruebas van de la más barata a la más cara, así cada una corre solo
+    sobre los pares que sobrevivieron a las anteriores.
+    """
+    names = records["norm_name"].to_numpy()
+    addresses = records["norm_address"].to_numpy()
+
+    # Números distintos en el nombre ("Motel 6" vs "Motel 8") son hoteles distintos
+    numbers = _numbers(names)
+    keep = np.fromiter((numbers[i] == numbers[j] for i, j in zip(a, b)), dtype=bool, count=len(a))
+    a, b = a[keep], b[keep]
+
+    # Cerca en el mapa o con la misma dirección (salvo errores de escritura)
+    lat = records["latitude"].to_numpy(dtype=np.float64)
+    lon = records["longitude"].to_numpy(dtype=np.float64)
+    distance = haversine_km(lat[a], lon[a], lat[b], lon[b])
+    near = np.nan_to_num(distance, nan=np.inf) <= MAX_DISTANCE_KM
+    far = np.flatnonzero(~near)
+    near[far] = _similar(addresses[a[far]], addresses[b[far]], ADDRESS_THRESHOLD)
+    a, b = a[near], b[near]
+
+    keep = _similar(names[a], names[b], NAME_THRESHOLD)
+    return a[keep], b[keep]
+
+
+def _components(n, a, b):
+    """Etiqueta de componente conexa (el menor índice) de cada registro."""
+    labels = np.arange(n)
+    while len(a):
+        merged = np.minimum(labels[a], labels[b])
+        before = labels.copy()
+        np.minimum.at(labels, a, merged)
+        np.minimum.at(labels, b, merged)
+        labels = labels[labels]
+        if np.array_equal(before, labels):
+            break
+    return labels
+
+
+def _hotel_ids(norm_names, norm_addresses):
+    """Un id por hotel canónico: hash del nombre y la dirección normalizados.
+
+    Si dos hoteles distintos comparten nombre y dirección (por ejemplo, sin
+    dirección), del segundo en adelante se agrega al hash su número de
+    aparición, así que el id sigue siendo único y estable para el mismo orden
+    de las fuentes.
+    """
+    keys = pd.Series([f"{name}|{address}" for name, address in zip(norm_names, norm_addresses)], dtype=object)
+    repeat = keys.groupby(keys, sort=False).cumcount().to_numpy()
+    keys = [key if k == 0 else f"{key}|{k}" for key, k in zip(keys, repeat)]
+    return np.array(["H" + hashlib.sha1(key.encode()).hexdigest()[:12] for key in keys], dtype=object)
+
+
+def resolve_hotels(locations):
+    """Agrupa los registros de ``locations`` que son el mismo hotel.
+
+    ``locations`` tiene ``name``, ``latitude``, ``longitude``, ``address`` y,
+    opcionalmente, ``source``. Devuelve ``(hotels, members)``: ``hotels`` tiene
+    una fila por hotel (la del registro canónico) con ``hotel_id`` y
+    ``n_records``; ``members`` asigna el ``hotel_id`` a cada registro de entrada.
+    """
+    records = locations.reset_index(drop=True).copy()
+    records["norm_name"] = _normalize_column(records["name"])
+    records["norm_address"] = _normalize_column(records["address"])
+
+    a, b = candidate_pairs(records)
+    a, b = match_pairs(records, a, b)
+    labels = _components(len(records), a, b)
+
+    canonical = np.unique(labels)
+    ids = _hotel_ids(records["norm_name"].to_numpy()[canonical], records["norm_address"].to_numpy()[canonical])
+    hotel_id = pd.Series(ids, index=canonical)
+    records["hotel_id"] = hotel_id.reindex(labels).to_numpy()
+
+    hotels = records.loc[canonical, ["hotel_id", "name", "latitude", "longitude", "address"]].copy()
+    hotels["n_records"] = np.bincount(labels)[canonical]
+    # map_hotels y hotels_in_box unen por hotel_id
+    assert hotels["hotel_id"].is_unique, "hotel_id repetido entre hoteles distintos"
+    members = records.drop(columns=["norm_name", "norm_address"])
+    return hotels.reset_index(drop=True), members
+
+
+def _read_cached(path, source_hash, *paths):
+    try:
+        meta = json.loads(path.with_suffix(".json").read_text())
+        if meta.get("source_sha256") == source_hash:
+            return [pd.read_parquet(target) for target in paths]
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _write_cached(path, meta, frames):
+    """Escribe ``frames`` (``{ruta: frame}``) y después el json con ``meta``."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for target, frame in frames.items():
+            tmp_path = target.with_suffix(".tmp")
+            frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, target)
+        path.with_suffix(".json").write_text(json.dumps(meta))
+    except (OSError, ValueError, ImportError) as exc:
+        logger.warning("No se pudo guardar %s: %s", path, exc)
+
+
+def load_canonical_hotels(locations, path=CANONICAL_PATH):
+    """``resolve_hotels`` con caché en disco por contenido de ``locations``."""
+    source_hash = frame_hash(locations)
+    members_path = path.with_name(path.stem + "_members.parquet")
+    cached = _read_cached(path, source_hash, path, members_path)
+    if cached is not None:
+        return tuple(cached)
+
+    hotels, members = resolve_hotels(locations)
+    meta = {"source_sha256": source_hash, "hotels": len(hotels), "records": len(members)}
+    _write_cached(path, meta, {path: hotels, members_path: members})
+    return hotels, members
+
+
+def link_review_names(names, members):
+    """Une cada nombre de hotel de las reviews con el ``hotel_id`` del mapa.
+
+    Las reviews solo traen el nombre, así que primero se busca el nombre
+    normalizado idéntico entre los registros de ``members``; los que no aparecen
+    se comparan con ``NAME_THRESHOLD`` contra los nombres que comparten algún
+    token (sin los tokens de más de ``MAX_BLOCK_SIZE`` nombres del catálogo
+    cuando el nombre tiene otros). Si un nombre corresponde a más de un hotel (una cadena con varias
+    sucursales) no hay cómo elegir y queda sin ``hotel_id``.
+
+    Devuelve un DataFrame con ``name``, ``hotel_id`` y ``match`` (``"exact"``,
+    ``"fuzzy"``, ``"ambiguous"`` o ``"none"``), una fila por nombre distinto.
+    """
+    names = pd.Series(pd.unique(pd.Series(names, dtype=object).dropna()), dtype=object)
+    links = pd.DataFrame({"name": names, "norm_name": _normalize_column(names)})
+    catalog = pd.DataFrame({
+        "norm_name": _normalize_column(members["name"]),
+        "hotel_id": members["hotel_id"].to_numpy(),
+    }).drop_duplicates()
+
+    exact = links.merge(catalog, on="norm_name")
+    candidates = links[~links["name"].isin(exact["name"])]
+    if len(candidates):
+        left = _block_tokens(candidates["norm_name"].to_numpy())
+        right = _block_tokens(catalog["norm_name"].to_numpy())
+        left = pd.DataFrame({"a": left.index, "token": left.to_numpy()})
+        right = pd.DataFrame({"b": right.index, "token": right.to_numpy()})
+        # Igual que en candidate_pairs: un token de muchos hoteles del catálogo
+        # se ignora si el nombre tiene otros
+        block_size = left["token"].map(right["token"].value_counts()).fillna(0)
+        small = block_size <= MAX_BLOCK_SIZE
+        has_small = small.groupby(left["a"]).transform("any")
+        left = left[small | ~has_small]
+        pairs = left.merge(right, on="token")[["a", "b"]].drop_duplicates()
+        a = pairs["a"].to_numpy()
+        b = pairs["b"].to_numpy()
+        left_names = candidates["norm_name"].to_numpy()
+        right_names = catalog["norm_name"].to_numpy()
+        left_numbers, right_numbers = _numbers(left_names), _numbers(right_names)
+        keep = np.fromiter((left_numbers[i] == right_numbers[j] for i, j in zip(a, b)), dtype=bool, count=len(a))
+        a, b = a[keep], b[keep]
+        keep = _similar(left_names[a], right_names[b], NAME_THRESHOLD)
+        fuzzy = pd.DataFrame({
+            "name": candidates["name"].to_numpy()[a[keep]],
+            "hotel_id": catalog["hotel_id"].to_numpy()[b[keep]],
+        }).drop_duplicates()
+    else:
+        fuzzy = pd.DataFrame(columns=["name", "hotel_id"])
+
+    matched = pd.concat([exact[["name", "hotel_id"]].assign(match="exact"), fuzzy.assign(match="fuzzy")])
+    n_ids = matched.groupby("name")["hotel_id"].transform("nunique")
+    matched.loc[n_ids > 1, ["hotel_id", "match"]] = [None, "ambiguous"]
+    matched = matched.drop_duplicates("name")
+
+    links = links[["name"]].merge(matched, on="name", how="left")
+    links["match"] = links["match"].fillna("none")
+    return links
+
+
+def load_review_links(names, members, path=LINKS_PATH):
+    """``link_review_names`` con caché en disco por contenido de los nombres y de ``members``."""
+    names = pd.DataFrame({"name": pd.unique(pd.Series(names, dtype=object).dropna())})
+    source_hash = hashlib.sha256((frame_hash(names) + frame_hash(members[["name", "hotel_id"]])).encode()).hexdigest()
+    cached = _read_cached(path, source_hash, path)
+    if cached is not None:
+        return cached[0]
+
+    links = link_review_names(names["name"], members)
+    counts = links["match"].value_counts().to_dict()
+    logger.info("Nombres de reviews unidos al mapa: %s", counts)
+    _write_cached(path, {"source_sha256": source_hash, **counts}, {path: links})
+    return links
@@ -0,0 +1,103 @@
+"""Utilidades geográficas vectorizadas: distancia haversine y un índice de grilla
+para consultas por radio, por rectángulo y de vecinos más cercanos."""
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distancia en km entre pares de puntos (acepta escalares o arreglos)."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+# Km por grado; el de longitud se multiplica por cos(latitud)
+KM_PER_DEGREE_LAT = 110.574
+KM_PER_DEGREE_LON = 111.320
+
+
+class GridIndex:
+    """Índice espacial de grilla regular sobre latitud/longitud.
+
+    Los puntos se ordenan por celda; como la llave de una celda es
+    ``fila * ancho + columna``, las celdas de una misma fila del rectángulo de
+    búsqueda forman un tramo contiguo del arreglo ordenado y se encuentran con
+    dos ``searchsorted``. Una consulta solo calcula distancias para los puntos
+    de las celdas que tocan el círculo buscado.
+    """
+
+    def __init__(self, lat, lon, cell_degrees=0.05):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        valid = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+        self.cell_degrees = cell_degrees
+        rows = np.floor(lat[valid] / cell_degrees).astype(np.int64)
+        cols = np.floor(lon[valid] / cell_degrees).astype(np.int64)
+        self._row0 = rows.min() if len(valid) else 0
+        self._col0 = cols.min() if len(valid) else 0
+        self._n_rows = (rows.max() - self._row0 + 1) if len(valid) else 0
+        self._width = (cols.max() - self._col0 + 1) if len(valid) else 1
+
+        keys = (rows - self._row0) * self._width + (cols - self._col0)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        # Posiciones originales (para .iloc) y coordenadas, en orden de celda
+        self.positions = valid[order]
+        self._lat = lat[self.positions]
+        self._lon = lon[self.positions]
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _candidates(self, lat, lon, radius_km):
+        d_lat = radius_km / KM_PER_DEGREE_LAT
+        d_lon = radius_km / (KM_PER_DEGREE_LON * max(np.cos(np.radians(lat)), 1e-6))
+        return self._cells(lat - d_lat, lon - d_lon, lat + d_lat, lon + d_lon)
+
+    def _cells(self, south, west, north, east):
+        """Índices (en orden de celda) de los puntos de las celdas que tocan el rectángulo."""
+        row_lo = max(int(np.floor(south / self.cell_degrees)) - self._row0, 0)
+        row_hi = min(int(np.floor(north / self.cell_degrees)) - self._row0, self._n_rows - 1)
+        col_lo = max(int(np.floor(west / self.cell_degrees)) - self._col0, 0)
+        col_hi = min(int(np.floor(east / self.cell_degrees)) - self._col0, self._width - 1)
+        if row_lo > row_hi or col_lo > col_hi:
+            return np.empty(0, dtype=np.intp)
+        rows = np.arange(row_lo, row_hi + 1)
+        starts = np.searchsorted(self._keys, rows * self._width + col_lo, side="left")
+        stops = np.searchsorted(self._keys, rows * self._width + col_hi, side="right")
+        if len(rows) == 1:
+            return np.arange(starts[0], stops[0])
+        return np.concatenate([np.arange(start, stop) for start, stop in zip(starts, stops)])
+
+    def within(self, lat, lon, radius_km):
+        """Puntos a ``radius_km`` o menos: ``(posiciones, distancias_km)`` de cerca a lejos."""
+        candidates = self._candidates(lat, lon, radius_km)
+        distances = haversine_km(lat, lon, self._lat[candidates], self._lon[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        return self.positions[candidates[order]], distances[order]
+
+    def in_box(self, south, west, north, east):
+        """Posiciones de los puntos dentro del rectángulo (bordes incluidos), en orden de posición."""
+        candidates = self._cells(south, west, north, east)
+        lat, lon = self._lat[candidates], self._lon[candidates]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return np.sort(self.positions[candidates[inside]])
+
+    def nearest(self, lat, lon, k):
+        """Los ``k`` puntos más cercanos: ``(posiciones, distancias_km)`` de cerca a lejos.
+
+        Busca en un radio que se duplica hasta que hay ``k`` puntos dentro; como
+        el radio es exacto (no el rectángulo), el resultado es el k-NN correcto.
+        """
+        k = min(k, len(self))
+        if k == 0:
+            return self.positions[:0], np.empty(0)
+        radius_km = self.cell_degrees * KM_PER_DEGREE_LAT
+        while True:
+            positions, distances = self.within(lat, lon, radius_km)
+            if len(positions) >= k or radius_km > 2 * np.pi * EARTH_RADIUS_KM:
+                return positions[:k], distances[:k]
+            radius_km *= 2
@@ -0,0 +1,100 @@
+"""Índice de posiciones de fila por tópico y por (tópico, hotel).
+
+Se construye una vez por versión del dataset y sustituye a las máscaras
+booleanas sobre ``topic_label`` y ``name`` que se recalculaban en cada rerun:
+filtrar cuesta lo mismo que el número de resultados, no que el tamaño de la
+tabla.
+"""
+import numpy as np
+import pandas as pd
+
+from hotel_core.representative import representatives_from_frame
+
+ALL_HOTELS = "Todos"
+
+_EMPTY = np.empty(0, dtype=np.intp)
+
+
+class ReviewIndex:
+    """Posiciones (para ``df.iloc``) de las reviews de cada tópico y hotel.
+
+    - ``topics``: tópicos en orden de primera aparición, como ``unique()``.
+    - ``hotels``: nombres de hotel ordenados alfabéticamente.
+    - ``by_topic[topic]``: todas las filas del tópico, en orden de archivo.
+    - ``by_topic_hotel[(topic, hotel)]``: filas de ese hotel dentro del tópico.
+    - ``representatives[topic]``: la review representativa de cada hotel
+      dentro del tópico (ver ``hotel_core.representative``), de la más cercana
+      al promedio del hotel a la menos. Sin ``representatives``, la primera de
+      cada hotel en orden de archivo, como ``drop_duplicates(subset=['name'])``.
+    """
+
+    def __init__(self, topics, names, representatives=None):
+        keys = pd.DataFrame({"topic": np.asarray(topics, dtype=object), "name": np.asarray(names, dtype=object)})
+        self.by_topic = keys.groupby("topic", sort=False).indices
+        self.by_topic_hotel = keys.groupby(["topic", "name"], sort=False).indices
+
+        if representatives is None:
+            first = keys.dropna()
+            first = first[~first.duplicated(["topic", "name"])]
+            representatives = {
+                topic: positions.to_numpy(dtype=np.intp)
+                for topic, positions in pd.Series(first.index, index=first["topic"]).groupby(level=0, sort=False)
+            }
+        self.representatives = representatives
+
+        self.topics = list(self.by_topic)
+        self.hotels = sorted(keys["name"].dropna().unique().tolist())
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(df["topic_label"], df["name"], representatives_from_frame(df))
+
+    @classmethod
+    def from_sorted(cls, order, offsets, topic_order, topic_offsets, topics, names, representatives):
+        """Índice a partir de posiciones ya ordenadas (ver ``hotel_core.store``).
+
+        ``order`` tiene las posiciones ordenadas por ``(código de tópico, código de
+        hotel)`` y, dentro de cada par, en orden de archivo; las del par
+        ``(t, h)`` son ``order[offsets[k]:offsets[k + 1]]`` con
+        ``k = t * len(names) + h``. ``topic_order``/``topic_offsets`` son lo
+        mismo por tópico solo. Los códigos de tópico siguen el orden de primera
+        aparición. ``representatives`` es el diccionario de
+        ``representative.by_topic``. Las entradas del índice son vistas de esos arreglos, así que
+        con arreglos ``np.memmap`` nada se copia a memoria.
+        """
+        index = cls.__new__(cls)
+        n_names = len(names)
+        index.by_topic = {
+            topic: topic_order[topic_offsets[code]:topic_offsets[code + 1]]
+            for code, topic in enumerate(topics)
+            if topic_offsets[code + 1] > topic_offsets[code]
+        }
+        keys = np.flatnonzero(np.diff(offsets))
+        index.by_topic_hotel = {
+            (topics[key // n_names], names[key % n_names]): order[offsets[key]:offsets[key + 1]]
+            for key in keys.tolist()
+        }
+        index.representatives = representatives
+        index.topics = list(index.by_topic)
+        index.hotels = sorted({names[key % n_names] for key in keys.tolist()})
+        return index
+
+    def select(self, topic, hotel=ALL_HOTELS, limit=None):
+        """Posiciones de las reviews que pasan los filtros.
+
+        Con un hotel, todas sus reviews del tópico en orden de archivo. Con
+        ``hotel == ALL_HOTELS`` ("Todos"), la review representativa de cada
+        hotel, de la más cercana al promedio a la menos (ver
+        ``hotel_core.representative``).
+        """
+        if hotel == ALL_HOTELS:
+            positions = self.representatives.get(topic, _EMPTY)
+        else:
+            positions = self.by_topic_hotel.get((topic, hotel), _EMPTY)
+        return positions if limit is None else positions[:limit]
+
+    def rows(self, topic, hotel=ALL_HOTELS):
+        """Todas las filas del tópico (o del tópico y hotel), sin quedarse con una por hotel."""
+        if hotel == ALL_HOTELS:
+            return self.by_topic.get(topic, _EMPTY)
+        return self.by_topic_hotel.get((topic, hotel), _EMPTY)
@@ -0,0 +1,305 @@
+"""Carga de los datasets con caché por proceso y snapshots locales en Parquet.
+
+Cada dataset se descarga una sola vez por proceso del servidor. La primera
+descarga se guarda en ``HOTEL_DATA_DIR`` como ``<nombre>.parquet`` junto a un
+``<nombre>.json`` con el hash SHA-256 del CSV original y los validadores HTTP
+de la respuesta (``ETag`` y ``Last-Modified``). Al vencer el TTL se pregunta a
+la fuente con ``If-None-Match``/``If-Modified-Since``: si responde 304 no se
+descarga ni se parsea nada; si manda el archivo y el hash no cambió, se
+reutiliza el snapshot sin volver a parsear.
+
+``load_datasets`` carga varios datasets a la vez en un pool de hilos (las
+descargas y ``read_csv`` sueltan el GIL) si alguno no está en caché o venció;
+si todos están vigentes los devuelve sin crear el pool. Cada dataset tiene su
+propio lock, así que una sesión que pide uno no espera a que se descarguen los
+otros.
+
+Los datasets con una función en ``PREPARE`` se transforman al leerlos (antes de
+guardar el snapshot), así que en memoria y en disco solo vive la versión ya
+preparada; la de ``reviews`` es ``hotel_core.reviews.compact_reviews``.
+
+Variables de entorno:
+
+- ``HOTEL_DATA_DIR``: carpeta de los snapshots (por defecto ``data/``).
+- ``HOTEL_DATA_TTL``: segundos antes de revalidar contra la fuente (3600).
+- ``HOTEL_DATA_OFFLINE``: con ``1`` nunca se usa la red; se leen el snapshot o
+  un ``<nombre>.csv`` dejado a mano en ``HOTEL_DATA_DIR``.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from hotel_core.reviews import compact_reviews
+from hotel_core.timing import bind, stage
+
+logger = logging.getLogger(__name__)
+
+DATASETS = {
+    "reviews": "https://github.com/melody-10/Proyecto_Hoteles_California/blob/main/final_database.csv?raw=true",
+    "coordenadas": "https://raw.githubusercontent.com/0241603-cmyk/PROYECTO-FINAL/refs/heads/main/hotels_ca.csv",
+    "profesor": "https://raw.githubusercontent.com/0241603-cmyk/PROYECTO-FINAL/refs/heads/main/Prof_BBDD_BI.csv",
+}
+
+# nombre -> función que recibe el frame leído y devuelve el que se guarda (idempotente)
+PREPARE = {
+    "reviews": compact_reviews,
+}
+
+DATA_DIR = Path(os.environ.get("HOTEL_DATA_DIR", Path(__file__).resolve().parent.parent / "data"))
+CACHE_TTL = float(os.environ.get("HOTEL_DATA_TTL", 3600))
+OFFLINE = os.environ.get("HOTEL_DATA_OFFLINE", "0") == "1"
+
+# nombre -> {"frame", "sha256", "checked_at"}
+_memory = {}
+_lock = threading.Lock()
+# Un lock por dataset para que las descargas de datasets distintos no se esperen
+_locks = {name: threading.Lock() for name in DATASETS}
+
+
+def _snapshot_paths(name):
+    return DATA_DIR / f"{name}.parquet", DATA_DIR / f"{name}.json"
+
+
+def _read_meta(name):
+    _, meta_path = _snapshot_paths(name)
+    try:
+        return json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _read_snapshot(name):
+    parquet_path, _ = _snapshot_paths(name)
+    if parquet_path.exists():
+        # Los snapshots anteriores a PREPARE se preparan al leerlos
+        return _prepare(name, pd.read_parquet(parquet_path))
+    return None
+
+
+def _prepare(name, frame):
+    prepare = PREPARE.get(name)
+    return frame if prepare is None else prepare(frame)
+
+
+def _read_csv(name, raw):
+    return _prepare(name, pd.read_csv(io.BytesIO(raw)))
+
+
+def _write_meta(name, sha256, source, validators=None):
+    _, meta_path = _snapshot_paths(name)
+    meta = {"sha256": sha256, "source": source, "saved_at": time.time(), **(validators or {})}
+    tmp_path = meta_path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(meta))
+    os.replace(tmp_path, meta_path)
+
+
+def _write_snapshot(name, frame, sha256, source, validators=None):
+    parquet_path, _ = _snapshot_paths(name)
+    try:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = parquet_path.with_suffix(".parquet.tmp")
+        frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+        _write_meta(name, sha256, source, validators)
+    except (OSError, ValueError, ImportError) as exc:
+        # Sin snapshot la app sigue funcionando, solo pierde el modo offline
+        logger.warning("No se pudo guardar el snapshot de %s: %s", name, exc)
+
+
+def _validators(headers):
+    return {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+
+
+def _download(url, validators=None):
+    """Descarga ``url``; devuelve ``(bytes, validadores)`` o ``(None, validadores)`` si respondió 304.
+
+    Con ``validators`` (los de una descarga anterior) la petición es
+    condicional.
+    """
+    request = urllib.request.Request(url)
+    validators = validators or {}
+    if validators.get("etag"):
+        request.add_header("If-None-Match", validators["etag"])
+    if validators.get("last_modified"):
+        request.add_header("If-Modified-Since", validators["last_modified"])
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.read(), _validators(response.headers)
+    except urllib.error.HTTPError as exc:
+        if exc.code != 304:
+            raise
+        # Un 304 puede repetir los validadores o no mandarlos
+        fresh = {key: value for key, value in _validators(exc.headers).items() if value}
+        return None, {**validators, **fresh}
+
+
+def _load_offline(name):
+    csv_path = DATA_DIR / f"{name}.csv"
+    meta = _read_meta(name) or {}
+    if csv_path.exists():
+        raw = csv_path.read_bytes()
+        sha256 = hashlib.sha256(raw).hexdigest()
+        if meta.get("sha256") == sha256:
+            frame = _read_snapshot(name)
+            if frame is not None:
+                return frame, sha256
+        frame = _read_csv(name, raw)
+        _write_snapshot(name, frame, sha256, str(csv_path))
+        return frame, sha256
+    frame = _read_snapshot(name)
+    if frame is not None:
+        return frame, meta.get("sha256")
+    raise FileNotFoundError(f"No hay snapshot ni CSV local para '{name}' en {DATA_DIR}")
+
+
+def _load_online(name, cached_sha256):
+    source = DATASETS[name]
+    meta = _read_meta(name) or {}
+    parquet_path, _ = _snapshot_paths(name)
+    # Solo se pregunta "¿cambió?" si hay con qué responder a un 304
+    conditional = meta.get("source") == source and meta.get("sha256") and (
+        meta["sha256"] == cached_sha256 or parquet_path.exists()
+    )
+    validators = {key: meta.get(key) for key in ("etag", "last_modified")} if conditional else None
+    try:
+        raw, validators = _download(source, validators)
+        if raw is None:
+            sha256 = meta["sha256"]
+            if sha256 == cached_sha256:
+                return None, sha256
+            frame = _read_snapshot(name)
+            if frame is not None:
+                return frame, sha256
+            # El snapshot desapareció entre tanto: se descarga completo
+            raw, validators = _download(source)
+    except OSError as exc:
+        logger.warning("No se pudo descargar %s (%s); se usa la copia local", name, exc)
+        return _load_offline(name)
+
+    sha256 = hashlib.sha256(raw).hexdigest()
+    if meta.get("sha256") == sha256 and parquet_path.exists():
+        # Mismo contenido con validadores nuevos (o una fuente sin ETag)
+        try:
+            _write_meta(name, sha256, source, validators)
+        except OSError as exc:
+            logger.warning("No se pudieron guardar los validadores de %s: %s", name, exc)
+        if sha256 == cached_sha256:
+            return None, sha256
+        frame = _read_snapshot(name)
+        if frame is not None:
+            return frame, sha256
+    elif sha256 == cached_sha256:
+        return None, sha256
+
+    frame = _read_csv(name, raw)
+    _write_snapshot(name, frame, sha256, source, validators)
+    return frame, sha256
+
+
+def _fresh(entry, ttl, offline, now):
+    """True si el dataset está en memoria (``entry``) y no hace falta revalidarlo."""
+    return entry is not None and (offline or now - entry["checked_at"] <= ttl)
+
+
+def load_dataset(name, ttl=None, offline=None):
+    """Devuelve el DataFrame del dataset ``name`` (una clave de ``DATASETS``).
+
+    El resultado es una copia superficial del frame en caché, así que la app
+    puede agregar columnas sin afectar a otras sesiones.
+    """
+    if name not in DATASETS:
+        raise KeyError(f"Dataset desconocido: {name}")
+    ttl = CACHE_TTL if ttl is None else ttl
+    offline = OFFLINE if offline is None else offline
+
+    with stage(f"load:{name}") as info, _locks[name]:
+        entry = _memory.get(name)
+        now = time.time()
+        info["cache"] = "hit"
+        if not _fresh(entry, ttl, offline, now):
+            cached_sha256 = entry["sha256"] if entry else None
+            try:
+                if offline:
+                    frame, sha256 = _load_offline(name)
+                else:
+                    frame, sha256 = _load_online(name, cached_sha256)
+            except FileNotFoundError:
+                if entry is None:
+                    raise
+                # Sin red ni snapshot: se sigue sirviendo lo que hay en memoria
+                frame, sha256 = None, entry["sha256"]
+            if frame is None:
+                # El contenido no cambió: solo se renueva la marca de tiempo
+                entry["checked_at"] = now
+                info["cache"] = "revalidated"
+            else:
+                entry = {"frame": frame, "sha256": sha256, "checked_at": now}
+                _memory[name] = entry
+                info["cache"] = "miss"
+        info["rows"] = len(entry["frame"])
+        return entry["frame"].copy(deep=False)
+
+
+def load_datasets(names=None, ttl=None, offline=None):
+    """``{nombre: DataFrame}`` de ``names`` (por defecto todos), descargados a la vez.
+
+    Cada uno pasa por ``load_dataset``, así que los que ya están en caché y
+    vigentes no tocan la red.
+    """
+    names = list(DATASETS if names is None else names)
+    ttl = CACHE_TTL if ttl is None else ttl
+    offline = OFFLINE if offline is None else offline
+    now = time.time()
+    if all(_fresh(_memory.get(name), ttl, offline, now) for name in names):
+        # Todo en caché y vigente: un pool de hilos costaría más que las búsquedas
+        return {name: load_dataset(name, ttl, offline) for name in names}
+    with stage("load_datasets", datasets=len(names)), ThreadPoolExecutor(max(len(names), 1)) as pool:
+        frames = pool.map(bind(lambda name: load_dataset(name, ttl, offline)), names)
+        return dict(zip(names, frames))
+
+
+def load_derived(name, key, build):
+    """Devuelve ``build(frame)`` calculado una sola vez por versión del dataset.
+
+    Sirve para estructuras que se derivan de un dataset (índices, promedios):
+    se guardan junto al frame en caché y se descartan cuando el contenido de la
+    fuente cambia.
+    """
+    load_dataset(name)
+    entry = _memory[name]
+    derived = entry.setdefault("derived", {})
+    with stage(f"derived:{key}", cache="hit") as info:
+        if key not in derived:
+            info["cache"] = "miss"
+            # Se calcula fuera del lock; si dos sesiones compiten, gana la primera
+            value = build(entry["frame"].copy(deep=False))
+            derived.setdefault(key, value)
+        return derived[key]
+
+
+def frame_hash(frame):
+    """Hash SHA-256 del contenido de un DataFrame (sin el índice)."""
+    hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return hashlib.sha256(hashes.tobytes()).hexdigest()
+
+
+def dataset_hash(name):
+    """Hash SHA-256 del contenido actualmente en caché para ``name``."""
+    entry = _memory.get(name)
+    return entry["sha256"] if entry else None
+
+
+def clear_cache():
+    """Vacía la caché en memoria (los snapshots en disco se conservan)."""
+    with _lock:
+        _memory.clear()
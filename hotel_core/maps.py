@@ -0,0 +1,182 @@
+"""Tabla de ubicaciones de hoteles y construcción del mapa de folium.
+
+Hay dos modos de dibujar los hoteles:
+
+- ``"markers"``: un ``folium.Marker`` con su ``BeautifyIcon`` por hotel (el
+  diseño original). El HTML crece con un bloque de JS por marcador.
+- ``"cluster"``: una sola capa ``FastMarkerCluster`` que recibe las
+  coordenadas y popups como un arreglo y crea los marcadores en el navegador.
+
+``build_map`` elige ``"cluster"`` automáticamente a partir de
+``MAP_CLUSTER_THRESHOLD`` hoteles (variable ``HOTEL_MAP_CLUSTER_THRESHOLD``).
+Si la tabla trae ``avg_overall`` y ``n_reviews`` (ver ``HotelData.map_hotels``),
+los marcadores se colorean por calificación y el popup muestra ambos valores.
+
+``map_html`` guarda el HTML ya renderizado por contenido de la tabla de
+hoteles, así que los reruns de Streamlit no vuelven a construir el mapa;
+``map_figure`` hace lo mismo con el objeto ``folium.Map`` para ``st_folium``.
+
+folium y branca (~0.5 s de import) se importan al construir el primer mapa, no
+al importar este módulo: ``hotel_locations`` y el arranque de las páginas no los
+necesitan.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from hotel_core.loader import frame_hash
+
+MAP_CENTER = [36.7783, -119.4179]
+MAP_CLUSTER_THRESHOLD = int(os.environ.get("HOTEL_MAP_CLUSTER_THRESHOLD", 500))
+
+LOCATION_COLUMNS = ["name", "latitude", "longitude", "address"]
+
+NO_RATING_COLOR = "#7f8c8d"
+RATING_COLORS = ["#c0392b", "#f39c12", "#27ae60"]
+
+# Una entrada por combinación de filtros del mapa (tópico, calificación mínima)
+_MAP_CACHE_SIZE = 16
+# (hash de df_final, modo, umbral) -> HTML
+_html_cache = OrderedDict()
+# (hash de df_final, modo, umbral) -> folium.Map
+_figure_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+_CLUSTER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: 7, color: "white", weight: 1, fillColor: row[3], fillOpacity: 0.9
+    });
+    marker.bindPopup(row[2]);
+    return marker;
+};
+"""
+
+
+def hotel_locations(df_coordenadas, df_profesor):
+    """Une las dos fuentes de coordenadas, solo con hoteles abiertos y sin duplicados exactos.
+
+    La columna ``source`` indica de qué archivo viene cada fila. Los duplicados
+    escritos distinto se resuelven después con ``hotel_core.dedup``.
+    """
+    frames = []
+    for source_name, source in (("coordenadas", df_coordenadas), ("profesor", df_profesor)):
+        # --- Filtrar solo hoteles abiertos (si existe columna 'is_open') ---
+        if "is_open" in source.columns:
+            source = source[source["is_open"] == 1]
+        frames.append(source[LOCATION_COLUMNS].assign(source=source_name))
+    df_final = pd.concat(frames, ignore_index=True)
+    return df_final.drop_duplicates(subset=["name", "address"], keep="first")
+
+
+def _has_ratings(df_final):
+    return "avg_overall" in df_final.columns
+
+
+def _popups(df_final):
+    popups = df_final["name"].astype(str) + "<br>" + df_final["address"].astype(str)
+    if _has_ratings(df_final):
+        # astype(str): sobre una tabla vacía map devuelve float64 y la suma de texto fallaría
+        rating = df_final["avg_overall"].map(lambda value: "sin calificación" if pd.isna(value) else f"⭐ {value:.1f}").astype(str)
+        popups = popups + "<br>" + rating + " · " + df_final["n_reviews"].astype(str) + " reviews"
+    return popups
+
+
+def _colormap():
+    from branca.colormap import LinearColormap
+
+    # Uno por mapa: la leyenda queda como hija del mapa al que se agrega
+    return LinearColormap(RATING_COLORS, vmin=1, vmax=5, caption="Calificación general promedio")
+
+
+def _colors(df_final):
+    if not _has_ratings(df_final):
+        return pd.Series("darkblue", index=df_final.index)
+    ratings = df_final["avg_overall"].to_numpy(dtype=np.float64)
+    colormap = _colormap()
+    colors = [NO_RATING_COLOR if np.isnan(value) else colormap.rgb_hex_str(value) for value in ratings]
+    return pd.Series(colors, index=df_final.index)
+
+
+def _add_markers(mapa, df_final):
+    import folium
+    from folium.plugins import BeautifyIcon
+
+    for lat, lon, popup, color in zip(df_final["latitude"], df_final["longitude"], _popups(df_final), _colors(df_final)):
+        folium.Marker(
+            location=[lat, lon],
+            popup=popup,
+            icon=BeautifyIcon(
+                icon="hotel",
+                icon_shape="marker",
+                background_color=color,
+                text_color="white",
+                border_color="white",
+                border_width=2
+            )
+        ).add_to(mapa)
+
+
+def _add_cluster(mapa, df_final):
+    from folium.plugins import FastMarkerCluster
+
+    data = pd.DataFrame({
+        "latitude": df_final["latitude"].astype(float),
+        "longitude": df_final["longitude"].astype(float),
+        "popup": _popups(df_final),
+        "color": _colors(df_final),
+    })
+    FastMarkerCluster(data.to_numpy().tolist(), callback=_CLUSTER_CALLBACK, name="Hoteles").add_to(mapa)
+
+
+def build_map(df_final, mode=None, cluster_threshold=None):
+    """Mapa de folium centrado en California con un marcador por hotel.
+
+    ``mode`` puede ser ``"markers"``, ``"cluster"`` o ``None`` (automático según
+    ``cluster_threshold``).
+    """
+    import folium
+
+    cluster_threshold = MAP_CLUSTER_THRESHOLD if cluster_threshold is None else cluster_threshold
+    df_final = df_final[df_final["latitude"].notna() & df_final["longitude"].notna()]
+    if mode is None:
+        mode = "cluster" if len(df_final) >= cluster_threshold else "markers"
+
+    mapa = folium.Map(location=MAP_CENTER, zoom_start=6)
+    if mode == "cluster":
+        _add_cluster(mapa, df_final)
+    elif mode == "markers":
+        _add_markers(mapa, df_final)
+    else:
+        raise ValueError(f"Modo de mapa desconocido: {mode}")
+    if _has_ratings(df_final):
+        mapa.add_child(_colormap())
+    return mapa
+
+
+def _memoized(cache, key, build):
+    with _cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    value = build()
+    with _cache_lock:
+        cache[key] = value
+        while len(cache) > _MAP_CACHE_SIZE:
+            cache.popitem(last=False)
+    return value
+
+
+def map_figure(df_final, mode=None, cluster_threshold=None):
+    """``build_map`` memorizado por contenido de ``df_final`` (para ``st_folium``)."""
+    key = (frame_hash(df_final), mode, cluster_threshold)
+    return _memoized(_figure_cache, key, lambda: build_map(df_final, mode, cluster_threshold))
+
+
+def map_html(df_final, mode=None, cluster_threshold=None):
+    """HTML completo del mapa de ``build_map``, memorizado por contenido de ``df_final``."""
+    key = (frame_hash(df_final), mode, cluster_threshold)
+    return _memoized(_html_cache, key, lambda: build_map(df_final, mode, cluster_threshold).get_root().render())
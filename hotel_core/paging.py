@@ -0,0 +1,76 @@
+"""Paginación de reviews con un cursor en ``st.session_state``.
+
+El filtro ya entrega todas las posiciones que coinciden (``ReviewIndex.select``
+sin límite), así que cambiar de página es solo tomar otro tramo de ese arreglo.
+Cada página se renderiza una vez: al mostrar la página N se deja preparada la
+N+1, y las páginas ya vistas no se vuelven a calcular.
+"""
+import math
+from collections import OrderedDict
+
+import streamlit as st
+
+_CURSOR_KEY = "review_cursor"
+_PAGES_KEY = "review_pages"
+_MAX_CACHED_PAGES = 4
+
+
+def page_slice(n_items, page, page_size):
+    """``(inicio, fin, n_páginas)`` de la página ``page`` (0-based), ya acotada."""
+    n_pages = max(1, math.ceil(n_items / page_size))
+    page = min(max(page, 0), n_pages - 1)
+    return page * page_size, min((page + 1) * page_size, n_items), n_pages
+
+
+def _cursor(filter_key):
+    cursor = st.session_state.get(_CURSOR_KEY)
+    if cursor is None or cursor["key"] != filter_key:
+        # Filtros nuevos: el cursor vuelve al inicio y se olvidan las páginas
+        cursor = {"key": filter_key, "page": 0}
+        st.session_state[_CURSOR_KEY] = cursor
+        st.session_state[_PAGES_KEY] = OrderedDict()
+    return cursor
+
+
+def _move(delta):
+    st.session_state[_CURSOR_KEY]["page"] += delta
+
+
+def _page_html(positions, page, page_size, render):
+    pages = st.session_state[_PAGES_KEY]
+    if page not in pages:
+        start, stop, _ = page_slice(len(positions), page, page_size)
+        pages[page] = render(positions[start:stop])
+    pages.move_to_end(page)
+    while len(pages) > _MAX_CACHED_PAGES:
+        pages.popitem(last=False)
+    return pages[page]
+
+
+def show_review_pages(positions, page_size, filter_key, render):
+    """Muestra la página actual de ``positions`` y prepara la siguiente.
+
+    ``render`` recibe las posiciones de una página y devuelve su HTML.
+    ``filter_key`` identifica los filtros activos; si cambia, se vuelve a la
+    primera página.
+    """
+    filter_key = (filter_key, page_size)
+    cursor = _cursor(filter_key)
+    start, stop, n_pages = page_slice(len(positions), cursor["page"], page_size)
+    cursor["page"] = start // page_size
+
+    st.markdown(_page_html(positions, cursor["page"], page_size, render), unsafe_allow_html=True)
+
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    col_prev.button("⬅️ Anterior", on_click=_move, args=(-1,), disabled=cursor["page"] == 0, width="stretch")
+    col_info.markdown(
+        f"<p style='text-align: center;'>Página {cursor['page'] + 1} de {n_pages} · "
+        f"reseñas {start + 1}–{stop} de {len(positions)}</p>",
+        unsafe_allow_html=True,
+    )
+    col_next.button("Siguiente ➡️", on_click=_move, args=(1,), disabled=cursor["page"] >= n_pages - 1, width="stretch")
+
+    # Prefetch: la siguiente página queda lista antes de que la pidan
+    if cursor["page"] + 1 < n_pages:
+        _page_html(positions, cursor["page"] + 1, page_size, render)
+        st.session_state[_PAGES_KEY].move_to_end(cursor["page"])
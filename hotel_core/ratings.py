@@ -0,0 +1,82 @@
+"""Parseo de la columna ``ratings`` y promedios por hotel.
+
+La columna guarda diccionarios de Python como texto, por ejemplo
+``"{'service': 4.0, 'overall': 5.0}"``. ``parse_ratings_column`` convierte la
+columna completa de una vez a un DataFrame numérico ancho; es lo que usan
+``compact_reviews`` y ``python -m hotel_core.aggregates``. ``parse_ratings``
+(un ``literal_eval`` por fila) y ``average_ratings`` (``groupby`` sobre ese
+DataFrame) son la versión de referencia: las páginas ya no los usan, pero
+``benchmarks/bench_ratings.py`` y ``benchmarks/bench_memory.py`` comparan
+contra ellos.
+"""
+import ast
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+RATING_COLUMNS = ["service", "cleanliness", "overall", "value", "location", "sleep quality", "rooms"]
+
+_KEY = r"""['"][^'",:{}]+['"]"""
+_VALUE = r"[^,{}:]+"
+_VALID_RE = rf"^\{{\s*(?:{_KEY}\s*:\s*{_VALUE}(?:,\s*{_KEY}\s*:\s*{_VALUE})*,?\s*)?\}}$"
+_NUMBER_RE = r"^[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?$"
+_QUOTES = " '\""
+
+
+# Convertir columna ratings a diccionario
+def parse_ratings(val):
+    try:
+        return ast.literal_eval(val) if isinstance(val, str) else {}
+    except (ValueError, SyntaxError):
+        return {}
+
+
+def parse_ratings_column(ratings):
+    """Convierte la Serie ``ratings`` en un DataFrame float64 con una columna por atributo.
+
+    Todo el trabajo de texto se hace con kernels de Arrow sobre la columna
+    completa y los valores se escriben directo en una matriz de numpy, sin crear
+    un dict por fila. Conserva el índice de ``ratings``. Las filas vacías o mal
+    formadas quedan en NaN, igual que con ``parse_ratings``, pero se cuentan en
+    vez de ignorarse; quien llama decide cómo reportarlas. Las columnas siguen el orden de ``RATING_COLUMNS`` (solo
+    las que aparecen en los datos) y después cualquier atributo extra en orden
+    alfabético.
+
+    Devuelve ``(frame, n_malformadas)``.
+    """
+    if not pd.api.types.is_string_dtype(ratings):
+        ratings = ratings.where(ratings.map(lambda val: isinstance(val, str)), None)
+    text = pa.array(ratings.to_numpy(dtype=object), type=pa.large_string(), from_pandas=True)
+    text = pc.utf8_trim_whitespace(text)
+    valid = pc.fill_null(pc.match_substring_regex(text, _VALID_RE), False)
+    n_malformed = int(pc.sum(pc.and_(pc.is_valid(text), pc.invert(valid))).as_py() or 0)
+
+    body = pc.utf8_slice_codeunits(pc.if_else(valid, text, pa.scalar(None, pa.large_string())), 1, -1)
+    items = pc.split_pattern(body, ",")
+    rows = pc.list_parent_indices(items)
+    items = pc.utf8_trim_whitespace(pc.list_flatten(items))
+    non_empty = pc.not_equal(items, "")
+    rows = pc.filter(rows, non_empty).to_numpy()
+    pairs = pc.split_pattern(pc.filter(items, non_empty), ":", max_splits=1)
+    keys = pc.utf8_trim(pc.list_element(pairs, 0), _QUOTES)
+    values = pc.utf8_trim(pc.list_element(pairs, 1), _QUOTES)
+    is_number = pc.fill_null(pc.match_substring_regex(values, _NUMBER_RE), False)
+    values = pc.cast(pc.if_else(is_number, values, pa.scalar(None, values.type)), pa.float64())
+    values = values.to_numpy(zero_copy_only=False)
+
+    key_names = pc.unique(keys).to_pylist()
+    present = set(key_names)
+    columns = [col for col in RATING_COLUMNS if col in present] + sorted(present.difference(RATING_COLUMNS))
+    codes = pc.index_in(keys, value_set=pa.array(columns, type=keys.type)).to_numpy()
+
+    matrix = np.full((len(ratings), len(columns)), np.nan)
+    # Si una clave se repite gana la última, como en literal_eval
+    matrix[rows, codes] = values
+    return pd.DataFrame(matrix, index=ratings.index, columns=columns), n_malformed
+
+
+def average_ratings(names, ratings_frame):
+    """Promedio por hotel de cada atributo, redondeado a un decimal."""
+    return ratings_frame.groupby(names.to_numpy()).mean().round(1).rename_axis("name")
@@ -0,0 +1,135 @@
+"""HTML de las tarjetas de reviews.
+
+``review_cards_html`` arma todas las tarjetas de un resultado como un solo
+bloque de HTML (un único ``st.markdown``), en lugar de un título, tres columnas
+y un ``st.bar_chart`` por review. Las estrellas salen de ``STARS``, una tabla
+precalculada para las calificaciones posibles (0 a 5 en pasos de 0.5).
+"""
+import html
+import math
+
+import numpy as np
+
+from hotel_core.reviews import review_ratings
+
+# Emojis para cada atributo
+EMOJI_MAP = {"service": "🛎️", "cleanliness": "🧼", "overall": "⭐", "value": "💰", "location": "📍", "sleep quality": "💤", "rooms": "🚪"}
+
+CARDS_CSS = """<style>
+    .review-card { display: grid; grid-template-columns: 1.8fr 1.3fr 2fr; gap: 16px; margin-bottom: 12px; }
+    .bar-line { margin: 8px 0; font-size: 14px; color: #333; }
+    .bar { display: flex; height: 14px; background: #eef1f5; border-radius: 4px; overflow: hidden; }
+    .bar-avg { background: #1f77b4; }
+    .bar-delta { background: #ff7f0e; }
+    .bar-legend { font-size: 13px; color: #555; margin-top: 10px; }
+    .bar-legend span { display: inline-block; width: 10px; height: 10px; margin: 0 4px 0 10px; }
+    </style>"""
+
+
+# Crear estrellas
+def generate_stars(score):
+    try:
+        score = float(score)
+        if 0 <= score <= 5:
+            full_stars = math.floor(score)
+            half_star = "★" if score - full_stars >= 0.5 else ""
+            empty_stars = 5 - full_stars - len(half_star)
+            return f"<span style='color: #FFD700;'>{'★' * full_stars}{half_star}{'☆' * empty_stars}</span> ({score})"
+        else:
+            return "N/A"
+    except (ValueError, TypeError):
+        return "N/A"
+
+
+STARS = {score: generate_stars(score) for score in np.arange(0, 5.5, 0.5).tolist()}
+
+
+def attribute_order(columns):
+    """Atributos en el orden de las tarjetas: 'overall' primero y el resto en orden alfabético."""
+    return (["overall"] if "overall" in columns else []) + sorted(col for col in columns if col != "overall")
+
+
+def _star(score):
+    fragment = STARS.get(score)
+    return generate_stars(score) if fragment is None else fragment
+
+
+def _ratings_column(ratings):
+    columns = attribute_order(ratings.columns)
+    labels = [f"{EMOJI_MAP.get(column, '🔹')} {column.capitalize()}" for column in columns]
+    boxes = []
+    for row in ratings[columns].to_numpy(dtype=np.float64).tolist():
+        # value == value descarta los NaN
+        lines = "".join(
+            f'<div class="rating-line"><span>{label}</span> <span>{_star(value)}</span></div>'
+            for label, value in zip(labels, row) if value == value
+        )
+        boxes.append(
+            '<div class="content-box"><p class="ratings-title">Ratings:</p>'
+            + (lines or '<p class="rating-line">No hay ratings disponibles.</p>')
+            + "</div>"
+        )
+    return boxes
+
+
+def _comparison_column(ratings, averages):
+    columns = [col for col in attribute_order(ratings.columns) if col in averages.columns]
+    labels = [html.escape(column.capitalize()) for column in columns]
+    review = ratings[columns].to_numpy(dtype=np.float64)
+    average = averages[columns].to_numpy(dtype=np.float64)
+    present = (~np.isnan(review) & ~np.isnan(average)).tolist()
+    # Anchos de todas las barras en una sola operación; NaN donde falta alguno de los dos
+    avg_width = np.round(np.clip(average / 5 * 100, 0, 100), 1).tolist()
+    delta_width = np.round(np.clip(np.clip(review - average, 0, None) / 5 * 100, 0, 100), 1).tolist()
+
+    legend = (
+        '<div class="bar-legend"><span style="background: #1f77b4;"></span>Promedio del Hotel'
+        '<span style="background: #ff7f0e;"></span>Calificación de Reseña</div>'
+    )
+    title = '<p class="ratings-title">Calificación de la Review vs. Promedio del Hotel</p>'
+    boxes = []
+    for row_present, row_avg, row_delta in zip(present, avg_width, delta_width):
+        lines = "".join(
+            f'<div class="bar-line">{label}<div class="bar">'
+            f'<div class="bar-avg" style="width: {avg}%"></div>'
+            f'<div class="bar-delta" style="width: {delta}%"></div></div></div>'
+            for label, has_bar, avg, delta in zip(labels, row_present, row_avg, row_delta) if has_bar
+        )
+        if lines:
+            boxes.append('<div class="content-box">' + title + lines + legend + "</div>")
+        else:
+            boxes.append('<div class="content-box"><p>No hay ratings disponibles para comparar.</p></div>')
+    return boxes
+
+
+def review_cards_html(reviews, ratings, averages):
+    """Un solo bloque de HTML con una tarjeta por fila de ``reviews``.
+
+    ``reviews`` trae las columnas ``name`` y ``text``; ``ratings`` es el frame
+    numérico de ``review_ratings`` para esas mismas filas y ``averages``
+    el promedio por hotel (índice ``name``). Son 1-20 filas, así que cada
+    fragmento se arma con Python sobre los arreglos de numpy, sin operaciones
+    de pandas por atributo.
+    """
+    if reviews.empty:
+        return ""
+    hotel_averages = averages.reindex(reviews["name"].to_numpy())
+    names = [html.escape(str(name)) for name in reviews["name"].tolist()]
+    texts = [html.escape(str(text)) for text in reviews["text"].tolist()]
+
+    cards = [
+        f"<div class='content-box hotel-title'>🏨 {name}</div>"
+        f'<div class="review-card"><div class="content-box"><p class="review-text">{text}</p></div>'
+        f"{ratings_box}{comparison_box}</div>"
+        for name, text, ratings_box, comparison_box in zip(
+            names, texts, _ratings_column(ratings), _comparison_column(ratings, hotel_averages)
+        )
+    ]
+    return CARDS_CSS + "".join(cards)
+
+
+def reviews_html(df, positions, averages):
+    """Tarjetas de las filas ``positions`` (posiciones de ``df.iloc``)."""
+    reviews = df.iloc[positions]
+    ratings = review_ratings(reviews)
+    return review_cards_html(reviews, ratings, averages)
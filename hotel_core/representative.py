@@ -0,0 +1,141 @@
+"""Review representativa de cada (tópico, hotel) para el modo "Todos".
+
+En vez de la primera review de cada hotel en orden de archivo, el modo
+"Todos" muestra la que mejor resume al hotel: la de calificaciones más
+cercanas a su promedio (el mismo que muestran las tarjetas, redondeado a un
+decimal como ``RatingAggregates.means``). La distancia es la raíz del error
+cuadrático medio sobre los atributos que la review calificó y que el hotel
+tiene con promedio; una review sin ninguno de esos atributos queda al final
+(distancia infinita). Los empates se rompen por el texto más largo (en bytes
+UTF-8) y después por la review más reciente. El CSV no trae fecha, así que la
+más reciente es la que aparece después en el archivo.
+
+``RepresentativePicker`` lo calcula por bloques de filas con operaciones
+vectorizadas sobre la matriz de calificaciones (un ``lexsort`` para quedarse
+con la mejor de cada llave), así que sirve igual para la tabla en memoria
+que para la ingesta del almacén en disco. El resultado es, por tópico, un
+arreglo con una posición por hotel ordenado de la review más representativa a
+la menos, que ``ReviewIndex.select`` devuelve sin recorrer nada más.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from hotel_core.reviews import review_ratings
+
+BLOCK_SIZE = 200_000
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def hotel_means(name_codes, ratings, n_names):
+    """Promedio por hotel (una fila por código) y atributo, redondeado a un decimal."""
+    name_codes = np.asarray(name_codes, dtype=np.int64)
+    sums = np.zeros((n_names, ratings.shape[1]))
+    counts = np.zeros((n_names, ratings.shape[1]))
+    for col in range(ratings.shape[1]):
+        values = ratings[:, col]
+        present = (name_codes >= 0) & ~np.isnan(values)
+        sums[:, col] = np.bincount(name_codes[present], values[present], minlength=n_names)
+        counts[:, col] = np.bincount(name_codes[present], minlength=n_names)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.round(sums / counts, 1)
+
+
+def rating_distance(ratings, averages):
+    """RMS de ``ratings - averages`` por fila sobre los atributos presentes en ambos; inf si no hay."""
+    diff = ratings - averages
+    present = ~np.isnan(diff)
+    n_present = present.sum(axis=1)
+    squared = np.where(present, diff * diff, 0.0).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        distance = np.sqrt(squared / n_present)
+    distance[n_present == 0] = np.inf
+    return distance
+
+
+class RepresentativePicker:
+    """Mejor review de cada (tópico, hotel) de las filas que se le van pasando.
+
+    Las llaves son ``topic_code * n_names + name_code``, con los mismos códigos
+    que el almacén de ``hotel_core.store``. Entre bloques solo se guarda la
+    mejor candidata de cada llave.
+    """
+
+    def __init__(self, averages):
+        # Promedios de ``hotel_means``: fila = código de hotel, columna = atributo
+        self.averages = averages
+        self.n_names = len(averages)
+        self._keys = _EMPTY
+        self._distance = np.empty(0)
+        self._length = _EMPTY
+        self._position = _EMPTY
+
+    def add(self, topic_codes, name_codes, ratings, lengths, positions):
+        """Considera un bloque de filas, alineadas fila a fila (``ratings`` con las columnas de ``averages``)."""
+        topic_codes = np.asarray(topic_codes, dtype=np.int64)
+        name_codes = np.asarray(name_codes, dtype=np.int64)
+        keep = (topic_codes >= 0) & (name_codes >= 0)
+        names = name_codes[keep]
+        keys = np.concatenate([self._keys, topic_codes[keep] * self.n_names + names])
+        distance = np.concatenate([self._distance, rating_distance(ratings[keep], self.averages[names])])
+        length = np.concatenate([self._length, np.asarray(lengths, dtype=np.int64)[keep]])
+        position = np.concatenate([self._position, np.asarray(positions, dtype=np.int64)[keep]])
+
+        # Por llave: menor distancia, después texto más largo, después la más reciente
+        order = np.lexsort((-position, -length, distance, keys))
+        sorted_keys = keys[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        best = order[first]
+        self._keys, self._distance, self._length, self._position = keys[best], distance[best], length[best], position[best]
+        return self
+
+    def ordered(self, n_topics):
+        """``(posiciones, offsets)``: las del tópico ``t`` son ``posiciones[offsets[t]:offsets[t + 1]]``.
+
+        Dentro de cada tópico van de la más cercana al promedio a la menos (y,
+        a igual distancia, en orden de archivo).
+        """
+        topics = self._keys // max(self.n_names, 1)
+        order = np.lexsort((self._position, self._distance, topics))
+        offsets = np.zeros(n_topics + 1, dtype=np.int64)
+        np.cumsum(np.bincount(topics, minlength=n_topics), out=offsets[1:])
+        return self._position[order], offsets
+
+
+def by_topic(positions, offsets, topics):
+    """Diccionario tópico -> posiciones a partir de ``RepresentativePicker.ordered`` (vistas, sin copiar)."""
+    return {
+        topic: positions[offsets[code]:offsets[code + 1]].astype(np.intp, copy=False)
+        for code, topic in enumerate(topics)
+        if offsets[code + 1] > offsets[code]
+    }
+
+
+def text_lengths(text):
+    """Largo en bytes UTF-8 de cada texto (0 si falta)."""
+    lengths = pc.binary_length(pa.array(text, type=pa.large_string()))
+    return lengths.fill_null(0).to_numpy(zero_copy_only=False)
+
+
+def representatives_from_frame(df, block_size=BLOCK_SIZE):
+    """Review representativa de cada (tópico, hotel) de la tabla de reviews, por tópico.
+
+    Acepta la tabla compacta o una con la columna ``ratings`` original, como
+    ``review_ratings``.
+    """
+    topic_codes, topics = pd.factorize(df["topic_label"])
+    name_codes, names = pd.factorize(df["name"])
+    ratings = review_ratings(df).to_numpy(dtype=np.float32)
+
+    picker = RepresentativePicker(hotel_means(name_codes, ratings, len(names)))
+    for start in range(0, len(df), block_size):
+        stop = min(start + block_size, len(df))
+        picker.add(
+            topic_codes[start:stop], name_codes[start:stop], ratings[start:stop],
+            text_lengths(df["text"].iloc[start:stop]), np.arange(start, stop),
+        )
+    positions, offsets = picker.ordered(len(topics))
+    return by_topic(positions, offsets, list(topics))
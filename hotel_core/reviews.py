@@ -0,0 +1,64 @@
+"""Representación compacta de la tabla de reviews.
+
+El CSV trae ``name`` y ``topic_label`` como texto repetido en cada fila y
+``ratings`` como el ``repr`` de un dict. Al cargarlo, ``compact_reviews`` lo
+convierte a:
+
+- ``name`` y ``topic_label``: categóricas (un código por fila y cada nombre una
+  sola vez).
+- ``text``: strings de Arrow, sin un objeto de Python por fila.
+- ``rating:<atributo>``: una columna float32 por atributo (en el orden de
+  ``RATING_COLUMNS``), NaN si la review no lo calificó. La columna ``ratings``
+  original se descarta.
+
+La conversión es idempotente, así que sirve igual para el CSV recién leído que
+para un snapshot ya compacto.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+from hotel_core.ratings import parse_ratings_column
+
+logger = logging.getLogger(__name__)
+
+RATING_PREFIX = "rating:"
+CATEGORY_COLUMNS = ["name", "topic_label"]
+
+
+def _parse(ratings):
+    frame, n_malformed = parse_ratings_column(ratings)
+    if n_malformed:
+        logger.warning("%d de %d reviews tienen ratings mal formados", n_malformed, len(ratings))
+    return frame
+
+
+def compact_reviews(df):
+    """La tabla de reviews con tipos compactos (ver el docstring del módulo)."""
+    df = df.copy(deep=False)
+    if "ratings" in df.columns:
+        ratings = _parse(df["ratings"]).astype(np.float32).add_prefix(RATING_PREFIX)
+        df = pd.concat([df.drop(columns="ratings"), ratings], axis=1)
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    if "text" in df.columns and df["text"].dtype != "string[pyarrow]":
+        df["text"] = df["text"].astype("string[pyarrow]").fillna("")
+    return df
+
+
+def review_ratings(df):
+    """Calificaciones de las filas de ``df`` como float64, una columna por atributo.
+
+    Igual que ``parse_ratings_column``, solo incluye los atributos que alguna de
+    esas filas calificó, en el orden de ``RATING_COLUMNS``. Acepta la tabla
+    compacta o una con la columna ``ratings`` original (por ejemplo, un lote
+    recién leído de un CSV).
+    """
+    if "ratings" in df.columns:
+        return _parse(df["ratings"])
+    columns = [column for column in df.columns if column.startswith(RATING_PREFIX)]
+    ratings = df[columns].astype(np.float64).dropna(axis=1, how="all")
+    ratings.columns = [column[len(RATING_PREFIX):] for column in ratings.columns]
+    return ratings
@@ -0,0 +1,176 @@
+"""Búsqueda por palabras clave sobre el texto de las reviews.
+
+``SearchIndex`` es un índice invertido con pesos TF-IDF guardado como arreglos
+de numpy: para cada término, un tramo de ``docs`` (posiciones de fila) y
+``weights`` (peso ya normalizado por documento). Una consulta solo recorre las
+listas de sus términos, nunca el corpus completo, y se guarda en
+``HOTEL_DATA_DIR`` junto a los snapshots para no reconstruirlo en cada arranque.
+``save_arrays``/``load_arrays`` lo guardan como ``.npy`` sueltos para abrirlo
+con ``np.memmap`` (lo usa ``hotel_core.build``).
+"""
+import json
+import logging
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from hotel_core.loader import DATA_DIR, dataset_hash
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_PATH = DATA_DIR / "search_index.npz"
+
+_TOKEN_RE = r"[^\W_]+"
+
+
+def tokenize(text):
+    return re.findall(_TOKEN_RE, str(text).lower())
+
+
+class SearchIndex:
+    """Índice invertido TF-IDF sobre una columna de texto."""
+
+    def __init__(self, vocabulary, offsets, docs, weights, n_docs):
+        self.vocabulary = vocabulary
+        self._terms = {term: i for i, term in enumerate(vocabulary)}
+        self.offsets = offsets
+        self.docs = docs
+        self.weights = weights
+        self.n_docs = n_docs
+
+    @classmethod
+    def from_texts(cls, texts):
+        """Construye el índice; los documentos son las posiciones de ``texts``."""
+        texts = pd.Series(np.asarray(texts, dtype=object))
+        tokens = texts.fillna("").astype(str).str.lower().str.findall(_TOKEN_RE).explode().dropna()
+        doc_ids = tokens.index.to_numpy(dtype=np.int64)
+        term_ids, vocabulary = pd.factorize(tokens, sort=True)
+        n_docs, n_terms = len(texts), len(vocabulary)
+
+        # Frecuencia de cada par (término, documento), ordenado por término y documento
+        pairs, tf = np.unique(term_ids.astype(np.int64) * max(n_docs, 1) + doc_ids, return_counts=True)
+        terms = pairs // max(n_docs, 1)
+        docs = (pairs % max(n_docs, 1)).astype(np.int32)
+
+        df_counts = np.bincount(terms, minlength=n_terms)
+        idf = np.log((n_docs + 1) / (df_counts + 1)) + 1
+        weights = (1 + np.log(tf)) * idf[terms]
+        norms = np.sqrt(np.bincount(docs, weights=weights ** 2, minlength=n_docs))
+        weights = (weights / norms[docs]).astype(np.float32)
+
+        offsets = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(df_counts, out=offsets[1:])
+        return cls(list(vocabulary), offsets, docs, weights, n_docs)
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls.from_texts(df["text"])
+
+    def postings(self, term):
+        term_id = self._terms.get(term)
+        if term_id is None:
+            return self.docs[:0], self.weights[:0]
+        start, stop = self.offsets[term_id], self.offsets[term_id + 1]
+        return self.docs[start:stop], self.weights[start:stop]
+
+    def search(self, query, k=None, allowed=None, require_all=True):
+        """Posiciones de los documentos que mejor coinciden con ``query`` y sus puntajes.
+
+        Con ``require_all`` solo cuentan los documentos que tienen todos los
+        términos. ``allowed`` limita el resultado a esas posiciones, ordenadas
+        de menor a mayor (como las de ``ReviewIndex.rows``). Si ``k`` es None
+        se devuelven todos, ordenados.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        empty = (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32))
+        if not terms:
+            return empty
+        lists = [self.postings(term) for term in terms]
+        if require_all and any(len(docs) == 0 for docs, _ in lists):
+            return empty
+
+        docs = np.concatenate([docs for docs, _ in lists])
+        weights = np.concatenate([weights for _, weights in lists])
+        matched, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights)
+        keep = np.ones(len(matched), dtype=bool)
+        if require_all and len(terms) > 1:
+            keep &= np.bincount(inverse) == len(terms)
+        if allowed is not None:
+            allowed = np.asarray(allowed)
+            if len(allowed) == 0:
+                return empty
+            # Búsqueda binaria en ``allowed`` (ya ordenado) en vez de np.isin, que lo ordenaría en cada consulta
+            found = np.minimum(np.searchsorted(allowed, matched), len(allowed) - 1)
+            keep &= allowed[found] == matched
+        matched, scores = matched[keep], scores[keep]
+
+        if k is not None and k < len(matched):
+            top = np.argpartition(-scores, k - 1)[:k]
+            matched, scores = matched[top], scores[top]
+        order = np.lexsort((matched, -scores))
+        return matched[order], scores[order].astype(np.float32)
+
+    def save(self, path=SEARCH_INDEX_PATH, source_hash=None):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(
+            tmp_path,
+            vocabulary=np.array("\n".join(self.vocabulary)),
+            offsets=self.offsets,
+            docs=self.docs,
+            weights=self.weights,
+            meta=np.array(json.dumps({"n_docs": self.n_docs, "source_sha256": source_hash})),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=SEARCH_INDEX_PATH):
+        """Lee un índice escrito por ``save``; devuelve ``(index, source_hash)``."""
+        with np.load(path) as data:
+            vocabulary_text = str(data["vocabulary"])
+            meta = json.loads(str(data["meta"]))
+            index = cls(
+                vocabulary_text.split("\n") if vocabulary_text else [],
+                data["offsets"],
+                data["docs"],
+                data["weights"],
+                meta["n_docs"],
+            )
+        return index, meta.get("source_sha256")
+
+    def save_arrays(self, directory, source_hash=None):
+        """Guarda el índice como ``.npy`` sin comprimir en ``directory``."""
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ("offsets", "docs", "weights"):
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        (directory / "vocabulary.json").write_text(json.dumps(self.vocabulary, ensure_ascii=False))
+        (directory / "meta.json").write_text(json.dumps({"n_docs": self.n_docs, "source_sha256": source_hash}))
+
+    @classmethod
+    def load_arrays(cls, directory):
+        """Abre un índice de ``save_arrays``; las listas de documentos quedan en disco (memmap)."""
+        meta = json.loads((directory / "meta.json").read_text())
+        arrays = [np.load(directory / f"{name}.npy", mmap_mode="r") for name in ("offsets", "docs", "weights")]
+        vocabulary = json.loads((directory / "vocabulary.json").read_text())
+        return cls(vocabulary, *arrays, meta["n_docs"]), meta.get("source_sha256")
+
+
+def load_search_index(df, path=SEARCH_INDEX_PATH):
+    """Índice de búsqueda para el dataset ``reviews``, leído de disco si está al día."""
+    source_hash = dataset_hash("reviews")
+    if path.exists():
+        try:
+            index, saved_hash = SearchIndex.load(path)
+            if saved_hash is not None and saved_hash == source_hash and index.n_docs == len(df):
+                return index
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("No se pudo leer el índice de búsqueda de %s: %s", path, exc)
+    index = SearchIndex.from_frame(df)
+    try:
+        index.save(path, source_hash)
+    except OSError as exc:
+        logger.warning("No se pudo guardar el índice de búsqueda en %s: %s", path, exc)
+    return index
@@ -0,0 +1,415 @@
+"""Ingesta por bloques de ``final_database.csv`` a un almacén en disco.
+
+Cuando el archivo de reviews no cabe en un DataFrame, ``ingest`` lo lee en
+bloques de ``chunk_size`` filas (en formato compacto, ver ``hotel_core.reviews``)
+y mientras avanza:
+
+- escribe los códigos de tópico y hotel y una columna float32 por atributo en
+  archivos binarios planos;
+- agrega el texto de cada review a un blob UTF-8, con un arreglo de offsets
+  (la review ``i`` es ``blob[offsets[i]:offsets[i + 1]]``);
+- suma los ``RatingAggregates`` y el ``RatingCube`` (tópico × hotel × atributo).
+
+Al final ordena las posiciones por (tópico, hotel) con un counting sort y elige
+la review representativa de cada (tópico, hotel) (ver
+``hotel_core.representative``), recorriendo también por bloques, así que la
+memoria máxima depende del tamaño del bloque y del número de hoteles, no del de
+filas.
+
+``ReviewStore`` abre el almacén con ``np.memmap``: en memoria solo quedan los
+agregados y los diccionarios del índice; el texto y los ratings de las 5-20
+reviews que se muestran se leen del disco al pedirlos. La app lo usa si
+``HOTEL_REVIEW_STORE`` apunta al directorio del almacén. La búsqueda por texto
+no está disponible en ese modo.
+
+Uso::
+
+    python -m hotel_core.store data/reviews_store --source reviews.csv --chunk-size 500000
+"""
+import argparse
+import collections
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from hotel_core.aggregates import RatingAggregates
+from hotel_core.cube import RatingCube
+from hotel_core.index import ReviewIndex
+from hotel_core.loader import DATASETS
+from hotel_core.ratings import RATING_COLUMNS
+from hotel_core.representative import RepresentativePicker, by_topic
+from hotel_core.reviews import RATING_PREFIX, compact_reviews, review_ratings
+
+logger = logging.getLogger(__name__)
+
+REVIEW_STORE = os.environ.get("HOTEL_REVIEW_STORE")
+CHUNK_SIZE = 200_000
+
+_TOPIC_CODES = ("topic_codes.i16", np.int16)
+_NAME_CODES = ("name_codes.i32", np.int32)
+_TEXT_OFFSETS = ("text_offsets.i64", np.int64)
+_ORDER = ("order.i64", np.int64)
+_TOPIC_ORDER = ("topic_order.i64", np.int64)
+
+_stores = {}
+_lock = threading.Lock()
+
+
+class _HashingReader:
+    """Envuelve un archivo binario y calcula el SHA-256 de lo que se va leyendo."""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self._sha256 = hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self._raw.read(size)
+        self._sha256.update(data)
+        return data
+
+    def hexdigest(self):
+        return self._sha256.hexdigest()
+
+
+def _open_source(source):
+    if str(source).startswith(("http://", "https://")):
+        return urllib.request.urlopen(str(source), timeout=60)
+    return open(source, "rb")
+
+
+def _memmap(path, dtype, length):
+    if length == 0:
+        return np.empty(0, dtype=dtype)
+    # Vista ndarray del mapa: las rebanadas del índice son mucho más livianas que las de np.memmap
+    return np.memmap(path, dtype=dtype, mode="r", shape=(length,)).view(np.ndarray)
+
+
+def _rating_file(col):
+    return f"rating_{col}.f32"
+
+
+class _StoreWriter:
+    def __init__(self, directory, chunk_size):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self.text_bytes = 0
+        # etiqueta -> código, en orden de primera aparición
+        self.topics = {}
+        self.names = {}
+        self.rating_columns = []
+        self.aggregates = RatingAggregates()
+        self.cube = RatingCube()
+        self._files = {}
+        self._write(_TEXT_OFFSETS[0], np.zeros(1, dtype=np.int64))
+
+    def _write(self, filename, values):
+        handle = self._files.get(filename)
+        if handle is None:
+            handle = self._files[filename] = open(self.directory / filename, "wb")
+        np.ascontiguousarray(values).tofile(handle)
+
+    def _codes(self, values, codes_of, dtype):
+        values = values.astype("category")
+        local = values.cat.codes.to_numpy()
+        # El último lugar queda en -1 para los NaN (código local -1)
+        mapping = np.full(len(values.cat.categories) + 1, -1, dtype=np.int64)
+        for code in pd.unique(local[local >= 0]).tolist():
+            mapping[code] = codes_of.setdefault(values.cat.categories[code], len(codes_of))
+        return mapping[local].astype(dtype)
+
+    def append(self, chunk):
+        n = len(chunk)
+        topic_codes = self._codes(chunk["topic_label"], self.topics, _TOPIC_CODES[1])
+        name_codes = self._codes(chunk["name"], self.names, _NAME_CODES[1])
+        self._write(_TOPIC_CODES[0], topic_codes)
+        self._write(_NAME_CODES[0], name_codes)
+
+        for column in chunk.columns:
+            if column.startswith(RATING_PREFIX) and column[len(RATING_PREFIX):] not in self.rating_columns:
+                # Atributo nuevo: las filas anteriores quedan en NaN
+                self.rating_columns.append(column[len(RATING_PREFIX):])
+                filename = _rating_file(len(self.rating_columns) - 1)
+                for start in range(0, self.rows, self.chunk_size):
+                    self._write(filename, np.full(min(self.chunk_size, self.rows - start), np.nan, dtype=np.float32))
+        for col, attribute in enumerate(self.rating_columns):
+            values = chunk.get(RATING_PREFIX + attribute)
+            values = np.full(n, np.nan, dtype=np.float32) if values is None else values.to_numpy(dtype=np.float32)
+            self._write(_rating_file(col), values)
+
+        text = pa.array(chunk["text"], type=pa.large_string())
+        if isinstance(text, pa.ChunkedArray):
+            text = text.combine_chunks()
+        offsets = np.frombuffer(text.buffers()[1], dtype=np.int64)[text.offset:text.offset + n + 1]
+        self._write("text.bin", np.frombuffer(text.buffers()[2], dtype=np.uint8)[offsets[0]:offsets[-1]])
+        self._write(_TEXT_OFFSETS[0], offsets[1:] - offsets[0] + self.text_bytes)
+        self.text_bytes += int(offsets[-1] - offsets[0])
+
+        ratings_frame = review_ratings(chunk)
+        self.aggregates.append(chunk["name"], ratings_frame)
+        self.cube.add(topic_codes, name_codes, ratings_frame, self.topics, self.names)
+        self.rows += n
+
+    def _sorted_positions(self, keys_of, n_keys, target):
+        """Counting sort por bloques: posiciones ordenadas por llave y, dentro, por archivo."""
+        counts = np.zeros(n_keys, dtype=np.int64)
+        for start in range(0, self.rows, self.chunk_size):
+            keys = keys_of(start, min(start + self.chunk_size, self.rows))
+            counts += np.bincount(keys[keys >= 0], minlength=n_keys)
+        offsets = np.zeros(n_keys + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        if offsets[-1] == 0:
+            (self.directory / target).touch()
+            return offsets
+
+        out = np.memmap(self.directory / target, dtype=np.int64, mode="w+", shape=(int(offsets[-1]),))
+        cursor = offsets[:-1].copy()
+        for start in range(0, self.rows, self.chunk_size):
+            stop = min(start + self.chunk_size, self.rows)
+            keys = keys_of(start, stop)
+            positions = np.arange(start, stop)[keys >= 0]
+            keys = keys[keys >= 0]
+            order = np.argsort(keys, kind="stable")
+            keys, positions = keys[order], positions[order]
+            rank = np.arange(len(keys)) - np.searchsorted(keys, keys, side="left")
+            out[cursor[keys] + rank] = positions
+            cursor += np.bincount(keys, minlength=n_keys)
+        out.flush()
+        del out
+        return offsets
+
+    def _representatives(self, topic_codes, name_codes):
+        """Review representativa de cada (tópico, hotel), recorriendo las filas por bloques."""
+        averages = self.aggregates.means().reindex(index=list(self.names), columns=self.rating_columns).to_numpy()
+        picker = RepresentativePicker(averages)
+        ratings = [_memmap(self.directory / _rating_file(col), np.float32, self.rows) for col in range(len(self.rating_columns))]
+        text_offsets = _memmap(self.directory / _TEXT_OFFSETS[0], _TEXT_OFFSETS[1], self.rows + 1)
+        for start in range(0, self.rows, self.chunk_size):
+            stop = min(start + self.chunk_size, self.rows)
+            block = np.empty((stop - start, len(ratings)), dtype=np.float32)
+            for col, values in enumerate(ratings):
+                block[:, col] = values[start:stop]
+            picker.add(topic_codes[start:stop], name_codes[start:stop], block, np.diff(text_offsets[start:stop + 1]), np.arange(start, stop))
+        positions, offsets = picker.ordered(len(self.topics))
+        np.save(self.directory / "representatives.npy", positions)
+        np.save(self.directory / "representative_offsets.npy", offsets)
+
+    def finish(self, source, sha256):
+        for filename in (_TOPIC_CODES[0], _NAME_CODES[0], "text.bin"):
+            self._write(filename, np.empty(0, dtype=np.uint8))
+        for handle in self._files.values():
+            handle.close()
+
+        topic_codes = _memmap(self.directory / _TOPIC_CODES[0], _TOPIC_CODES[1], self.rows)
+        name_codes = _memmap(self.directory / _NAME_CODES[0], _NAME_CODES[1], self.rows)
+        n_topics, n_names = len(self.topics), len(self.names)
+
+        def pair_keys(start, stop):
+            topics = topic_codes[start:stop].astype(np.int64)
+            names = name_codes[start:stop].astype(np.int64)
+            return np.where((topics >= 0) & (names >= 0), topics * n_names + names, -1)
+
+        offsets = self._sorted_positions(pair_keys, n_topics * n_names, _ORDER[0])
+        topic_offsets = self._sorted_positions(
+            lambda start, stop: topic_codes[start:stop].astype(np.int64), n_topics, _TOPIC_ORDER[0]
+        )
+        np.save(self.directory / "order_offsets.npy", offsets)
+        np.save(self.directory / "topic_offsets.npy", topic_offsets)
+        self._representatives(topic_codes, name_codes)
+
+        # Atributos conocidos en el orden de siempre y después los extras, por nombre
+        attributes = sorted(
+            range(len(self.rating_columns)),
+            key=lambda col: (
+                RATING_COLUMNS.index(self.rating_columns[col]) if self.rating_columns[col] in RATING_COLUMNS else len(RATING_COLUMNS),
+                self.rating_columns[col],
+            ),
+        )
+        self.aggregates.save(self.directory / "rating_aggregates.parquet", sha256)
+        self.cube.save(self.directory / "cube")
+        (self.directory / "names.json").write_text(json.dumps(list(self.names), ensure_ascii=False))
+        (self.directory / "meta.json").write_text(json.dumps({
+            "source": source,
+            "sha256": sha256,
+            "rows": self.rows,
+            "text_bytes": self.text_bytes,
+            "topics": list(self.topics),
+            "rating_columns": [[self.rating_columns[col], _rating_file(col)] for col in attributes],
+            "created_at": time.time(),
+        }, ensure_ascii=False))
+
+
+def _compacted(chunks, pool, in_flight):
+    """``compact_reviews`` de cada bloque, en orden; con ``pool``, varios a la vez."""
+    if pool is None:
+        yield from map(compact_reviews, chunks)
+        return
+    # Como mucho ``in_flight`` bloques en camino, para que la memoria siga acotada
+    pending = collections.deque()
+    for chunk in chunks:
+        pending.append(pool.submit(compact_reviews, chunk))
+        if len(pending) >= in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def ingest(source, directory, chunk_size=CHUNK_SIZE, pool=None, in_flight=4):
+    """Lee ``source`` (ruta o URL de un CSV) por bloques y escribe el almacén en ``directory``.
+
+    Con ``pool`` (un ``concurrent.futures.Executor``) el parseo de hasta
+    ``in_flight`` bloques corre en paralelo; la escritura sigue el orden del
+    archivo. Se escribe en
+    ``<directory>.tmp`` y se renombra al terminar; un servidor que tenga abierto
+    el almacén anterior sigue leyendo sus archivos hasta que lo reabre.
+    """
+    directory = Path(directory)
+    work = directory.with_name(directory.name + ".tmp")
+    shutil.rmtree(work, ignore_errors=True)
+    work.mkdir(parents=True)
+
+    writer = _StoreWriter(work, chunk_size)
+    with _open_source(source) as raw:
+        reader = _HashingReader(raw)
+        chunks = pd.read_csv(reader, chunksize=chunk_size)
+        for chunk in _compacted(chunks, pool, in_flight):
+            writer.append(chunk)
+            logger.info("%s: %d filas leídas", source, writer.rows)
+    writer.finish(str(source), reader.hexdigest())
+
+    old = directory.with_name(directory.name + ".old")
+    shutil.rmtree(old, ignore_errors=True)
+    if directory.exists():
+        os.replace(directory, old)
+    os.replace(work, directory)
+    shutil.rmtree(old, ignore_errors=True)
+    return directory
+
+
+class _RowIndexer:
+    def __init__(self, store):
+        self._store = store
+
+    def __getitem__(self, positions):
+        if isinstance(positions, slice):
+            positions = np.arange(len(self._store))[positions]
+        return self._store.take(positions)
+
+
+class ReviewStore:
+    """Almacén escrito por ``ingest``, abierto con ``np.memmap``.
+
+    ``store.iloc[posiciones]`` devuelve un DataFrame con las mismas columnas que
+    la tabla compacta (``name``, ``text``, ``topic_label`` y ``rating:*``) solo
+    para esas filas, así que el código que toma filas de ``data.reviews`` con
+    ``.iloc`` funciona igual con una tabla en memoria que con el almacén.
+    """
+
+    def __init__(self, directory):
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text())
+        self.directory = directory
+        self.sha256 = meta["sha256"]
+        self.n_rows = meta["rows"]
+        self.topics = meta["topics"]
+        self.names = json.loads((directory / "names.json").read_text())
+        # Para traducir códigos a etiquetas; el -1 (sin valor) cae en el None del final
+        self._topic_labels = np.array(self.topics + [None], dtype=object)
+        self._name_labels = np.array(self.names + [None], dtype=object)
+
+        self._topic_codes = _memmap(directory / _TOPIC_CODES[0], _TOPIC_CODES[1], self.n_rows)
+        self._name_codes = _memmap(directory / _NAME_CODES[0], _NAME_CODES[1], self.n_rows)
+        self._text_offsets = _memmap(directory / _TEXT_OFFSETS[0], _TEXT_OFFSETS[1], self.n_rows + 1)
+        self._text = _memmap(directory / "text.bin", np.uint8, meta["text_bytes"])
+        self._ratings = {
+            attribute: _memmap(directory / filename, np.float32, self.n_rows)
+            for attribute, filename in meta["rating_columns"]
+        }
+
+        offsets = np.load(directory / "order_offsets.npy")
+        topic_offsets = np.load(directory / "topic_offsets.npy")
+        self.review_index = ReviewIndex.from_sorted(
+            _memmap(directory / _ORDER[0], _ORDER[1], int(offsets[-1])),
+            offsets,
+            _memmap(directory / _TOPIC_ORDER[0], _TOPIC_ORDER[1], int(topic_offsets[-1])),
+            topic_offsets,
+            self.topics,
+            self.names,
+            by_topic(np.load(directory / "representatives.npy"), np.load(directory / "representative_offsets.npy"), self.topics),
+        )
+        self.rating_aggregates, _ = RatingAggregates.load(directory / "rating_aggregates.parquet")
+        self.rating_cube = RatingCube.load(directory / "cube")
+        self.iloc = _RowIndexer(self)
+
+    def __len__(self):
+        return self.n_rows
+
+    def text_array(self):
+        """Todo el texto como un arreglo de Arrow sobre el blob, sin copiarlo."""
+        return pa.LargeStringArray.from_buffers(
+            self.n_rows, pa.py_buffer(self._text_offsets), pa.py_buffer(self._text)
+        )
+
+    def texts(self, positions):
+        """Texto de las reviews ``positions``, leído del blob."""
+        starts = self._text_offsets[positions]
+        stops = self._text_offsets[np.asarray(positions) + 1]
+        return [self._text[start:stop].tobytes().decode("utf-8") for start, stop in zip(starts, stops)]
+
+    def take(self, positions):
+        """Las filas ``positions`` como DataFrame (índice = posiciones)."""
+        positions = np.asarray(positions, dtype=np.intp)
+        frame = pd.DataFrame({
+            "name": self._name_labels[self._name_codes[positions]],
+            "text": pd.array(self.texts(positions), dtype="string[pyarrow]"),
+            "topic_label": self._topic_labels[self._topic_codes[positions]],
+        }, index=positions)
+        for attribute, values in self._ratings.items():
+            frame[RATING_PREFIX + attribute] = values[positions]
+        return frame
+
+
+def open_store(directory=None):
+    """``ReviewStore`` de ``directory`` (por defecto ``HOTEL_REVIEW_STORE``), compartido por proceso.
+
+    Se vuelve a abrir si ``ingest`` escribió una versión nueva.
+    """
+    directory = Path(directory or REVIEW_STORE)
+    sha256 = json.loads((directory / "meta.json").read_text())["sha256"]
+    with _lock:
+        store = _stores.get(directory)
+        if store is None or store.sha256 != sha256:
+            store = _stores[directory] = ReviewStore(directory)
+        return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingesta por bloques de las reviews a un almacén en disco.")
+    parser.add_argument("directory", help="carpeta del almacén (la que se pone en HOTEL_REVIEW_STORE)")
+    parser.add_argument("--source", default=DATASETS["reviews"], help="CSV de reviews (ruta o URL)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="filas por bloque")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.INFO)
+    start = time.perf_counter()
+    directory = ingest(args.source, args.directory, args.chunk_size)
+    store = open_store(directory)
+    print(
+        f"{len(store):,} reviews, {len(store.names):,} hoteles y {len(store.topics)} tópicos en {directory} "
+        f"({time.perf_counter() - start:.1f} s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Tiempos por etapa de cada ejecución del script, para diagnosticar lentitud.
+
+Las etapas se marcan con ``with stage("nombre", rows=n) as info:``; ``info`` es
+un dict donde se pueden agregar campos (por ejemplo ``info["cache"] = "hit"``).
+Solo se registra algo entre ``begin_run`` y ``end_run`` con el modo activado;
+si no, ``stage`` no hace más que revisar una variable del hilo.
+
+Modos de ``begin_run``:
+
+- ``"1"`` o ``"true"``: tiempos por etapa, memoria residente (RSS) del proceso
+  al empezar y al terminar, y un log JSON por etapa en ``hotel_core.timing``.
+- ``"profile"``: además cProfile y tracemalloc de toda la ejecución.
+- ``None`` o cualquier otro valor (``"0"``, ``"false"``, ``""``): desactivado.
+
+Se compara sin distinguir mayúsculas ni espacios alrededor.
+
+Cada sesión de Streamlit corre su script en su propio hilo, por eso el registro
+vive en un ``threading.local``; el trabajo que se manda a otros hilos se envuelve
+con ``bind`` para que sus etapas caigan en la misma ejecución. tracemalloc es
+global al proceso: el modo ``"profile"`` es para diagnosticar una sesión a la
+vez.
+"""
+import cProfile
+import io
+import json
+import logging
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+STAGE_MODES = {"1", "true"}
+PROFILE_MODE = "profile"
+
+
+class RunReport:
+    """Resultado de una ejecución: etapas y, si se pidió, el perfil."""
+
+    def __init__(self, stages, total, profile=None, memory=None, rss_before=None, rss_after=None):
+        self.stages = stages
+        self.total = total
+        # Memoria residente del proceso (bytes) al empezar y al terminar; None si no se pudo leer
+        self.rss_before = rss_before
+        self.rss_after = rss_after
+        # Bytes en formato de pstats (se abren con pstats.Stats o snakeviz)
+        self.profile = profile
+        # Texto con las líneas que más memoria asignaron
+        self.memory = memory
+
+    def profile_summary(self, limit=30):
+        """Las funciones con más tiempo acumulado, como texto."""
+        if self.profile is None:
+            return ""
+        stats = pstats.Stats(_StatsSource(self.profile), stream=io.StringIO())
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stats.stream.getvalue()
+
+
+class _StatsSource:
+    # pstats.Stats acepta cualquier objeto con create_stats() y un atributo stats
+    def __init__(self, data):
+        self.stats = marshal.loads(data)
+
+    def create_stats(self):
+        pass
+
+
+def rss_bytes():
+    """Memoria residente actual del proceso en bytes (None si no se puede leer)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Sin /proc solo queda el pico: en bytes en macOS, en KiB en los demás
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def begin_run(mode=None):
+    """Empieza a registrar la ejecución actual si ``mode`` lo pide."""
+    # Una ejecución anterior que terminó en error puede haber dejado el perfil abierto
+    previous = getattr(_local, "profiler", None)
+    if previous is not None:
+        previous.disable()
+        tracemalloc.stop()
+    _local.stages = None
+    _local.profiler = None
+    mode = str(mode or "").strip().lower()
+    if mode not in STAGE_MODES and mode != PROFILE_MODE:
+        return
+    _local.stages = []
+    _local.rss_before = rss_bytes()
+    _local.started = time.perf_counter()
+    if mode == PROFILE_MODE:
+        tracemalloc.start()
+        _local.profiler = cProfile.Profile()
+        _local.profiler.enable()
+
+
+def end_run():
+    """Cierra el registro y devuelve un ``RunReport`` (o None si estaba desactivado)."""
+    stages = getattr(_local, "stages", None)
+    if stages is None:
+        return None
+    total = time.perf_counter() - _local.started
+    profile = memory = None
+    profiler = _local.profiler
+    if profiler is not None:
+        profiler.disable()
+        profiler.create_stats()
+        profile = marshal.dumps(profiler.stats)
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        top = snapshot.statistics("lineno")[:30]
+        memory = "\n".join(str(stat) for stat in top)
+    _local.stages = None
+    _local.profiler = None
+    rss_before, rss_after = _local.rss_before, rss_bytes()
+    logger.info(json.dumps({"rss_before": rss_before, "rss_after": rss_after, "total_ms": round(total * 1000, 3)}))
+    return RunReport(stages, total, profile, memory, rss_before, rss_after)
+
+
+def bind(func):
+    """``func`` para correr en otro hilo registrando sus etapas en la ejecución del hilo actual."""
+    stages = getattr(_local, "stages", None)
+
+    def run(*args, **kwargs):
+        previous = getattr(_local, "stages", None)
+        _local.stages = stages
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.stages = previous
+
+    return run
+
+
+@contextmanager
+def stage(name, **fields):
+    """Mide el bloque como la etapa ``name``; ``fields`` se agregan al registro."""
+    stages = getattr(_local, "stages", None)
+    if stages is None:
+        # Un dict nuevo: lo que se escriba en él se descarta
+        yield {}
+        return
+    info = {"stage": name, **fields}
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        info["ms"] = round((time.perf_counter() - start) * 1000, 3)
+        stages.append(info)
+        logger.info(json.dumps(info, default=str, ensure_ascii=False))
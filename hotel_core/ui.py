@@ -0,0 +1,163 @@
+"""Bloques de Streamlit compartidos por las páginas del dashboard."""
+import pandas as pd
+import streamlit as st
+
+from hotel_core.index import ALL_HOTELS
+from hotel_core.maps import MAP_CENTER, map_figure, map_html
+from hotel_core.paging import show_review_pages
+from hotel_core.render import reviews_html
+from hotel_core.timing import begin_run, end_run, stage
+
+ALL_TOPICS = "Todos los tópicos"
+
+STYLES = """<style>
+    /* Fondo General */
+    .stApp { background: #f4f6f9; font-family: 'Segoe UI', sans-serif; }
+    /* Título Hotel */
+    .content-box { background: white; padding: 18px; border-radius: 10px; box-shadow: 0px 2px 8px rgba(0,0,0,0.07); margin-bottom: 12px; height: 100%; }
+    .hotel-title { font-size: 22px; font-weight: bold; color: #2C3E50; text-align: center; }
+    /* Reseña */
+    .review-text { font-size: 15px; color: #444; line-height: 1.5; }
+    /* Ratings */
+    .ratings-title { font-weight: bold; font-size: 16px; margin-bottom: 10px; color: #2C3E50; }
+    .rating-line { margin: 8px 0; font-size: 15px; color: #333; display: flex; align-items: center; justify-content: space-between; }
+    </style>"""
+
+
+def apply_styles():
+    # Estilos y diseño
+    st.markdown(STYLES, unsafe_allow_html=True)
+
+
+def review_filters(data):
+    """Selectores de tópico y hotel; devuelve ``(selected_topic, selected_hotel)``."""
+    topics = data.review_index.topics
+    selected_topic = st.selectbox("📌 Selecciona un tópico", topics)
+    hotel_options = [ALL_HOTELS] + data.review_index.hotels
+    selected_hotel = st.selectbox(
+        "🏩 Selecciona un hotel", hotel_options,
+        help=f"Con «{ALL_HOTELS}» se muestra una review por hotel: la más cercana a su promedio.",
+    )
+    return selected_topic, selected_hotel
+
+
+def review_explorer(data):
+    """Filtros, búsqueda, paginación y tarjetas de reviews."""
+    # Filtros
+    selected_topic, selected_hotel = review_filters(data)
+    query = ""
+    if data.search_index is not None:
+        query = st.text_input("🔎 Buscar en las reseñas", placeholder="Ej. parking fee, bed bugs")
+    paginate = st.toggle("📄 Ver todas las reseñas por páginas")
+    n_reviews = st.slider("📊 Reseñas por página" if paginate else "📊 Número máximo de reseñas a mostrar", 1, 20, 5)
+
+    # Filtrado de datos (posiciones precalculadas; en modo paginado, todas las que coinciden)
+    if query.strip():
+        # Reviews del tópico/hotel que contienen todas las palabras, por relevancia
+        with stage("search") as info:
+            allowed = data.review_index.rows(selected_topic, selected_hotel)
+            positions, _ = data.search_index.search(query, k=None if paginate else n_reviews, allowed=allowed)
+            info["rows"] = len(positions)
+    else:
+        with stage("filter") as info:
+            positions = data.review_index.select(selected_topic, selected_hotel, None if paginate else n_reviews)
+            info["rows"] = len(positions)
+
+    def render(page):
+        with stage("render_cards", rows=len(page)):
+            return reviews_html(data.reviews, page, data.averages)
+
+    # Comprobación y Muestra de Resultados
+    if len(positions) == 0:
+        st.warning("⚠️ No se encontraron reviews que coincidan con los filtros seleccionados. Por favor, intenta con otra combinación.")
+    elif paginate:
+        filter_key = (data.version, selected_topic, selected_hotel, query.strip().lower())
+        show_review_pages(positions, n_reviews, filter_key, render)
+    else:
+        # Todas las tarjetas en un solo bloque de HTML (título, review, ratings y comparación)
+        st.markdown(render(positions), unsafe_allow_html=True)
+
+
+def hotel_map(data):
+    """Mapa de hoteles abiertos de California y búsqueda de hoteles cercanos."""
+    st.markdown("### 🗺️ Mapa de hoteles en California")
+    col_topic, col_rating = st.columns(2)
+    topic = col_topic.selectbox("Tópico de las reviews", [ALL_TOPICS] + data.review_index.topics, key="map_topic")
+    min_rating = col_rating.slider(
+        "Calificación general mínima", 0.0, 5.0, 0.0, step=0.5, key="map_min_rating",
+        help="Con 0 también se muestran los hoteles sin reviews.",
+    )
+    pick_on_map = st.toggle("📍 Elegir el punto con un clic en el mapa", key="near_pick")
+
+    hotels = data.map_hotels(None if topic == ALL_TOPICS else topic)
+    if min_rating > 0:
+        hotels = hotels[hotels["avg_overall"] >= min_rating]
+
+    # --- Mapa centrado en California (memorizado por contenido de la tabla de hoteles) ---
+    # Por defecto se muestra como HTML estático: mover o hacer zoom no provoca
+    # reruns. Solo al elegir el punto se usa st_folium, y únicamente devuelve el
+    # último clic, así que tampoco hay reruns al mover el mapa.
+    with stage("map", rows=len(hotels)):
+        if hotels.empty:
+            st.info("Ningún hotel tiene esa calificación general mínima. Prueba con un valor más bajo.")
+        elif pick_on_map:
+            # streamlit_folium (y folium) solo se importan si se va a hacer clic en el mapa
+            from streamlit_folium import st_folium
+
+            clicked = st_folium(
+                map_figure(hotels), width=700, height=500,
+                returned_objects=["last_clicked"], key="near_map",
+            )
+            point = (clicked or {}).get("last_clicked")
+            if point:
+                st.session_state["near_lat"] = point["lat"]
+                st.session_state["near_lon"] = point["lng"]
+        else:
+            st.iframe(map_html(hotels), width=700, height=500)
+
+    nearby_hotels(data)
+
+
+def nearby_hotels(data):
+    """Hoteles dentro de un radio o los k más cercanos a un punto, con sus promedios."""
+    st.markdown("#### 🔎 Hoteles cercanos")
+    col_lat, col_lon, col_mode, col_value = st.columns(4)
+    lat = col_lat.number_input("Latitud", -90.0, 90.0, MAP_CENTER[0], format="%.5f", key="near_lat")
+    lon = col_lon.number_input("Longitud", -180.0, 180.0, MAP_CENTER[1], format="%.5f", key="near_lon")
+    mode = col_mode.radio("Buscar", ["Radio (km)", "Los k más cercanos"], key="near_mode")
+    if mode == "Radio (km)":
+        query = {"radius_km": col_value.number_input("Radio (km)", 0.1, 500.0, 10.0, step=1.0, key="near_radius")}
+    else:
+        query = {"k": int(col_value.number_input("k", 1, 100, 10, key="near_k"))}
+    with stage("nearby", **query) as info:
+        hotels = data.nearby(lat, lon, **query)
+        info["rows"] = len(hotels)
+
+    if hotels.empty:
+        st.info("No hay hoteles en ese radio.")
+        return
+    st.caption(f"{len(hotels)} hoteles, de cerca a lejos.")
+    st.dataframe(hotels.drop(columns=["latitude", "longitude"]), width="stretch", hide_index=True)
+
+
+def start_debug():
+    """Activa los tiempos de la ejecución con ``?debug=1`` o ``?debug=true`` (o ``?debug=profile``); ``?debug=0`` no."""
+    begin_run(st.query_params.get("debug"))
+
+
+def debug_panel():
+    """Panel plegable con los tiempos por etapa; no muestra nada sin ``?debug``."""
+    report = end_run()
+    if report is None:
+        return
+    with st.expander(f"⏱️ Tiempos de esta ejecución ({report.total * 1000:.0f} ms)"):
+        if report.rss_before is not None:
+            st.caption(
+                f"Memoria residente del proceso: {report.rss_before / 2**20:,.0f} MB al empezar, "
+                f"{report.rss_after / 2**20:,.0f} MB al terminar."
+            )
+        st.dataframe(pd.DataFrame(report.stages), width="stretch")
+        if report.profile is not None:
+            st.code(report.profile_summary(), language="text")
+            st.download_button("⬇️ Perfil (cProfile)", report.profile, file_name="rerun.prof")
+            st.download_button("⬇️ Memoria (tracemalloc)", report.memory, file_name="rerun_memory.txt")
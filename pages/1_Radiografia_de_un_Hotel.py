@@ -0,0 +1,29 @@
+import streamlit as st
+from hotel_core.data import get_data
+from hotel_core.ui import apply_styles, debug_panel, hotel_map, review_explorer, start_debug
+
+# Configuración de la página para que ocupe todo el ancho
+st.set_page_config(layout="wide")
+
+# Tiempos por etapa con ?debug=1 (o ?debug=profile)
+start_debug()
+
+# Datos compartidos por todas las páginas y sesiones (se cargan una vez por proceso)
+data = get_data()
+
+apply_styles()
+
+# Título principal de la aplicación
+st.title("🏨 Radiografía de un Hotel")
+# Solo corre la pestaña abierta: el mapa (y folium) no se cargan hasta que se abre
+tab1, tab2 = st.tabs(["🏨 Reviews", "🗺️ Mapa"], on_change="rerun", key="main_tab")
+
+if tab1.open:
+    with tab1:
+        review_explorer(data)
+
+if tab2.open:
+    with tab2:
+        hotel_map(data)
+
+debug_panel()
@@ -0,0 +1,59 @@
+import html
+
+import streamlit as st
+import pandas as pd
+from hotel_core.charts import comparison_figure, rating_deltas
+from hotel_core.data import get_data
+from hotel_core.reviews import review_ratings
+from hotel_core.ui import debug_panel, review_filters, start_debug
+
+# Esta debe ser la primera commande de Streamlit en tu script
+st.set_page_config(layout="wide")
+
+# Tiempos por etapa con ?debug=1 (o ?debug=profile)
+start_debug()
+
+# Datos compartidos por todas las páginas y sesiones (se cargan una vez por proceso)
+data = get_data()
+
+# Estilos CSS
+st.markdown("""
+    <style>
+        .stApp { background: #f4f6f9; font-family: 'Segoe UI', sans-serif; }
+        .card { background: #eaf0f7; padding: 22px; margin: 16px 0; border-radius: 14px; box-shadow: 0px 4px 12px rgba(0,0,0,0.1); }
+        .content-box { background: white; padding: 18px; border-radius: 10px; box-shadow: 0px 2px 8px rgba(0,0,0,0.07); margin-bottom: 12px; height: 100%; }
+        .hotel-title { font-size: 22px; font-weight: bold; color: #2C3E50; text-align: center; }
+        .review-text { font-size: 15px; color: #444; line-height: 1.5; }
+        .ratings-title { font-weight: bold; font-size: 16px; margin-bottom: 10px; color: #2C3E50; }
+    </style>
+""", unsafe_allow_html=True)
+
+# Título principal de la aplicación
+st.title("🏨 Explorador de Reviews por Tópico y Hotel")
+
+# Filtros y lógica de datos...
+selected_topic, selected_hotel = review_filters(data)
+n_reviews = st.slider("📊 Número máximo de reviews a mostrar", 1, 20, 5)
+
+filtered_df = data.reviews.iloc[data.review_index.select(selected_topic, selected_hotel, n_reviews)]
+filtered_ratings = review_ratings(filtered_df)
+
+# --- Review vs. promedio del hotel: todas las reviews mostradas en una sola figura ---
+deltas = rating_deltas(filtered_df, filtered_ratings, data.averages)
+if filtered_df.empty:
+    st.warning("⚠️ No se encontraron reviews que coincidan con los filtros seleccionados.")
+elif deltas.empty:
+    st.markdown("No hay ratings disponibles para comparar.")
+else:
+    st.markdown('<p class="ratings-title">Calificación de la Review vs. Promedio del Hotel</p>', unsafe_allow_html=True)
+    st.plotly_chart(comparison_figure(deltas), width="stretch")
+
+# --- Mostrar resultados (todas las tarjetas en un solo bloque de HTML) ---
+cards = (
+    '<div class="card"><div class="content-box hotel-title">#' + pd.Series(range(1, len(filtered_df) + 1), index=filtered_df.index).astype(str)
+    + " · 🏨 " + filtered_df["name"].astype(str).map(html.escape) + "</div>"
+    + '<div class="content-box"><p class="review-text">' + filtered_df["text"].astype(str).map(html.escape) + "</p></div></div>"
+)
+st.markdown("".join(cards.tolist()), unsafe_allow_html=True)
+
+debug_panel()
@@ -0,0 +1,21 @@
+import streamlit as st
+from hotel_core.data import get_data
+from hotel_core.ui import apply_styles, debug_panel, review_explorer, start_debug
+
+# Configuración de la página para que ocupe todo el ancho
+st.set_page_config(layout="wide")
+
+# Tiempos por etapa con ?debug=1 (o ?debug=profile)
+start_debug()
+
+# Datos compartidos por todas las páginas y sesiones (se cargan una vez por proceso)
+data = get_data()
+
+apply_styles()
+
+# Título principal de la aplicación
+st.title("🏨 Radiografía de un Hotel")
+
+review_explorer(data)
+
+debug_panel()
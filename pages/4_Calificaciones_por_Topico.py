@@ -0,0 +1,71 @@
+import streamlit as st
+import plotly.express as px
+from hotel_core.data import get_data
+from hotel_core.ui import ALL_TOPICS, apply_styles, debug_panel, start_debug
+
+# Configuración de la página para que ocupe todo el ancho
+st.set_page_config(layout="wide")
+
+# Tiempos por etapa con ?debug=1 (o ?debug=profile)
+start_debug()
+
+# Datos compartidos por todas las páginas y sesiones (se cargan una vez por proceso)
+data = get_data()
+# Todas las vistas son rebanadas del cubo (tópico × hotel × atributo); no recorren reviews
+cube = data.rating_cube
+
+apply_styles()
+
+st.title("📊 Calificaciones por Tópico")
+
+if not cube.attributes:
+    st.info("No hay reviews con calificaciones.")
+    debug_panel()
+    st.stop()
+
+col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
+attribute = col1.selectbox("⭐ Atributo", cube.attributes, key="cube_attribute")
+topic_label = col2.selectbox("🔍 Tópico", [ALL_TOPICS] + sorted(cube.topics), key="cube_topic")
+top_k = col3.number_input("Top", min_value=3, max_value=50, value=15, key="cube_k")
+min_count = col4.number_input("Mín. calificaciones", min_value=1, value=5, key="cube_min_count")
+topic = None if topic_label == ALL_TOPICS else topic_label
+
+left, right = st.columns(2)
+
+with left:
+    st.subheader(f"🏆 Mejores hoteles en {attribute}")
+    ranking = cube.ranking(attribute, topic, k=int(top_k), min_count=int(min_count))
+    if ranking.empty:
+        st.info("Ningún hotel tiene suficientes calificaciones con estos filtros.")
+    else:
+        fig = px.bar(
+            ranking, x="mean", y="name", orientation="h", text=ranking["mean"].round(2),
+            hover_data={"count": True}, range_x=[0, 5],
+        )
+        fig.update_layout(
+            xaxis_title="", yaxis_title="", yaxis=dict(autorange="reversed"),
+            margin=dict(l=10, r=10, t=10, b=10), height=max(250, 28 * len(ranking)),
+        )
+        fig.update_traces(marker_color="#007bff", textposition="outside")
+        st.plotly_chart(fig, width="stretch")
+
+with right:
+    st.subheader(f"🧭 {attribute} por tópico")
+    by_topic = cube.topic_means()[attribute].dropna().round(2).sort_values(ascending=False).reset_index()
+    fig = px.bar(by_topic, x="topic", y=attribute, text=attribute, range_y=[0, 5])
+    fig.update_layout(xaxis_title="", yaxis_title="", margin=dict(l=10, r=10, t=10, b=10), height=350)
+    fig.update_traces(marker_color="#2C3E50", textposition="outside")
+    st.plotly_chart(fig, width="stretch")
+
+st.subheader("🏨 Detalle de un hotel")
+hotel = st.selectbox("Hotel", sorted(cube.hotels), key="cube_hotel")
+if hotel:
+    detail = cube.topic_means(hotel).dropna(how="all").round(2)
+    if detail.empty:
+        st.info("Este hotel no tiene calificaciones.")
+    else:
+        fig = px.imshow(detail, text_auto=True, zmin=1, zmax=5, color_continuous_scale="RdYlGn", aspect="auto")
+        fig.update_layout(xaxis_title="", yaxis_title="", margin=dict(l=10, r=10, t=10, b=10))
+        st.plotly_chart(fig, width="stretch")
+
+debug_panel()
@@ -0,0 +1,70 @@
+import streamlit as st
+import plotly.express as px
+from hotel_core.data import get_data
+from hotel_core.ui import ALL_TOPICS, apply_styles, debug_panel, start_debug
+
+# Configuración de la página para que ocupe todo el ancho
+st.set_page_config(layout="wide")
+
+# Tiempos por etapa con ?debug=1 (o ?debug=profile)
+start_debug()
+
+# Datos compartidos por todas las páginas y sesiones (se cargan una vez por proceso)
+data = get_data()
+# El ranking sale de las sumas y conteos del cubo; cambiar atributo o top no recorre reviews
+cube = data.rating_cube
+
+apply_styles()
+
+st.title("🏆 Ranking de Hoteles")
+
+if not cube.attributes:
+    st.info("No hay reviews con calificaciones.")
+    debug_panel()
+    st.stop()
+
+col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
+attribute = col1.selectbox("⭐ Atributo", cube.attributes, key="board_attribute")
+topic_label = col2.selectbox("🔍 Tópico", [ALL_TOPICS] + sorted(cube.topics), key="board_topic")
+top_k = col3.number_input("Top", min_value=3, max_value=100, value=20, key="board_k")
+min_count = col4.number_input("Mín. calificaciones", min_value=1, value=1, key="board_min_count")
+topic = None if topic_label == ALL_TOPICS else topic_label
+
+automatic = st.toggle("Peso del promedio global automático (mediana de calificaciones por hotel)", value=True, key="board_auto")
+prior_weight = None if automatic else st.slider("Peso del promedio global (calificaciones ficticias)", 0, 500, 20, key="board_weight")
+
+board = cube.leaderboard(attribute, topic, k=int(top_k), prior_weight=prior_weight, min_count=int(min_count))
+if board.empty:
+    st.info("Ningún hotel tiene suficientes calificaciones con estos filtros.")
+    debug_panel()
+    st.stop()
+
+st.caption(
+    f"Puntaje = (C · m + suma) / (C + calificaciones), con m = {board.attrs['prior_mean']:.2f} "
+    f"(promedio global de {attribute}) y C = {board.attrs['prior_weight']:g}: los hoteles con pocas "
+    "calificaciones se acercan al promedio global."
+)
+
+left, right = st.columns([3, 2])
+
+with left:
+    fig = px.bar(
+        board, x="score", y="name", orientation="h", text=board["score"].round(2),
+        hover_data={"mean": ":.2f", "count": True}, range_x=[0, 5],
+    )
+    fig.update_layout(
+        xaxis_title="", yaxis_title="", yaxis=dict(autorange="reversed"),
+        margin=dict(l=10, r=10, t=10, b=10), height=max(250, 28 * len(board)),
+    )
+    fig.update_traces(marker_color="#007bff", textposition="outside")
+    st.plotly_chart(fig, width="stretch")
+
+with right:
+    table = board.assign(score=board["score"].round(2), mean=board["mean"].round(2))
+    table.index = range(1, len(table) + 1)
+    st.dataframe(
+        table.rename(columns={"name": "Hotel", "score": "Puntaje", "mean": "Promedio", "count": "Calificaciones"}),
+        width="stretch",
+    )
+
+debug_panel()